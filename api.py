@@ -1,37 +1,30 @@
 # api.py (PROJECT ROOT)
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import Header
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-from marketing_campaign_response.modeling.predict import Predictor
+from marketing_campaign_response.app_factory import create_app
+from marketing_campaign_response.modeling.responses import ScoreResponse
+from marketing_campaign_response.schema import validate_records
 
-app = FastAPI(title="Marketing Campaign Response API")
-
-# Allow React (adjust later)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Load model once at startup
-predictor = Predictor()
+# Allow React (adjust later). The model loads in the background once the
+# server starts; model work runs on a dedicated, bounded pool
+# (503 + Retry-After when full)
+app = create_app("Marketing Campaign Response API", cors_origins=["*"])
+service = app.state.model_service
+executor = app.state.executor
 
 
 class PredictionRequest(BaseModel):
     records: List[Dict]
 
 
-@app.get("/health")
-def health():
-    return {"status": "ok"}
+def _predict_records(records: List[Dict]):
+    return service.predict_arrays(validate_records(records))
 
 
 @app.post("/predict")
-def predict(request: PredictionRequest):
-    return predictor.predict(request.records)
-
+async def predict(request: PredictionRequest, accept: Optional[str] = Header(None)):
+    result = await executor.run(_predict_records, request.records)
+    return ScoreResponse(result, accept=accept)
@@ -0,0 +1,77 @@
+# benchmarks/bench_categorical_encoder.py
+
+"""
+Benchmark the vectorized CategoricalEncoder against the legacy per-row path.
+
+The legacy path is the original ``prepare_features`` loop: string cleaning
+followed by a per-element ``apply`` membership test against a Python list.
+
+Usage::
+
+    python benchmarks/bench_categorical_encoder.py --sizes 1 1000 1000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from marketing_campaign_response.features import (  # noqa: E402
+    CATEGORICAL_COLS,
+    CategoricalEncoder,
+    load_categorical_mappings,
+)
+from marketing_campaign_response.synthetic import make_customers  # noqa: E402
+
+
+def legacy_encode(df: pd.DataFrame, mappings: dict) -> pd.DataFrame:
+    for col in CATEGORICAL_COLS:
+        allowed = mappings.get(col, [])
+        df[col] = df[col].astype(str).str.strip().str.lower()
+        df[col] = df[col].apply(lambda x: x if x in allowed else "unknown")
+        df[col] = pd.Categorical(df[col], categories=allowed)
+    return df
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(sizes, repeat: int):
+    mappings = load_categorical_mappings()
+    encoder = CategoricalEncoder(mappings)
+
+    print(f"{'rows':>10} {'legacy (ms)':>12} {'encoder (ms)':>13} {'speedup':>8}")
+    for n_rows in sizes:
+        df = make_customers(n_rows, seed=0)[CATEGORICAL_COLS]
+
+        legacy = legacy_encode(df.copy(), mappings)
+        fast = encoder.transform(df.copy())
+        for col in CATEGORICAL_COLS:
+            assert legacy[col].equals(fast[col]), f"mismatch in {col}"
+
+        reps = repeat if n_rows < 100_000 else 1
+        t_legacy = best_of(lambda: legacy_encode(df.copy(), mappings), reps)
+        t_fast = best_of(lambda: encoder.transform(df.copy()), reps)
+        print(
+            f"{n_rows:>10} {t_legacy * 1e3:>12.2f} {t_fast * 1e3:>13.2f} "
+            f"{t_legacy / t_fast:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 1_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.sizes, args.repeat)
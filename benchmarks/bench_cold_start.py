@@ -0,0 +1,110 @@
+# benchmarks/bench_cold_start.py
+
+"""
+Import time and time to ready of the API apps.
+
+For every app module, a fresh interpreter imports it and reports how long
+the import took and whether LightGBM was pulled in; ``app_factory`` alone
+must not import pandas. Then each app is
+started with ``uvicorn`` and ``/health/live`` and ``/health/ready`` are
+polled: the first answers as soon as the server accepts connections, the
+second once the model is loaded and warmed up on the background thread.
+
+Usage::
+
+    python benchmarks/bench_cold_start.py --repeat 3
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+APPS = [
+    "main:app",
+    "api:app",
+    "marketing_campaign_response.main:app",
+    "marketing_campaign_response.modeling.api:app",
+]
+
+_IMPORT_SNIPPET = """
+import importlib, json, sys, time
+start = time.perf_counter()
+importlib.import_module({module!r})
+print(json.dumps({{
+    "seconds": time.perf_counter() - start,
+    "lightgbm": "lightgbm" in sys.modules,
+    "pandas": "pandas" in sys.modules,
+}}))
+"""
+
+
+def import_time(module: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SNIPPET.format(module=module)],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def poll(url: str, start: float, timeout: float = 60.0) -> float:
+    while time.perf_counter() - start < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return time.perf_counter() - start
+        except OSError:
+            time.sleep(0.01)
+    raise TimeoutError(f"{url} not ready after {timeout} s")
+
+
+def time_to_ready(app: str, port: int) -> tuple:
+    base_url = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--port", str(port)],
+        cwd=PROJECT_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        live = poll(f"{base_url}/health/live", start)
+        ready = poll(f"{base_url}/health/ready", start)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+    return live, ready
+
+
+def main(repeat: int, port: int):
+    factory = import_time("marketing_campaign_response.app_factory")
+    assert not factory["pandas"], "importing app_factory loads pandas"
+    print(f"app_factory import: {factory['seconds']:.2f} s, without pandas\n")
+    print(f"{'app':<46} {'import (s)':>10} {'lightgbm':>9} {'live (s)':>9} {'ready (s)':>10}")
+    for i, app in enumerate(APPS):
+        module = app.split(":")[0]
+        imports = [import_time(module) for _ in range(repeat)]
+        timings = [time_to_ready(app, port + i) for _ in range(repeat)]
+        print(
+            f"{app:<46} "
+            f"{statistics.median(r['seconds'] for r in imports):>10.2f} "
+            f"{str(any(r['lightgbm'] for r in imports)):>9} "
+            f"{statistics.median(t[0] for t in timings):>9.2f} "
+            f"{statistics.median(t[1] for t in timings):>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8775)
+    args = parser.parse_args()
+    main(args.repeat, args.port)
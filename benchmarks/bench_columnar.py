@@ -0,0 +1,73 @@
+# benchmarks/bench_columnar.py
+
+"""
+Parse-to-response throughput of the batch request formats.
+
+Posts the same synthetic batch to ``/predict/batch`` (JSON array of
+records, one Pydantic model per record) and to ``/predict/columnar`` as
+columnar JSON and as an Arrow IPC stream, in-process through the ASGI
+test client, and reports the time per request and rows per second.
+
+Usage::
+
+    python benchmarks/bench_columnar.py --rows 100000
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+import pyarrow as pa
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from marketing_campaign_response.modeling.api import app  # noqa: E402
+from marketing_campaign_response.modeling.columnar import ARROW_STREAM_MEDIA_TYPE  # noqa: E402
+from marketing_campaign_response.synthetic import make_customers  # noqa: E402
+
+
+def arrow_bytes(df) -> bytes:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def main(n_rows: int, repeats: int):
+    # API field names (underscores); the synthetic frame uses training names
+    df = make_customers(n_rows, seed=0).rename(columns=lambda c: c.replace(".", "_"))
+    cases = [
+        ("records /predict/batch", "/predict/batch", json.dumps(df.to_dict("records")),
+         "application/json"),
+        ("columnar JSON", "/predict/columnar", json.dumps(df.to_dict("list")),
+         "application/json"),
+        ("Arrow IPC", "/predict/columnar", arrow_bytes(df), ARROW_STREAM_MEDIA_TYPE),
+    ]
+
+    print(f"{n_rows} rows, best of {repeats}")
+    print(f"{'format':>24} {'body (MB)':>10} {'seconds':>9} {'rows/s':>11}")
+    with TestClient(app) as client:
+        for name, path, body, content_type in cases:
+            best = float("inf")
+            for _ in range(repeats):
+                start = time.perf_counter()
+                response = client.post(path, content=body, headers={"Content-Type": content_type})
+                best = min(best, time.perf_counter() - start)
+                response.raise_for_status()
+            size = len(body) / 1e6
+            print(f"{name:>24} {size:>10.1f} {best:>9.3f} {n_rows / best:>11,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    main(args.rows, args.repeats)
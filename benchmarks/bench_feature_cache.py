@@ -0,0 +1,74 @@
+# benchmarks/bench_feature_cache.py
+
+"""
+Training startup with and without the feature cache.
+
+Writes a synthetic training CSV, then times how long it takes until the
+training set is binned and the validation features are ready:
+
+- ``no cache``: parse the CSV, ``prepare_features``, split and bin;
+- ``cold``: the same, plus writing the cache entry (first run);
+- ``warm``: load the binary Dataset and the validation Parquet (every
+  later run with the same data and feature code).
+
+Usage::
+
+    python benchmarks/bench_feature_cache.py --rows 500000
+"""
+
+import argparse
+import logging
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from marketing_campaign_response.modeling.feature_cache import FeatureCache  # noqa: E402
+from marketing_campaign_response.modeling.train import load_training_data  # noqa: E402
+from marketing_campaign_response.synthetic import make_customers  # noqa: E402
+
+
+def startup(source: Path, cache) -> float:
+    start = time.perf_counter()
+    data, _ = load_training_data(source, cache)
+    data.train_set.construct()
+    return time.perf_counter() - start
+
+
+def main(n_rows: int, repeats: int):
+    logging.getLogger("marketing_campaign_response.modeling.train").setLevel(logging.WARNING)
+    workdir = Path(tempfile.mkdtemp(prefix="bench_feature_cache-"))
+    try:
+        source = workdir / "training.csv"
+        make_customers(n_rows, seed=0, with_target=True).to_csv(source, index=False)
+        cache_dir = workdir / "cache"
+
+        timings = {"no cache": [], "cold": [], "warm": []}
+        for _ in range(repeats):
+            timings["no cache"].append(startup(source, None))
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            timings["cold"].append(startup(source, FeatureCache(cache_dir)))
+            timings["warm"].append(startup(source, FeatureCache(cache_dir)))
+
+        size = sum(p.stat().st_size for p in cache_dir.rglob("*") if p.is_file())
+        print(f"{n_rows:,} rows, CSV {source.stat().st_size / 2**20:.1f} MB, "
+              f"cache entry {size / 2**20:.1f} MB, median of {repeats}")
+        base = statistics.median(timings["no cache"])
+        for name, values in timings.items():
+            median = statistics.median(values)
+            print(f"{name:>10}: {median:7.3f} s  ({base / median:.1f}x vs no cache)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    main(args.rows, args.repeats)
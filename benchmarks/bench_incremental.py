@@ -0,0 +1,119 @@
+# benchmarks/bench_incremental.py
+
+"""
+Incremental (warm-start) update versus full retraining.
+
+Trains a base model on a synthetic history, then simulates a new week of
+outcomes in which the response drifts (cellular contacts respond more
+often) and brings the model up to date both ways:
+
+- ``full``: retrain from scratch on history + new week (``train.py``:
+  up to 1000 rounds, early stopping on a random 20% split);
+- ``incremental``: continue the base model on the new week only, binned
+  with the history's bin boundaries (``modeling/incremental.py``: up to
+  ``--max-rounds`` rounds, early stopping on the newest rows).
+
+Wall-clock time and AUC on a holdout drawn from the drifted week are
+printed side by side, with the base model's AUC for reference.
+
+Usage::
+
+    python benchmarks/bench_incremental.py --history 200000 --new 20000
+"""
+
+import argparse
+import logging
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import roc_auc_score
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from marketing_campaign_response.features import TARGET_COL, prepare_features  # noqa: E402
+from marketing_campaign_response.modeling.incremental import (  # noqa: E402
+    load_bin_reference,
+    update_model,
+)
+from marketing_campaign_response.modeling.train import (  # noqa: E402
+    fit_model,
+    prepare_training_data,
+)
+from marketing_campaign_response.synthetic import make_customers  # noqa: E402
+
+
+def drifted_week(n_rows: int, seed: int) -> pd.DataFrame:
+    """
+    New outcomes whose response also depends on the contact channel.
+    """
+    df = make_customers(n_rows, seed=seed)
+    logit = (
+        -2.5
+        + 1.5 * (df["poutcome"] == "success")
+        + 1.2 * (df["contact"] == "cellular")
+        - 0.4 * df["emp.var.rate"]
+        - 0.1 * df["campaign"]
+    )
+    prob = 1.0 / (1.0 + np.exp(-logit.to_numpy(dtype=float)))
+    rng = np.random.default_rng(seed)
+    df[TARGET_COL] = np.where(rng.random(n_rows) < prob, "yes", "no")
+    return df
+
+
+def main(n_history: int, n_new: int, max_rounds: int):
+    logging.getLogger("marketing_campaign_response.modeling.train").setLevel(logging.WARNING)
+    workdir = Path(tempfile.mkdtemp(prefix="bench_incremental-"))
+    try:
+        history = make_customers(n_history, seed=0, with_target=True)
+        week = drifted_week(n_new, seed=1)
+        holdout = drifted_week(max(n_new // 2, 1_000), seed=2)
+        X_hold, y_hold = prepare_features(holdout, training=True, target_col=TARGET_COL)
+
+        data = prepare_training_data(history)
+        base, _ = fit_model(data, log_period=0)
+        bins = workdir / "history.bins"
+        data.train_set.construct().subset([0]).construct().save_binary(str(bins))
+
+        start = time.perf_counter()
+        full, _ = fit_model(
+            prepare_training_data(pd.concat([history, week], ignore_index=True)), log_period=0
+        )
+        full_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        updated, metrics = update_model(
+            base, week, reference=load_bin_reference(bins), max_rounds=max_rounds
+        )
+        incremental_seconds = time.perf_counter() - start
+
+        print(f"history {n_history:,} rows, new week {n_new:,} rows, "
+              f"holdout {len(holdout):,} rows (drifted)")
+        print(f"{'':>12}  {'seconds':>8}  {'rounds':>6}  {'holdout AUC':>11}")
+        rows = [
+            ("base", None, base),
+            ("full", full_seconds, full),
+            ("incremental", incremental_seconds, updated),
+        ]
+        for name, seconds, model in rows:
+            auc = roc_auc_score(y_hold, model.predict(X_hold))
+            timing = f"{seconds:8.2f}" if seconds is not None else f"{'-':>8}"
+            print(f"{name:>12}  {timing}  {model.current_iteration():6d}  {auc:11.4f}")
+        print(f"incremental added {metrics['rounds_added']} rounds, "
+              f"{full_seconds / incremental_seconds:.1f}x faster than full")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--history", type=int, default=200_000)
+    parser.add_argument("--new", type=int, default=20_000)
+    parser.add_argument("--max-rounds", type=int, default=200)
+    args = parser.parse_args()
+    main(args.history, args.new, args.max_rounds)
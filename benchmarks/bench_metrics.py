@@ -0,0 +1,85 @@
+# benchmarks/bench_metrics.py
+
+"""
+Overhead of the stage instrumentation.
+
+Measures the cost of one stopwatch plus one stage mark with metrics
+enabled and disabled, then scores the same inputs end to end (validation,
+feature preparation, model call and response formatting, as
+``/predict/batch`` does) with metrics enabled and disabled and reports
+the difference. Enabled and disabled runs are interleaved so drift in
+machine load affects both equally.
+
+Usage::
+
+    python benchmarks/bench_metrics.py --repeats 300
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import timeit
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from marketing_campaign_response.metrics import METRICS  # noqa: E402
+from marketing_campaign_response.modeling.predict import Predictor  # noqa: E402
+from marketing_campaign_response.modeling.responses import ScoreResponse  # noqa: E402
+from marketing_campaign_response.schema import validate_records  # noqa: E402
+from marketing_campaign_response.synthetic import make_customers  # noqa: E402
+
+
+def mark_cost(enabled: bool, number: int = 200_000) -> float:
+    METRICS.enabled = enabled
+
+    def once():
+        mark = METRICS.stopwatch()
+        mark("bench")
+
+    return min(timeit.repeat(once, number=number, repeat=5)) / number
+
+
+def median_latencies(fn, repeats: int):
+    timings = {True: [], False: []}
+    for _ in range(repeats):
+        for enabled in (True, False):
+            METRICS.enabled = enabled
+            start = time.perf_counter()
+            fn()
+            timings[enabled].append(time.perf_counter() - start)
+    return statistics.median(timings[True]), statistics.median(timings[False])
+
+
+def main(repeats: int):
+    print("stopwatch + mark")
+    for enabled in (True, False):
+        print(f"  {'enabled' if enabled else 'disabled':>8}: {mark_cost(enabled) * 1e9:7.0f} ns")
+
+    predictor = Predictor()
+    print(f"\nscoring, median of {repeats}")
+    print(f"{'rows':>8} {'enabled (us)':>13} {'disabled (us)':>14} {'overhead':>9}")
+    for n_rows in (1, 100, 10_000):
+        records = make_customers(n_rows, seed=0).rename(
+            columns=lambda c: c.replace(".", "_")
+        ).to_dict("records")
+
+        def score():
+            ScoreResponse(predictor.predict(validate_records(records)))
+
+        score()
+        enabled, disabled = median_latencies(score, repeats if n_rows < 10_000 else repeats // 10)
+        print(
+            f"{n_rows:>8} {enabled * 1e6:>13.1f} {disabled * 1e6:>14.1f} "
+            f"{(enabled - disabled) / disabled:>8.1%}"
+        )
+    METRICS.enabled = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=300)
+    args = parser.parse_args()
+    main(args.repeats)
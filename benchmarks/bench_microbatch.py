@@ -0,0 +1,68 @@
+# benchmarks/bench_microbatch.py
+
+"""
+Synthetic concurrent load test for the micro-batching dispatcher.
+
+Fires single-customer requests from many threads at once, first straight
+at ``Predictor.predict`` and then through ``MicroBatcher``, and reports
+throughput plus p50/p99 latency of each.
+
+Usage::
+
+    python benchmarks/bench_microbatch.py --requests 2000 --concurrency 64
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from marketing_campaign_response.modeling.batching import MicroBatcher  # noqa: E402
+from marketing_campaign_response.modeling.predict import Predictor  # noqa: E402
+from marketing_campaign_response.synthetic import make_customers  # noqa: E402
+
+
+def run_load(predict, records, concurrency: int):
+    def one(record):
+        start = time.perf_counter()
+        predict([record])
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = np.fromiter(pool.map(one, records), dtype=float)
+    elapsed = time.perf_counter() - start
+    return len(records) / elapsed, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def main(n_requests: int, concurrency: int, max_batch_size: int, max_wait_ms: float):
+    predictor = Predictor()
+    records = make_customers(n_requests, seed=0).to_dict("records")
+    batcher = MicroBatcher(predictor, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+
+    print(f"{n_requests} single-record requests, {concurrency} concurrent callers")
+    print(f"{'mode':>10} {'req/s':>10} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    for name, predict in [("direct", predictor.predict), ("batched", batcher.predict)]:
+        predict(records[:1])  # warm-up
+        throughput, p50, p99 = run_load(predict, records, concurrency)
+        print(f"{name:>10} {throughput:>10.0f} {p50 * 1e3:>10.2f} {p99 * 1e3:>10.2f}")
+
+    stats = batcher.stats
+    print(f"batches: {stats['batches']}, mean batch size: {stats['mean_batch_size']:.1f}")
+    batcher.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    main(args.requests, args.concurrency, args.max_batch_size, args.max_wait_ms)
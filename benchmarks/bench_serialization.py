@@ -0,0 +1,98 @@
+# benchmarks/bench_serialization.py
+
+"""
+Serialization time of prediction results per batch size.
+
+Encodes the same scores the way the endpoints used to (``tolist()``,
+FastAPI's ``jsonable_encoder`` and ``json.dumps``) and with the encoders
+of ``modeling.serialization``: JSON from the NumPy arrays through orjson
+(full precision and rounded), the stdlib fallback, raw float32 and Arrow.
+Reports the best time per call and the body size.
+
+Usage::
+
+    python benchmarks/bench_serialization.py --repeats 20
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from marketing_campaign_response.modeling import serialization  # noqa: E402
+from marketing_campaign_response.modeling.serialization import (  # noqa: E402
+    encode_arrow,
+    encode_float32,
+    encode_json,
+    score_arrays,
+)
+
+ROWS = [1, 100, 10_000, 100_000, 1_000_000]
+
+
+def legacy(probs: np.ndarray, model_version: str) -> bytes:
+    result = {
+        "predictions": (probs >= 0.5).astype(int).tolist(),
+        "probabilities": probs.tolist(),
+        "model_version": model_version,
+    }
+    return json.dumps(jsonable_encoder(result), separators=(",", ":")).encode()
+
+
+def stdlib_json(probs: np.ndarray, model_version: str) -> bytes:
+    orjson, serialization.orjson = serialization.orjson, None
+    try:
+        return encode_json({**score_arrays(probs), "model_version": model_version}, None)
+    finally:
+        serialization.orjson = orjson
+
+
+def cases():
+    yield "tolist + jsonable_encoder", legacy
+    yield "tolist + json.dumps", lambda p, v: json.dumps(
+        {"predictions": (p >= 0.5).astype(int).tolist(), "probabilities": p.tolist(),
+         "model_version": v}, separators=(",", ":")
+    ).encode()
+    if serialization.orjson is not None:
+        yield "orjson arrays", lambda p, v: encode_json({**score_arrays(p), "model_version": v}, None)
+        yield "orjson arrays, 4 decimals", lambda p, v: encode_json(
+            {**score_arrays(p), "model_version": v}, 4
+        )
+    yield "stdlib fallback", stdlib_json
+    yield "float32", lambda p, v: encode_float32(p)
+    yield "arrow", lambda p, v: encode_arrow(p)
+
+
+def main(repeats: int, max_rows: int):
+    print(f"orjson: {'yes' if serialization.orjson is not None else 'no'}; best of {repeats}")
+    print(f"{'rows':>9} {'encoder':>27} {'time (us)':>12} {'body (KB)':>10} {'speedup':>8}")
+    for n_rows in (n for n in ROWS if n <= max_rows):
+        probs = np.random.default_rng(0).random(n_rows)
+        number = max(1, 10_000 // n_rows)
+        baseline = None
+        for name, fn in cases():
+            body = fn(probs, "20261017000000-abcdef12")
+            seconds = min(timeit.repeat(lambda: fn(probs, "v"), number=number, repeat=repeats))
+            seconds /= number
+            baseline = baseline or seconds
+            print(
+                f"{n_rows:>9} {name:>27} {seconds * 1e6:>12.1f} {len(body) / 1024:>10.1f} "
+                f"{baseline / seconds:>7.1f}x"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--max-rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    main(args.repeats, args.max_rows)
@@ -0,0 +1,109 @@
+# benchmarks/bench_serving.py
+
+"""
+Startup time and per-worker memory of the multi-worker server.
+
+Starts the API twice with the same number of workers, once with plain
+``uvicorn --workers N`` (every worker imports the app and loads the model
+itself) and once with the preforking ``marketing_campaign_response.serve``
+(the model is loaded once and shared), waits until ``/health/ready`` answers,
+sends a few predictions and reports the time to ready plus RSS/PSS of
+every worker. Linux only (reads ``/proc``).
+
+Usage::
+
+    python benchmarks/bench_serving.py --workers 4
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from marketing_campaign_response.serve import memory_usage  # noqa: E402
+from marketing_campaign_response.synthetic import make_customers  # noqa: E402
+
+
+def children(pid: int):
+    path = Path(f"/proc/{pid}/task/{pid}/children")
+    return [int(p) for p in path.read_text().split()] if path.exists() else []
+
+
+def wait_ready(url: str, timeout: float = 60.0) -> float:
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return time.perf_counter() - start
+        except OSError:
+            time.sleep(0.02)
+    raise TimeoutError(f"{url} not ready after {timeout} s")
+
+
+def post_predictions(base_url: str, n: int = 50):
+    records = make_customers(n, seed=0).rename(columns=lambda c: c.replace(".", "_"))
+    body = json.dumps(records.to_dict("records")).encode()
+    for _ in range(20):
+        request = urllib.request.Request(
+            f"{base_url}/predict", data=body, headers={"Content-Type": "application/json"}
+        )
+        urllib.request.urlopen(request).read()
+
+
+def measure(name: str, command: list, port: int, workers: int):
+    base_url = f"http://127.0.0.1:{port}"
+    proc = subprocess.Popen(command, cwd=PROJECT_ROOT, stderr=subprocess.DEVNULL)
+    try:
+        ready = wait_ready(f"{base_url}/health/ready")
+        # Wait until every worker has booted
+        deadline = time.perf_counter() + 30
+        while len(children(proc.pid)) < workers and time.perf_counter() < deadline:
+            time.sleep(0.05)
+        post_predictions(base_url)
+        usage = [memory_usage(pid) for pid in children(proc.pid)]
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+    # Skip processes that exited before they were read
+    usage = [u for u in usage if u]
+    print(f"\n{name}: ready in {ready:.2f} s, {len(usage)} workers")
+    print(f"{'worker':>8} {'RSS (MB)':>10} {'PSS (MB)':>10} {'shared (MB)':>12}")
+    for i, u in enumerate(usage):
+        shared = u.get("shared_clean_kb", 0) + u.get("shared_dirty_kb", 0)
+        print(f"{i:>8} {u['rss_kb'] / 1024:>10.1f} {u['pss_kb'] / 1024:>10.1f} {shared / 1024:>12.1f}")
+    total_pss = sum(u["pss_kb"] for u in usage) / 1024
+    print(f"{'total':>8} {'':>10} {total_pss:>10.1f}")
+
+
+def main(workers: int, port: int):
+    app = "marketing_campaign_response.main:app"
+    measure(
+        "uvicorn --workers",
+        [sys.executable, "-m", "uvicorn", app, "--port", str(port), "--workers", str(workers)],
+        port,
+        workers,
+    )
+    measure(
+        "preforked serve",
+        [
+            sys.executable, "-m", "marketing_campaign_response.serve",
+            "--app", app, "--port", str(port + 1), "--workers", str(workers),
+        ],
+        port + 1,
+        workers,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    main(args.workers, args.port)
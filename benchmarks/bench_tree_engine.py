@@ -0,0 +1,64 @@
+# benchmarks/bench_tree_engine.py
+
+"""
+Compare LightGBM's predictor with the array-backed NumPy tree engine.
+
+Both backends score the same pre-encoded float64 matrix, so the numbers
+isolate model evaluation from feature preparation.
+
+Usage::
+
+    python benchmarks/bench_tree_engine.py --sizes 1 10 100 1000 10000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from marketing_campaign_response.features import prepare_features  # noqa: E402
+from marketing_campaign_response.modeling.predict import Predictor  # noqa: E402
+from marketing_campaign_response.modeling.tree_engine import (  # noqa: E402
+    flatten_booster,
+    frame_to_matrix,
+)
+from marketing_campaign_response.synthetic import make_customers  # noqa: E402
+
+
+def median_time(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def main(sizes, repeat: int):
+    booster = Predictor().model
+    forest = flatten_booster(booster)
+
+    X, _ = prepare_features(make_customers(max(sizes), seed=0), training=False)
+    matrix = frame_to_matrix(X, booster.pandas_categorical)
+
+    print(f"{'rows':>8} {'lightgbm (us)':>14} {'numpy (us)':>11} {'speedup':>8}")
+    for n_rows in sizes:
+        batch = np.ascontiguousarray(matrix[:n_rows])
+        assert np.array_equal(booster.predict(batch), forest.predict(batch))
+
+        t_lgb = median_time(lambda: booster.predict(batch), repeat)
+        t_np = median_time(lambda: forest.predict(batch), repeat)
+        print(f"{n_rows:>8} {t_lgb * 1e6:>14.1f} {t_np * 1e6:>11.1f} {t_lgb / t_np:>7.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    main(args.sizes, args.repeat)
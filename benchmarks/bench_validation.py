@@ -0,0 +1,83 @@
+# benchmarks/bench_validation.py
+
+"""
+Per-record Pydantic validation vs the vectorized schema validator.
+
+Validates the same batch of JSON-decoded customer records with a
+per-record Pydantic model (the shape the APIs used to declare) and with
+``schema.validate_records``, and reports the best time of each.
+
+Usage::
+
+    python benchmarks/bench_validation.py --rows 50000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from pydantic import BaseModel, TypeAdapter
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from marketing_campaign_response.schema import validate_records  # noqa: E402
+from marketing_campaign_response.synthetic import make_customers  # noqa: E402
+
+
+class Customer(BaseModel):
+    custAge: Optional[int] = None
+    profession: Optional[str] = None
+    marital: Optional[str] = None
+    schooling: Optional[str] = None
+    default: Optional[str] = None
+    housing: Optional[str] = None
+    contact: Optional[str] = None
+    month: Optional[str] = None
+    day_of_week: Optional[str] = None
+    campaign: Optional[int] = None
+    pdays: Optional[int] = None
+    previous: Optional[int] = None
+    poutcome: Optional[str] = None
+    emp_var_rate: Optional[float] = None
+    cons_price_idx: Optional[float] = None
+    cons_conf_idx: Optional[float] = None
+    euribor3m: Optional[float] = None
+    nr_employed: Optional[float] = None
+    pmonths: Optional[int] = None
+    pastEmail: Optional[int] = None
+
+
+def best_of(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(n_rows: int, repeats: int):
+    df = make_customers(n_rows, seed=0).rename(columns=lambda c: c.replace(".", "_"))
+    records = df.to_dict("records")
+    adapter = TypeAdapter(List[Customer])
+
+    def pydantic():
+        # What the endpoints did: build models, then dicts again
+        return [c.model_dump() for c in adapter.validate_python(records)]
+
+    print(f"{n_rows} records, best of {repeats}")
+    for name, fn in [("pydantic per record", pydantic),
+                     ("validate_records", lambda: validate_records(records))]:
+        seconds = best_of(fn, repeats)
+        print(f"{name:>22}: {seconds * 1e3:8.1f} ms ({n_rows / seconds:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    main(args.rows, args.repeats)
@@ -0,0 +1,90 @@
+# benchmarks/bench_vocabulary.py
+
+"""
+Vocabulary build: full pandas read versus streaming counts.
+
+Writes ``--files`` synthetic CSV files, then times:
+
+- ``pandas``: what ``create_categorical_mappings.py`` did, read every
+  file whole and take the cleaned ``unique()`` of each categorical column;
+- ``streaming``: ``vocabulary.build_vocabulary`` with 1 worker and with
+  ``--workers`` workers (categorical columns only, in chunks, with
+  frequencies).
+
+Peak traced Python/NumPy memory of each in-process run is printed next to
+the time (worker processes are not traced).
+
+Usage::
+
+    python benchmarks/bench_vocabulary.py --rows 500000 --files 4 --workers 4
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from marketing_campaign_response.features import CATEGORICAL_COLS  # noqa: E402
+from marketing_campaign_response.synthetic import make_customers  # noqa: E402
+from marketing_campaign_response.vocabulary import build_vocabulary  # noqa: E402
+
+
+def pandas_unique(paths):
+    df = pd.concat([pd.read_csv(p) for p in paths])
+    return {
+        col: sorted(df[col].astype(str).str.strip().str.lower().unique().tolist())
+        for col in CATEGORICAL_COLS
+    }
+
+
+def timed(fn, trace=True):
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if trace else None
+    if trace:
+        tracemalloc.stop()
+    return seconds, peak
+
+
+def main(n_rows: int, n_files: int, workers: int):
+    workdir = Path(tempfile.mkdtemp(prefix="bench_vocabulary-"))
+    try:
+        paths = []
+        for i in range(n_files):
+            path = workdir / f"part-{i}.csv"
+            make_customers(n_rows // n_files, seed=i).to_csv(path, index=False)
+            paths.append(path)
+        size = sum(p.stat().st_size for p in paths) / 2**20
+        print(f"{n_rows:,} rows in {n_files} CSV file(s), {size:.1f} MB")
+
+        runs = {
+            "pandas": (lambda: pandas_unique(paths), True),
+            "streaming x1": (lambda: build_vocabulary(paths, workers=1), True),
+            f"streaming x{workers}": (lambda: build_vocabulary(paths, workers=workers), False),
+        }
+        for name, (fn, trace) in runs.items():
+            seconds, peak = timed(fn, trace)
+            memory = f"{peak / 2**20:7.1f} MB" if peak is not None else f"{'-':>10}"
+            print(f"{name:>14}: {seconds:7.3f} s  {memory}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=400_000)
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    main(args.rows, args.files, args.workers)
@@ -0,0 +1,280 @@
+# benchmarks/suite.py
+
+"""
+Micro-benchmark suite with JSON baselines and regression checks.
+
+Every benchmark runs on deterministic synthetic customers
+(``synthetic.make_customers`` with a fixed seed, drawn from the
+``FEATURE_COLS`` schema and the saved categorical mappings), so no data
+has to be downloaded and two runs measure the same work:
+
+- ``prepare_features`` from 1 to 1M rows;
+- ``Predictor.predict`` end to end, on records and on DataFrames;
+- ``load_categorical_mappings``, cached and from a cold cache;
+- a short fixed-round training run (``modeling.train.train_model``).
+
+Each benchmark is repeated until it has run for ``--min-time`` seconds
+(at least three times); the median, minimum and spread are kept.
+``run`` writes them to a JSON file along with the environment, and
+``compare`` flags every benchmark whose median got slower than the
+baseline by more than ``--threshold`` (exit status 1 if any did).
+
+Usage::
+
+    python benchmarks/suite.py run --output benchmarks/baselines/baseline.json
+    python benchmarks/suite.py run --output current.json --quick
+    python benchmarks/suite.py compare benchmarks/baselines/baseline.json current.json
+"""
+
+import argparse
+from datetime import datetime, timezone
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+SEED = 0
+FEATURE_ROWS = [1, 100, 10_000, 100_000, 1_000_000]
+QUICK_MAX_ROWS = 100_000
+
+
+def measure(fn: Callable[[], object], min_time: float, min_repeats: int = 3) -> Dict[str, float]:
+    """
+    Time ``fn`` repeatedly and summarize the per-call timings (seconds).
+    """
+    fn()  # warm-up
+    timings: List[float] = []
+    started = time.perf_counter()
+    while len(timings) < min_repeats or time.perf_counter() - started < min_time:
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+        if len(timings) >= 10_000:
+            break
+    return {
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "repeats": len(timings),
+    }
+
+
+def _customers(n_rows: int, with_target: bool = False):
+    from marketing_campaign_response.synthetic import make_customers
+
+    return make_customers(n_rows, seed=SEED, with_target=with_target)
+
+
+def _api_records(n_rows: int) -> List[dict]:
+    df = _customers(n_rows).rename(columns=lambda c: c.replace(".", "_"))
+    return df.to_dict("records")
+
+
+# -------------------------------------------------------------------
+# Benchmarks: each yields (name, rows, callable)
+# -------------------------------------------------------------------
+def bench_prepare_features(max_rows: int) -> Iterator[Tuple[str, int, Callable]]:
+    from marketing_campaign_response.features import prepare_features
+
+    for n_rows in FEATURE_ROWS:
+        if n_rows <= max_rows:
+            df = _customers(n_rows)
+            yield f"prepare_features[{n_rows}]", n_rows, lambda df=df: prepare_features(
+                df, training=False
+            )
+
+
+def bench_predict(max_rows: int) -> Iterator[Tuple[str, int, Callable]]:
+    from marketing_campaign_response.modeling.predict import Predictor
+
+    predictor = Predictor()
+    for n_rows in (1, 100):
+        records = _api_records(n_rows)
+        yield f"predict.records[{n_rows}]", n_rows, lambda r=records: predictor.predict(r)
+    for n_rows in (1_000, 100_000):
+        if n_rows <= max_rows:
+            df = _customers(n_rows)
+            yield f"predict.frame[{n_rows}]", n_rows, lambda df=df: predictor.predict(df)
+
+
+def bench_mappings(max_rows: int) -> Iterator[Tuple[str, int, Callable]]:
+    from marketing_campaign_response.features import (
+        CATEGORICAL_MAPPINGS_FILE,
+        CategoricalMappingsCache,
+        load_categorical_mappings,
+    )
+
+    yield "load_categorical_mappings.cached", 0, load_categorical_mappings
+    # Unpickle and compile the encoder, as on the first call of a process
+    yield "load_categorical_mappings.cold", 0, lambda: CategoricalMappingsCache(
+        CATEGORICAL_MAPPINGS_FILE
+    ).get()
+
+
+def bench_train(max_rows: int) -> Iterator[Tuple[str, int, Callable]]:
+    import logging
+
+    from marketing_campaign_response.modeling.train import train_model
+
+    logging.getLogger("marketing_campaign_response.modeling.train").setLevel(logging.WARNING)
+    n_rows = 20_000
+    df = _customers(n_rows, with_target=True)
+    yield f"train[{n_rows}x50 rounds]", n_rows, lambda: train_model(
+        df, num_boost_round=50, early_stopping_rounds=None, log_period=0
+    )
+
+
+BENCHMARKS = {
+    "prepare_features": bench_prepare_features,
+    "predict": bench_predict,
+    "mappings": bench_mappings,
+    "train": bench_train,
+}
+
+
+def environment() -> Dict[str, object]:
+    import lightgbm
+    import numpy
+    import pandas
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "lightgbm": lightgbm.__version__,
+    }
+
+
+def run(
+    output: Optional[Path],
+    groups: List[str],
+    quick: bool = False,
+    min_time: float = 0.5,
+) -> Dict[str, object]:
+    """
+    Run the selected benchmark groups and optionally save the results.
+    """
+    max_rows = QUICK_MAX_ROWS if quick else max(FEATURE_ROWS)
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'benchmark':<40} {'median':>12} {'min':>12} {'rows/s':>14} {'n':>6}")
+    for group in groups:
+        for name, n_rows, fn in BENCHMARKS[group](max_rows):
+            stats = measure(fn, min_time)
+            stats["rows"] = n_rows
+            results[name] = stats
+            rate = f"{n_rows / stats['median']:,.0f}" if n_rows else ""
+            print(
+                f"{name:<40} {_format_seconds(stats['median']):>12} "
+                f"{_format_seconds(stats['min']):>12} {rate:>14} {stats['repeats']:>6}"
+            )
+
+    report = {"environment": environment(), "benchmarks": results}
+    if output is not None:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nSaved {len(results)} results to {output}")
+    return report
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """
+    Print a baseline vs current table and return the regressed benchmarks.
+
+    A benchmark regresses when its median is more than ``threshold``
+    (a fraction) slower than the baseline median.
+    """
+    base, cur = baseline["benchmarks"], current["benchmarks"]
+    regressions = []
+    print(f"{'benchmark':<40} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name in sorted(cur):
+        if name not in base:
+            print(f"{name:<40} {'(not in baseline)':>25}")
+            continue
+        old, new = base[name]["median"], cur[name]["median"]
+        change = new / old - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  faster"
+        print(
+            f"{name:<40} {_format_seconds(old):>12} {_format_seconds(new):>12} "
+            f"{change:>+9.1%}{flag}"
+        )
+    skipped = len(set(base) - set(cur))
+    if skipped:
+        print(f"\n{skipped} baseline benchmark(s) were not run")
+    cpus = [report.get("environment", {}).get("cpus") for report in (baseline, current)]
+    if cpus[0] != cpus[1]:
+        print(f"\nWarning: the runs used machines with different CPU counts {cpus}")
+    return regressions
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--output", type=Path, help="JSON file to write the results to")
+    run_parser.add_argument(
+        "--only", nargs="+", choices=sorted(BENCHMARKS), default=list(BENCHMARKS),
+        help="Benchmark groups to run",
+    )
+    run_parser.add_argument(
+        "--quick", action="store_true", help=f"Skip inputs above {QUICK_MAX_ROWS:,} rows"
+    )
+    run_parser.add_argument("--min-time", type=float, default=0.5, help="Seconds per benchmark")
+    run_parser.add_argument("--compare", type=Path, help="Baseline to compare the results with")
+    run_parser.add_argument("--threshold", type=float, default=0.10)
+
+    compare_parser = commands.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.10, help="Allowed slowdown (0.10 = 10%%)"
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        current = run(args.output, args.only, quick=args.quick, min_time=args.min_time)
+        if args.compare is None:
+            return 0
+        print()
+        baseline = json.loads(args.compare.read_text())
+    else:
+        baseline = json.loads(args.baseline.read_text())
+        current = json.loads(args.current.read_text())
+
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(
+            f"\n{len(regressions)} regression(s) above {args.threshold:.0%}: "
+            + ", ".join(regressions)
+        )
+        return 1
+    print(f"\nNo regressions above {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
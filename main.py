@@ -1,39 +1,24 @@
 # marketing_campaing_response/main.py
-from fastapi import FastAPI
-from marketing_campaign_response.modeling.predict import Predictor
-from pydantic import BaseModel
-from typing import List, Dict, Any
+from fastapi import Request
+from marketing_campaign_response.app_factory import create_app
+from marketing_campaign_response.modeling.responses import ScoreResponse
+from marketing_campaign_response.modeling.validation import customer_body, json_body
+from marketing_campaign_response.schema import validate_records
+from typing import Any, Dict, List
 
-app = FastAPI(title="Marketing Campaign Predictor")
+# Model loads in the background at startup; see /health/ready
+app = create_app("Marketing Campaign Predictor")
+service = app.state.model_service
+executor = app.state.executor
 
-predictor = Predictor()
 
-# Pydantic model for input
-class CustomerModel(BaseModel):
-    custAge: int
-    profession: str
-    marital: str
-    schooling: str
-    default: str
-    housing: str
-    contact: str
-    month: str
-    day_of_week: str
-    campaign: int
-    pdays: int
-    previous: int
-    poutcome: str
-    emp_var_rate: float
-    cons_price_idx: float
-    cons_conf_idx: float
-    euribor3m: float
-    nr_employed: float
-    pmonths: int
-    pastEmail: int
+def _predict_customers(customers: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Customers follow marketing_campaign_response.schema.CUSTOMER_SCHEMA
+    return service.predict_arrays(validate_records(customers))
 
-@app.post("/predict")
-def predict(customers: List[CustomerModel]):
-    rows = [customer.dict() for customer in customers]
-    result = predictor.predict(rows)
-    return result
 
+@app.post("/predict", openapi_extra=customer_body(many=True))
+async def predict(request: Request):
+    customers = await json_body(request)
+    result = await executor.run(_predict_customers, customers)
+    return ScoreResponse(result, accept=request.headers.get("accept"))
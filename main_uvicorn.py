@@ -6,9 +6,9 @@ PROJECT_ROOT = Path(__file__).parent.resolve()
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from marketing_campaign_response.main import app
-import uvicorn
+from marketing_campaign_response.serve import app
 
 if __name__ == "__main__":
-    uvicorn.run("marketing_campaing_response.main:app", host="127.0.0.1", port=8000, reload=True)
-
+    # The app and model are loaded once, then shared by forked workers;
+    # see `python main_uvicorn.py --help` for --workers/--port/--app
+    app()
@@ -0,0 +1,158 @@
+# marketing_campaign_response/app_factory.py
+
+"""
+Single factory for the FastAPI apps.
+
+``create_app`` builds an app whose import is cheap: the model (and with it
+LightGBM and scikit-learn) is loaded by a ``ModelService`` on a
+background thread once the server starts, not when the module is
+imported. Every app gets the same plumbing:
+
+- ``GET /health/live``: the process is up (always 200);
+- ``GET /health/ready``: 200 once the model is loaded and warmed up,
+  503 while loading or after a failed load (with the error);
+- ``GET /health``: kept for existing clients, same as ``/health/live``;
+- ``GET /metrics``: per-stage latency and batch-size histograms in the
+  Prometheus text format (see ``marketing_campaign_response.metrics``);
+- the bounded inference executor and the input validation handlers;
+- ``ModelNotReady`` answered with 503 and ``Retry-After``;
+- the ``/admin/model`` endpoints that reload or roll back the model
+  from the registry without a restart (see ``modeling.admin``).
+
+Routes are added by the app modules, which reach the model through
+``app.state.model_service``.
+"""
+
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from marketing_campaign_response.config import REGISTRY_DIR
+from marketing_campaign_response.metrics import METRICS, PROMETHEUS_MEDIA_TYPE
+from marketing_campaign_response.modeling.admin import register_admin
+from marketing_campaign_response.modeling.executor import InferenceExecutor, register_executor
+from marketing_campaign_response.modeling.service import ModelNotReady, ModelService
+from marketing_campaign_response.modeling.validation import register_validation
+
+
+def create_app(
+    title: str,
+    *,
+    description: Optional[str] = None,
+    version: str = "0.1.0",
+    cors_origins: Optional[List[str]] = None,
+    micro_batching: bool = False,
+    batcher_kwargs: Optional[Dict[str, Any]] = None,
+    executor_workers: int = 4,
+    executor_queue: int = 32,
+    predictor_kwargs: Optional[Dict[str, Any]] = None,
+    registry_dir: Optional[Path] = REGISTRY_DIR,
+    watch_interval: Optional[float] = 5.0,
+) -> FastAPI:
+    """
+    Create an app with background model loading and health probes.
+
+    Parameters
+    ----------
+    title, description, version : str
+        OpenAPI metadata.
+    cors_origins : list of str, optional
+        Allowed CORS origins; no CORS middleware when omitted.
+    micro_batching : bool
+        Put a ``MicroBatcher`` in front of the predictor
+        (``app.state.model_service.batcher``).
+    batcher_kwargs : dict, optional
+        Arguments of the ``MicroBatcher``.
+    executor_workers, executor_queue : int
+        Size of the bounded inference executor (``app.state.executor``).
+    predictor_kwargs : dict, optional
+        Arguments of the ``Predictor``.
+    registry_dir : Path, optional
+        Model registry whose active version is served; without one (or
+        with no active version) ``models/lgbm_marketing.pkl`` is served.
+    watch_interval : float, optional
+        Seconds between two checks of the registry's active version.
+
+    Returns
+    -------
+    FastAPI
+        App with ``state.model_service`` and ``state.executor`` set.
+    """
+    service = ModelService(
+        micro_batching=micro_batching,
+        batcher_kwargs=batcher_kwargs,
+        registry_dir=registry_dir,
+        watch_interval=watch_interval,
+        **(predictor_kwargs or {}),
+    )
+    executor = InferenceExecutor(max_workers=executor_workers, max_queue=executor_queue)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        service.start()
+        yield
+        service.stop()
+
+    kwargs = {"description": description} if description else {}
+    app = FastAPI(title=title, version=version, lifespan=lifespan, **kwargs)
+    app.state.model_service = service
+    app.state.executor = executor
+
+    if cors_origins:
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=cors_origins,
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+
+    # Model work runs on a dedicated, bounded pool (503 + Retry-After when
+    # full); invalid input is answered with 422 and an error report
+    register_executor(app, executor)
+    register_validation(app)
+
+    async def not_ready_handler(request: Request, exc: ModelNotReady) -> JSONResponse:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": str(exc)},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
+    app.add_exception_handler(ModelNotReady, not_ready_handler)
+    register_admin(app, service)
+
+    @app.get("/health/live", tags=["Health"])
+    async def live() -> Dict[str, str]:
+        """
+        Liveness probe: the process is serving requests.
+        """
+        return {"status": "alive"}
+
+    @app.get("/health/ready", tags=["Health"])
+    async def ready():
+        """
+        Readiness probe: the model is loaded and warmed up.
+        """
+        health = service.health()
+        return JSONResponse(status_code=200 if service.ready else 503, content=health)
+
+    @app.get("/health", tags=["Health"])
+    async def health_check() -> Dict[str, str]:
+        """
+        Health check endpoint to verify backend is running
+        """
+        return {"status": "ok"}
+
+    @app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+    async def metrics() -> PlainTextResponse:
+        """
+        Stage latency and batch-size histograms (Prometheus text format).
+        """
+        return PlainTextResponse(METRICS.render(), media_type=PROMETHEUS_MEDIA_TYPE)
+
+    return app
@@ -14,9 +14,18 @@ RAW_DATA_DIR = DATA_DIR / "raw"
 INTERIM_DATA_DIR = DATA_DIR / "interim"
 PROCESSED_DATA_DIR = DATA_DIR / "processed"
 EXTERNAL_DATA_DIR = DATA_DIR / "external"
+FEATURE_CACHE_DIR = INTERIM_DATA_DIR / "feature_cache"  # prepared training features
+SNAPSHOT_DIR = RAW_DATA_DIR / "snapshots"  # content-addressed Parquet snapshots
+DATASET_MANIFEST = PROCESSED_DATA_DIR / "dataset.json"  # current snapshot + split
 
 MODELS_DIR = PROJ_ROOT / "models"
 MODEL_PATH = MODELS_DIR / "lgbm_marketing.pkl"  # <-- add this
+CATEGORICAL_MAPPINGS_FILE = MODELS_DIR / "categorical_mappings.pkl"  # column -> categories
+MODEL_TXT_PATH = MODELS_DIR / "lgbm_marketing.txt"  # native LightGBM format
+FOREST_DIR = MODELS_DIR / "lgbm_marketing_forest"  # flat arrays, mmap-able
+REGISTRY_DIR = MODELS_DIR / "registry"  # versioned model + mappings bundles
+BEST_PARAMS_PATH = MODELS_DIR / "best_params.json"  # written by modeling/tune.py
+BIN_REFERENCE_PATH = MODELS_DIR / "lgbm_marketing.bins"  # training bin boundaries
 
 REPORTS_DIR = PROJ_ROOT / "reports"
 FIGURES_DIR = REPORTS_DIR / "figures"
@@ -1,70 +1,352 @@
-# marketing_campaing_response/dataset.py
+# marketing_campaign_response/dataset.py
 
+"""
+Dataset preparation stage.
+
+The stage used to wipe the Hugging Face cache, force a fresh download on
+every run and write the same train/test split as CSV to both the raw and
+the processed data directories. It now works from a content-addressed
+snapshot instead:
+
+1. the data is ingested from a ``DataSource``: a local CSV/Parquet file
+   (``LocalFileSource``) or the Hugging Face dataset
+   (``HuggingFaceSource``, served from the local Hugging Face cache when
+   it has it);
+2. columns are cast to explicit dtypes (``snapshot_dtypes``, from
+   ``CUSTOMER_SCHEMA``) and the frame is stored once as
+   ``data/raw/snapshots/<content sha256[:16]>.parquet``;
+3. the train/test split is recorded in the manifest
+   (``data/processed/dataset.json``) as the test row positions, next to
+   the source fingerprint, the snapshot hash and the dtypes;
+4. the training split is exported once to
+   ``data/processed/marketing_training.csv``, the file ``train.py``,
+   ``tune.py`` and ``out_of_core.py`` read.
+
+When the source fingerprint (a local file's sha256, or a pinned Hugging
+Face revision) and the split settings match the manifest, and its
+outputs exist, nothing is loaded or written. A source without a cheap
+fingerprint is loaded, but nothing is written when its content hash is
+unchanged.
+
+``load_split`` returns either split from the snapshot.
+
+Usage::
+
+    python -m marketing_campaign_response.dataset --source data/external/bank.csv
+"""
+
+from abc import ABC, abstractmethod
+import argparse
+from datetime import datetime, timezone
+import hashlib
+import json
+import os
 from pathlib import Path
-import shutil
+import tempfile
+from typing import Any, Dict, Optional, Tuple
 
+from loguru import logger
+import numpy as np
 import pandas as pd
-from datasets import load_dataset
 from sklearn.model_selection import train_test_split
-from loguru import logger
-import argparse
 
-from marketing_campaing_response.config import PROCESSED_DATA_DIR, RAW_DATA_DIR
+from marketing_campaign_response.config import (
+    DATASET_MANIFEST,
+    PROCESSED_DATA_DIR,
+    SNAPSHOT_DIR,
+)
+from marketing_campaign_response.features import COLUMN_MAPPING
+from marketing_campaign_response.hashing import file_digest
+from marketing_campaign_response.schema import CUSTOMER_SCHEMA
+
+TRAINING_CSV = PROCESSED_DATA_DIR / "marketing_training.csv"
 
-# Ensure directories exist
-RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
-PROCESSED_DATA_DIR.mkdir(parents=True, exist_ok=True)
+# CUSTOMER_SCHEMA kind -> snapshot dtype; integers are nullable so a
+# missing value does not turn a column into floats
+KIND_DTYPES = {"category": "string", "int": "Int64", "float": "float64"}
 
 
-def main(split_ratio: float = 0.1):
+class DataSource(ABC):
+    """
+    Where the raw dataset comes from.
     """
-    Download the Banking Marketing dataset, split into train/test, 
-    and save CSVs. Automatically handles Parquet cache issues.
 
-    Args:
-        split_ratio (float): Fraction of dataset to use as test set (0 < split_ratio < 1)
+    name: str
+
+    @abstractmethod
+    def fingerprint(self) -> Optional[str]:
+        """
+        Identity of the content that is cheap to get, or None when the
+        content has to be loaded to know whether it changed.
+        """
+
+    @abstractmethod
+    def load(self) -> pd.DataFrame:
+        """
+        The raw dataset.
+        """
+
+
+class LocalFileSource(DataSource):
     """
-    logger.info("Starting dataset preparation...")
+    A local CSV or Parquet file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.name = str(self.path)
+
+    def fingerprint(self) -> str:
+        return f"sha256:{file_digest(self.path)}"
+
+    def load(self) -> pd.DataFrame:
+        if self.path.suffix == ".parquet":
+            return pd.read_parquet(self.path)
+        return pd.read_csv(self.path)
+
+
+class HuggingFaceSource(DataSource):
+    """
+    A split of a Hugging Face dataset (needs the ``datasets`` package).
+
+    Without a pinned ``revision`` the dataset has no fingerprint: it is
+    loaded on every run, from the local Hugging Face cache when possible
+    (``HF_DATASETS_OFFLINE=1`` never touches the network).
+    """
+
+    def __init__(
+        self,
+        repo: str = "Andyrasika/banking-marketing",
+        split: str = "train",
+        revision: Optional[str] = None,
+    ):
+        self.repo, self.split, self.revision = repo, split, revision
+        self.name = f"hf:{repo}[{split}]"
+
+    def fingerprint(self) -> Optional[str]:
+        return f"{self.name}@{self.revision}" if self.revision else None
+
+    def load(self) -> pd.DataFrame:
+        from datasets import load_dataset
+
+        return load_dataset(self.repo, split=self.split, revision=self.revision).to_pandas()
+
+
+def snapshot_dtypes(columns) -> Dict[str, str]:
+    """
+    Snapshot dtype of every column: from ``CUSTOMER_SCHEMA`` for features
+    (raw names mapped through ``COLUMN_MAPPING``), string otherwise.
+    """
+    dtypes = {}
+    for col in columns:
+        spec = CUSTOMER_SCHEMA.get(COLUMN_MAPPING.get(col, col))
+        dtypes[col] = KIND_DTYPES[spec.kind] if spec is not None else "string"
+    return dtypes
+
+
+def apply_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    ``df`` with ``snapshot_dtypes`` applied; numeric columns that do not
+    parse raise a ValueError naming the column.
+    """
+    out = {}
+    for col, dtype in snapshot_dtypes(df.columns).items():
+        values = df[col]
+        try:
+            if dtype != "string":
+                values = pd.to_numeric(values, errors="raise")
+            out[col] = values.astype(dtype)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Column {col!r} does not convert to {dtype}: {exc}") from exc
+    return pd.DataFrame(out)
+
+
+def content_hash(df: pd.DataFrame) -> str:
+    """
+    sha256 of a frame's values, column names and dtypes.
+    """
+    digest = hashlib.sha256(
+        json.dumps({col: str(dtype) for col, dtype in df.dtypes.items()}).encode()
+    )
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _write_atomic(path: Path, write) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}-", dir=path.parent)
+    os.close(fd)
+    try:
+        write(Path(tmp))
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def read_manifest(manifest_path: Path = DATASET_MANIFEST) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(Path(manifest_path).read_text())
+    except FileNotFoundError:
+        return None
+
+
+def load_split(split: str = "train", manifest_path: Path = DATASET_MANIFEST) -> pd.DataFrame:
+    """
+    The ``"train"`` or ``"test"`` rows of the current snapshot.
+    """
+    if split not in ("train", "test"):
+        raise ValueError(f"Unknown split {split!r}")
+    manifest = read_manifest(manifest_path)
+    if manifest is None:
+        raise FileNotFoundError(f"No dataset manifest at {manifest_path}; run dataset.py first")
+    df = pd.read_parquet(Path(manifest_path).parent / manifest["snapshot"]["path"])
+    is_test = np.zeros(len(df), dtype=bool)
+    is_test[manifest["split"]["test_rows"]] = True
+    return df[is_test if split == "test" else ~is_test].reset_index(drop=True)
 
-    # Clear Hugging Face cache for this dataset to avoid Parquet issues
-    hf_cache_dir = Path.home() / ".cache/huggingface/datasets/Andyrasika___parquet"
-    if hf_cache_dir.exists():
-        logger.info(f"Clearing Hugging Face cache at {hf_cache_dir}")
-        shutil.rmtree(hf_cache_dir)
 
-    logger.info("Downloading banking marketing dataset...")
-    ds = load_dataset("Andyrasika/banking-marketing", download_mode="force_redownload")
-    df = pd.DataFrame(ds['train'])
+def prepare_dataset(
+    source: DataSource,
+    *,
+    test_ratio: float = 0.1,
+    random_state: int = 42,
+    manifest_path: Path = DATASET_MANIFEST,
+    snapshot_dir: Path = SNAPSHOT_DIR,
+    training_csv: Optional[Path] = TRAINING_CSV,
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Snapshot ``source``, record the split and export the training CSV,
+    unless the inputs are unchanged.
+
+    Parameters
+    ----------
+    source : DataSource
+        Raw data.
+    test_ratio : float
+        Fraction of the rows in the test split (0 < test_ratio < 1).
+    random_state : int
+        Seed of the split.
+    manifest_path, snapshot_dir : Path
+        Where the manifest and the snapshots go.
+    training_csv : Path, optional
+        Export of the training split for the CSV-reading stages; None
+        skips it.
+
+    Returns
+    -------
+    tuple
+        The manifest and whether anything was written.
+    """
+    split_settings = {"test_ratio": test_ratio, "random_state": random_state}
+    manifest_dir = Path(manifest_path).parent
+    previous = read_manifest(manifest_path)
+
+    def up_to_date(manifest: Optional[Dict[str, Any]]) -> bool:
+        return (
+            manifest is not None
+            and {k: manifest["split"][k] for k in split_settings} == split_settings
+            and (manifest_dir / manifest["snapshot"]["path"]).exists()
+            and (training_csv is None or Path(training_csv).exists())
+        )
 
-    # Split into train/test
-    train_df, test_df = train_test_split(df, test_size=split_ratio, random_state=42)
+    fingerprint = source.fingerprint()
+    if (
+        fingerprint is not None
+        and up_to_date(previous)
+        and previous["source"]["fingerprint"] == fingerprint
+    ):
+        logger.info(f"{source.name} is unchanged (fingerprint {fingerprint}); nothing to do")
+        return previous, False
 
-    # Save CSVs
-    train_path = RAW_DATA_DIR / "marketing_training.csv"
-    test_path = RAW_DATA_DIR / "marketing_test.csv"
+    df = apply_dtypes(source.load())
+    digest = content_hash(df)
+    if up_to_date(previous) and previous["snapshot"]["sha256"] == digest:
+        logger.info(f"{source.name} content is unchanged ({digest[:16]}); nothing to do")
+        if previous["source"] != {"name": source.name, "fingerprint": fingerprint}:
+            previous["source"] = {"name": source.name, "fingerprint": fingerprint}
+            _write_atomic(
+                Path(manifest_path),
+                lambda tmp: tmp.write_text(json.dumps(previous, indent=2) + "\n"),
+            )
+        return previous, False
 
-    train_df.to_csv(train_path, index=False)
-    test_df.to_csv(test_path, index=False)
+    snapshot = Path(snapshot_dir) / f"{digest[:16]}.parquet"
+    if not snapshot.exists():
+        _write_atomic(snapshot, lambda tmp: df.to_parquet(tmp, index=False))
+        logger.info(f"Wrote snapshot {snapshot} ({len(df)} rows)")
+
+    _, test_rows = train_test_split(
+        np.arange(len(df)), test_size=test_ratio, random_state=random_state
+    )
+    manifest = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "source": {"name": source.name, "fingerprint": fingerprint},
+        "snapshot": {
+            "path": os.path.relpath(snapshot, manifest_dir),
+            "sha256": digest,
+            "rows": len(df),
+            "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
+        },
+        "split": {
+            **split_settings,
+            "train_rows": len(df) - len(test_rows),
+            "test_rows": sorted(int(i) for i in test_rows),
+        },
+    }
+    if training_csv is not None:
+        is_test = np.zeros(len(df), dtype=bool)
+        is_test[test_rows] = True
+        _write_atomic(Path(training_csv), lambda tmp: df[~is_test].to_csv(tmp, index=False))
+        logger.info(f"Exported the training split to {training_csv}")
+    # Written last: a run that fails earlier is redone
+    _write_atomic(
+        Path(manifest_path), lambda tmp: tmp.write_text(json.dumps(manifest, indent=2) + "\n")
+    )
+    logger.success(
+        f"Dataset {digest[:16]}: {manifest['split']['train_rows']} training and "
+        f"{len(test_rows)} test rows, manifest {manifest_path}"
+    )
+    return manifest, True
 
-    # Optional: save a processed copy in PROCESSED_DATA_DIR
-    processed_train_path = PROCESSED_DATA_DIR / "marketing_training.csv"
-    processed_test_path = PROCESSED_DATA_DIR / "marketing_test.csv"
 
-    train_df.to_csv(processed_train_path, index=False)
-    test_df.to_csv(processed_test_path, index=False)
+def main(
+    source: Optional[Path] = None,
+    split_ratio: float = 0.1,
+    revision: Optional[str] = None,
+):
+    """
+    Prepare the banking marketing dataset from ``source`` (a local file),
+    or from Hugging Face when it is None.
 
-    logger.success(f"Training and test CSVs saved successfully:\n"
-                   f"RAW: {train_path}, {test_path}\n"
-                   f"PROCESSED: {processed_train_path}, {processed_test_path}")
+    Args:
+        source (Path, optional): Local CSV/Parquet file with the raw data
+        split_ratio (float): Fraction of dataset to use as test set (0 < split_ratio < 1)
+        revision (str, optional): Hugging Face revision to pin
+    """
+    logger.info("Starting dataset preparation...")
+    data_source = LocalFileSource(source) if source else HuggingFaceSource(revision=revision)
+    prepare_dataset(data_source, test_ratio=split_ratio)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Prepare banking marketing dataset")
+    parser.add_argument(
+        "--source",
+        type=Path,
+        default=None,
+        help="Local CSV or Parquet file to ingest (default: the Hugging Face dataset)",
+    )
     parser.add_argument(
         "--test_ratio",
         type=float,
         default=0.1,
         help="Fraction of the dataset to use as the test set (default: 0.1)",
     )
+    parser.add_argument(
+        "--revision",
+        default=None,
+        help="Hugging Face dataset revision; pinning it lets unchanged runs skip loading",
+    )
     args = parser.parse_args()
-    main(split_ratio=args.test_ratio)
+    main(source=args.source, split_ratio=args.test_ratio, revision=args.revision)
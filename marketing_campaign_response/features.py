@@ -1,9 +1,18 @@
 # marketing_campaign_response/features.py
+import hashlib
+import io
+import math
+import threading
+import time
+import numpy as np
 import pandas as pd
-from typing import Tuple, Optional, List
+from typing import Dict, NamedTuple, Tuple, Optional, List, Sequence
 from pathlib import Path
 import joblib
 
+from marketing_campaign_response.config import CATEGORICAL_MAPPINGS_FILE
+from marketing_campaign_response.metrics import METRICS
+
 TARGET_COL = "responded"
 
 CATEGORICAL_COLS: List[str] = [
@@ -48,17 +57,360 @@ COLUMN_MAPPING = {
     "nr_employed": "nr.employed",
 }
 
-PROJ_ROOT = Path(__file__).resolve().parent.parent
-CATEGORICAL_MAPPINGS_FILE = PROJ_ROOT / "models" / "categorical_mappings.pkl"
 
+def _is_missing(value) -> bool:
+    # None/NaN become NaN under astype(str) and are therefore "unknown"
+    return (
+        value is None
+        or value is pd.NA
+        or (isinstance(value, float) and math.isnan(value))
+    )
 
-def load_categorical_mappings() -> dict:
-    if not CATEGORICAL_MAPPINGS_FILE.exists():
-        raise FileNotFoundError(
-            f"Categorical mappings not found at {CATEGORICAL_MAPPINGS_FILE}. "
-            "Please run models/create_categorical_mappings.py first."
+
+class CategoricalEncoder:
+    """
+    Compiled encoder mapping raw categorical values to category codes.
+
+    The allowed categories of every column are turned into a hashed
+    ``pd.Index`` once, so encoding a column is a single vectorized
+    ``get_indexer`` lookup instead of a per-row membership test.
+    String cleaning (strip + lower) only runs on the distinct raw values
+    of a column, which are usually a handful even for millions of rows.
+
+    The result is identical to the legacy path::
+
+        cleaned = values.astype(str).str.strip().str.lower()
+        cleaned = cleaned.apply(lambda x: x if x in allowed else "unknown")
+        pd.Categorical(cleaned, categories=allowed)
+
+    Parameters
+    ----------
+    mappings : dict
+        Column name -> list of allowed categories, as produced by
+        ``models/create_categorical_mappings.py``.
+    """
+
+    # Inputs up to this many rows are encoded with plain dict lookups
+    SMALL_BATCH = 64
+
+    def __init__(self, mappings: Dict[str, Sequence[str]]):
+        self.categories: Dict[str, List[str]] = {
+            col: list(mappings.get(col, [])) for col in CATEGORICAL_COLS
+        }
+        self._indexes: Dict[str, pd.Index] = {}
+        self._lookups: Dict[str, Dict[str, int]] = {}
+        self._dtypes: Dict[str, pd.CategoricalDtype] = {}
+        self._unknown_codes: Dict[str, int] = {}
+
+        for col, allowed in self.categories.items():
+            index = pd.Index(allowed)
+            if not index.is_unique:
+                raise ValueError(f"Categories for '{col}' contain duplicates")
+            self._indexes[col] = index
+            self._lookups[col] = {value: code for code, value in enumerate(allowed)}
+            self._dtypes[col] = pd.CategoricalDtype(index)
+            # Values outside the vocabulary collapse to "unknown", which is
+            # itself missing (code -1) when it is not an allowed category.
+            self._unknown_codes[col] = (
+                index.get_loc("unknown") if "unknown" in allowed else -1
+            )
+
+    def codes(self, col: str, values) -> np.ndarray:
+        """
+        Return the integer category codes of ``values`` for column ``col``.
+
+        Codes index into ``self.categories[col]``; ``-1`` marks a missing
+        category, exactly like ``pd.Categorical.codes``.
+        """
+        unknown = self._unknown_codes[col]
+
+        if len(values) <= self.SMALL_BATCH:
+            # pandas call overhead dominates tiny inputs; plain dict lookups win
+            lookup = self._lookups[col]
+            return np.array(
+                [
+                    unknown if _is_missing(v) else lookup.get(str(v).strip().lower(), unknown)
+                    for v in values
+                ],
+                dtype=np.int64,
+            )
+
+        raw = pd.Series(values, copy=False).astype(str)
+        # Factorize first so cleaning and lookup only touch distinct values
+        raw_codes, uniques = pd.factorize(raw)
+        cleaned = pd.Index(uniques).str.strip().str.lower()
+        lookup = self._indexes[col].get_indexer(cleaned)
+        lookup[lookup == -1] = unknown
+
+        # factorize marks NaN with -1, which picks the trailing "unknown" slot
+        return np.append(lookup, unknown)[raw_codes]
+
+    def encode(self, col: str, values) -> pd.Categorical:
+        """
+        Encode ``values`` of column ``col`` into a ``pd.Categorical``.
+        """
+        return pd.Categorical.from_codes(
+            self.codes(col, values), dtype=self._dtypes[col], validate=False
         )
-    return joblib.load(CATEGORICAL_MAPPINGS_FILE)
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Replace every categorical column of ``df`` with its encoded version.
+
+        ``df`` is modified in place and returned for convenience.
+        """
+        for col in CATEGORICAL_COLS:
+            df[col] = self.encode(col, df[col])
+        return df
+
+
+class MappingsSnapshot(NamedTuple):
+    """
+    Immutable view of one loaded version of the categorical mappings.
+    """
+
+    mappings: Dict[str, List[str]]
+    encoder: CategoricalEncoder
+    version: str
+
+
+class CategoricalMappingsCache:
+    """
+    Process-wide, thread-safe cache of the categorical mappings.
+
+    The mappings file is unpickled once and compiled into a
+    ``CategoricalEncoder``. Later calls only ``stat`` the file (at most once
+    every ``check_interval`` seconds); it is re-read when its mtime or size
+    changes and re-unpickled only when its content hash changes too.
+
+    Readers never block on each other: the current ``MappingsSnapshot`` is
+    swapped atomically, so a request always sees a consistent
+    mappings/encoder/version triple.
+
+    Parameters
+    ----------
+    path : Path
+        Location of ``categorical_mappings.pkl``.
+    check_interval : float
+        Minimum number of seconds between two file change checks.
+    """
+
+    def __init__(self, path: Path, *, check_interval: float = 1.0):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.reloads = 0
+
+        self._lock = threading.Lock()
+        self._snapshot: Optional[MappingsSnapshot] = None
+        self._stat_key: Optional[Tuple[int, int]] = None
+        self._next_check = 0.0
+
+    @property
+    def version(self) -> Optional[str]:
+        """
+        Content hash of the currently loaded mappings, or None if not loaded.
+        """
+        snapshot = self._snapshot
+        return snapshot.version if snapshot is not None else None
+
+    def get(self) -> MappingsSnapshot:
+        """
+        Return the current snapshot, reloading it if the file changed.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the mappings file has never been loaded and does not exist.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() < self._next_check:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is None or time.monotonic() >= self._next_check:
+                self._refresh()
+                self._next_check = time.monotonic() + self.check_interval
+            return self._snapshot
+
+    def _refresh(self) -> None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            if self._snapshot is not None:
+                # Keep serving the last good version while the file is replaced
+                return
+            raise FileNotFoundError(
+                f"Categorical mappings not found at {self.path}. "
+                "Please run models/create_categorical_mappings.py first."
+            ) from None
+
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        if stat_key == self._stat_key:
+            return
+
+        payload = self.path.read_bytes()
+        version = hashlib.sha256(payload).hexdigest()[:16]
+        self._stat_key = stat_key
+        if self._snapshot is not None and version == self._snapshot.version:
+            return  # touched but unchanged
+
+        mappings = joblib.load(io.BytesIO(payload))
+        self._snapshot = MappingsSnapshot(mappings, CategoricalEncoder(mappings), version)
+        self.reloads += 1
+
+
+MAPPINGS_CACHE = CategoricalMappingsCache(CATEGORICAL_MAPPINGS_FILE)
+
+
+def load_categorical_mappings() -> dict:
+    """
+    Return a copy of the cached categorical mappings.
+    """
+    mappings = MAPPINGS_CACHE.get().mappings
+    return {col: list(values) for col, values in mappings.items()}
+
+
+def get_categorical_encoder() -> CategoricalEncoder:
+    """
+    Return the compiled encoder for the cached categorical mappings.
+    """
+    return MAPPINGS_CACHE.get().encoder
+
+
+# Raw record key -> feature position, COLUMN_MAPPING aliases included
+_RECORD_KEY_INDEX: Dict[str, int] = {col: i for i, col in enumerate(FEATURE_COLS)}
+for _alias, _col in COLUMN_MAPPING.items():
+    if _col in _RECORD_KEY_INDEX:
+        _RECORD_KEY_INDEX.setdefault(_alias, _RECORD_KEY_INDEX[_col])
+
+
+def resolve_record_sources(records: Sequence[dict]) -> List[Optional[str]]:
+    """
+    Pick the record key feeding each feature, in ``FEATURE_COLS`` order.
+
+    Mirrors what building a DataFrame and running ``prepare_features``
+    does: columns follow their first appearance across all records and the
+    first key aliasing a feature wins for the whole batch. ``None`` means
+    no record has the feature at all.
+    """
+    sources: List[Optional[str]] = [None] * len(FEATURE_COLS)
+    for key in dict.fromkeys(key for record in records for key in record):
+        j = _RECORD_KEY_INDEX.get(key)
+        if j is not None and sources[j] is None:
+            sources[j] = key
+    return sources
+
+
+def normalize_records(records: Sequence[dict]) -> List[dict]:
+    """
+    Rewrite records to use exactly the ``FEATURE_COLS`` keys.
+
+    Aliases and absent columns are resolved for ``records`` alone, so the
+    normalized records score the same whether they are predicted on their
+    own or concatenated with other requests.
+    """
+    sources = resolve_record_sources(records)
+    defaults = ["unknown" if col in CATEGORICAL_COLS else 0 for col in FEATURE_COLS]
+    columns = list(zip(FEATURE_COLS, sources, defaults))
+    return [
+        {
+            col: record.get(key) if key is not None else default
+            for col, key, default in columns
+        }
+        for record in records
+    ]
+
+
+class RecordMatrixEncoder:
+    """
+    Encode JSON-style records straight into a float64 feature matrix.
+
+    This is the DataFrame-free equivalent of ``prepare_features`` followed
+    by LightGBM's own pandas conversion: columns come out in
+    ``FEATURE_COLS`` order, ``COLUMN_MAPPING`` aliases are honoured,
+    999 in ``pdays``/``pmonths`` becomes -1 and categorical values are
+    replaced by the category codes the model was trained with (NaN when
+    the model has no such category).
+
+    Parameters
+    ----------
+    encoder : CategoricalEncoder
+        Encoder holding the allowed categories of every column.
+    model_categories : list of lists, optional
+        Categories the booster saw during training, in
+        ``CATEGORICAL_COLS`` order (``Booster.pandas_categorical``).
+        Defaults to the encoder's own categories.
+    """
+
+    def __init__(
+        self,
+        encoder: CategoricalEncoder,
+        model_categories: Optional[List[list]] = None,
+    ):
+        self.n_features = len(FEATURE_COLS)
+        self.n_categorical = len(CATEGORICAL_COLS)
+
+        self._lookups: List[Dict[str, float]] = []
+        self._unknown: List[float] = []
+        for i, col in enumerate(CATEGORICAL_COLS):
+            allowed = encoder.categories[col]
+            trained = model_categories[i] if model_categories is not None else allowed
+            position = {value: float(code) for code, value in enumerate(trained)}
+
+            lookup = {value: position.get(value, np.nan) for value in allowed}
+            self._lookups.append(lookup)
+            self._unknown.append(lookup.get("unknown", np.nan))
+
+        self._never_contacted = [FEATURE_COLS.index("pdays"), FEATURE_COLS.index("pmonths")]
+
+    def encode(self, records: Sequence[dict], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Write ``records`` into ``out`` (or a new array) and return the rows used.
+
+        Parameters
+        ----------
+        records : sequence of dict
+            Raw customer records, e.g. a parsed JSON request body.
+        out : np.ndarray, optional
+            Preallocated float64 array with at least ``len(records)`` rows
+            and ``len(FEATURE_COLS)`` columns.
+
+        Returns
+        -------
+        np.ndarray
+            View of shape ``(len(records), len(FEATURE_COLS))``.
+        """
+        n_rows = len(records)
+        if n_rows == 0:
+            raise ValueError("Input records are empty")
+        if out is None:
+            out = np.empty((n_rows, self.n_features), dtype=np.float64)
+        matrix = out[:n_rows]
+
+        # One pass over the records per column, written straight into the
+        # buffer; no per-row Python lists
+        sources = resolve_record_sources(records)
+        for j, key in enumerate(sources):
+            if j < self.n_categorical:
+                lookup, unknown = self._lookups[j], self._unknown[j]
+                matrix[:, j] = unknown if key is None else [
+                    unknown if _is_missing(v := record.get(key))
+                    else lookup.get(str(v).strip().lower(), unknown)
+                    for record in records
+                ]
+            elif key is None:
+                # Numeric columns absent from every record default to 0
+                matrix[:, j] = 0.0
+            else:
+                matrix[:, j] = [
+                    np.nan if (v := record.get(key)) is None else float(v) for record in records
+                ]
+
+        for j in self._never_contacted:
+            column = matrix[:, j]
+            column[column == 999] = -1
+
+        return matrix
 
 
 def prepare_features(
@@ -66,11 +418,14 @@ def prepare_features(
     *,
     training: bool = True,
     target_col: str = TARGET_COL,
+    encoder: Optional[CategoricalEncoder] = None,
 ) -> Tuple[pd.DataFrame, Optional[pd.Series]]:
 
     if df.empty:
         raise ValueError("Input dataframe is empty")
 
+    # Stage timings: rename/select, categorical encoding, numeric fixes
+    mark = METRICS.stopwatch()
     df = df.copy()
 
     # 🔹 Normalize column names FIRST
@@ -91,29 +446,18 @@ def prepare_features(
 
     # 🔹 Enforce correct order
     df = df[FEATURE_COLS]
+    mark("features.rename")
 
     # 🔹 Categorical handling (LightGBM-native)
-    mappings = load_categorical_mappings()
-
-    for col in CATEGORICAL_COLS:
-        allowed = mappings.get(col, [])
-
-        df[col] = (
-            df[col]
-            .astype(str)
-            .str.strip()
-            .str.lower()
-        )
-
-        df[col] = df[col].apply(
-            lambda x: x if x in allowed else "unknown"
-        )
-
-        df[col] = pd.Categorical(df[col], categories=allowed)
+    if encoder is None:
+        encoder = get_categorical_encoder()
+    encoder.transform(df)
+    mark("features.encode")
 
     # 🔹 Special numeric handling
     df["pdays"] = df["pdays"].replace(999, -1)
     df["pmonths"] = df["pmonths"].replace(999, -1)
+    mark("features.numeric")
 
     return df, y
 
@@ -0,0 +1,23 @@
+# marketing_campaign_response/hashing.py
+
+"""
+Content hashes of files, shared by the dataset stage, the feature cache
+and the model registry. Kept free of heavy imports so that hashing a
+file does not load LightGBM or pandas.
+"""
+
+import hashlib
+from pathlib import Path
+
+BLOCK_SIZE = 1 << 20
+
+
+def file_digest(path: Path) -> str:
+    """
+    Hex sha256 of a file, read in 1 MiB blocks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
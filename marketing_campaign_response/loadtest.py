@@ -0,0 +1,505 @@
+# marketing_campaign_response/loadtest.py
+
+"""
+HTTP load generator that replays a corpus of scoring requests.
+
+A corpus is a JSON Lines file with one request per line::
+
+    {"method": "POST", "path": "/predict", "json": {"custAge": 40, ...}}
+    {"method": "POST", "path": "/predict/batch", "json": [{...}, {...}]}
+
+(``method`` defaults to POST; ``rows`` may be given explicitly, otherwise
+it is the length of a list body or of its ``records`` list, else 1).
+Bodies are encoded once when the corpus is loaded, so the generator
+spends its time sending requests rather than serializing them. When no
+recorded traffic exists, ``generate`` writes a synthetic corpus built
+from the customer schema (``synthetic.make_customers`` with the API field
+names), mixing single-record and batch requests.
+
+``run`` drives a target with the corpus, cycling through it until the
+duration or request budget is used up:
+
+- ``--app module:attr`` serves the app in-process through
+  ``httpx.ASGITransport`` (lifespan included), which needs no server but
+  shares the CPU between client and app;
+- ``--url http://127.0.0.1:8000`` sends real HTTP requests to a running
+  server (``serve.py``, uvicorn, ...).
+
+In closed-loop mode (default) ``--concurrency`` clients each send their
+next request as soon as the previous one completes. In open-loop mode
+(``--rate``) requests arrive at a fixed average rate (Poisson or evenly
+spaced) no matter how fast the target answers, with at most
+``--concurrency`` in flight; latency is measured from the scheduled
+arrival, so time spent queued behind a slow target is included.
+
+The report gives throughput (requests and rows per second), latency
+percentiles (p50/p95/p99) and the error rate, overall and per path.
+Responses with a 4xx/5xx status and transport failures count as errors.
+
+Usage::
+
+    python -m marketing_campaign_response.loadtest generate --requests 2000
+    python -m marketing_campaign_response.loadtest run \\
+        --app marketing_campaign_response.modeling.api:app --concurrency 16 --duration 30
+    python -m marketing_campaign_response.loadtest run \\
+        --url http://127.0.0.1:8000 --rate 200 --duration 60 --output report.json
+"""
+
+import asyncio
+from collections import Counter
+import itertools
+import json
+from pathlib import Path
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import httpx
+from loguru import logger
+import numpy as np
+import typer
+
+from marketing_campaign_response.config import DATA_DIR
+
+app = typer.Typer()
+
+DEFAULT_CORPUS = DATA_DIR / "loadtest" / "requests.jsonl"
+DEFAULT_APP = "marketing_campaign_response.modeling.api:app"
+JSON_HEADERS = {"Content-Type": "application/json"}
+PERCENTILES = (50, 95, 99)
+
+
+class ReplayRequest(NamedTuple):
+    method: str
+    path: str
+    body: bytes
+    rows: int
+
+
+class Sample(NamedTuple):
+    path: str
+    latency: float
+    status: int  # 0 for transport failures
+    rows: int
+
+
+# -------------------------------------------------------------------
+# Corpus
+# -------------------------------------------------------------------
+def _count_rows(body: Any) -> int:
+    if isinstance(body, list):
+        return len(body)
+    if isinstance(body, dict) and isinstance(body.get("records"), list):
+        return len(body["records"])
+    return 1
+
+
+def parse_corpus(lines: Iterable[str]) -> List[ReplayRequest]:
+    """
+    Parse JSON Lines corpus entries (blank lines are skipped).
+    """
+    requests = []
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        if "path" not in entry:
+            raise ValueError(f"Corpus line {number} has no path")
+        body = entry.get("json")
+        requests.append(
+            ReplayRequest(
+                method=entry.get("method", "POST").upper(),
+                path=entry["path"],
+                body=b"" if body is None else json.dumps(body).encode(),
+                rows=int(entry.get("rows", _count_rows(body))),
+            )
+        )
+    return requests
+
+
+def load_corpus(path: Path) -> List[ReplayRequest]:
+    with open(path) as f:
+        requests = parse_corpus(f)
+    if not requests:
+        raise ValueError(f"Corpus {path} is empty")
+    return requests
+
+
+def generate_corpus(
+    n_requests: int,
+    *,
+    batch_fraction: float = 0.2,
+    min_batch: int = 2,
+    max_batch: int = 100,
+    single_path: str = "/predict",
+    batch_path: str = "/predict/batch",
+    batch_key: Optional[str] = None,
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Synthetic corpus entries drawn from the customer schema.
+
+    Parameters
+    ----------
+    n_requests : int
+        Number of requests.
+    batch_fraction : float
+        Fraction of requests that are batches; the rest carry one record.
+    min_batch, max_batch : int
+        Batch sizes are drawn uniformly from this inclusive range.
+    single_path, batch_path : str
+        Endpoints of single-record and batch requests.
+    batch_key : str, optional
+        Wrap batch bodies in an object under this key (the root
+        ``api.py`` expects ``{"records": [...]}``).
+    seed : int
+        Seed of the random generator; equal seeds give equal corpora.
+    """
+    from marketing_campaign_response.schema import CUSTOMER_SCHEMA
+    from marketing_campaign_response.synthetic import make_customers
+
+    rng = np.random.default_rng(seed)
+    is_batch = rng.random(n_requests) < batch_fraction
+    sizes = np.where(is_batch, rng.integers(min_batch, max_batch + 1, n_requests), 1)
+
+    customers = make_customers(int(sizes.sum()), seed=seed)
+    customers = customers.rename(
+        columns={name: spec.api_name for name, spec in CUSTOMER_SCHEMA.items()}
+    )
+    records = customers.to_dict("records")
+
+    entries, offset = [], 0
+    for batch, size in zip(is_batch, sizes):
+        chunk = records[offset : offset + size]
+        offset += size
+        if batch:
+            body = {batch_key: chunk} if batch_key else chunk
+            entries.append({"method": "POST", "path": batch_path, "json": body})
+        else:
+            entries.append({"method": "POST", "path": single_path, "json": chunk[0]})
+    return entries
+
+
+def write_corpus(entries: Sequence[Dict[str, Any]], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+
+# -------------------------------------------------------------------
+# Load generation
+# -------------------------------------------------------------------
+async def _send(
+    client: httpx.AsyncClient, request: ReplayRequest, started: float, samples: List[Sample]
+) -> None:
+    try:
+        response = await client.request(
+            request.method, request.path, content=request.body or None, headers=JSON_HEADERS
+        )
+        await response.aread()
+        status = response.status_code
+    except httpx.HTTPError as exc:
+        logger.debug(f"{request.method} {request.path} failed: {exc!r}")
+        status = 0
+    samples.append(Sample(request.path, time.perf_counter() - started, status, request.rows))
+
+
+async def closed_loop(
+    client: httpx.AsyncClient,
+    corpus: Sequence[ReplayRequest],
+    *,
+    concurrency: int,
+    duration: Optional[float] = None,
+    max_requests: Optional[int] = None,
+) -> List[Sample]:
+    """
+    ``concurrency`` clients, each sending its next request when the
+    previous one completes.
+    """
+    samples: List[Sample] = []
+    counter = itertools.count()
+    deadline = None if duration is None else time.perf_counter() + duration
+
+    async def client_loop():
+        while True:
+            i = next(counter)
+            if max_requests is not None and i >= max_requests:
+                return
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            await _send(client, corpus[i % len(corpus)], time.perf_counter(), samples)
+
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    return samples
+
+
+async def open_loop(
+    client: httpx.AsyncClient,
+    corpus: Sequence[ReplayRequest],
+    *,
+    rate: float,
+    concurrency: int,
+    duration: Optional[float] = None,
+    max_requests: Optional[int] = None,
+    poisson: bool = True,
+    seed: int = 0,
+) -> List[Sample]:
+    """
+    Requests arriving at ``rate`` per second regardless of the responses,
+    at most ``concurrency`` in flight.
+
+    Arrivals are scheduled up front (exponential or constant gaps) and
+    latency counts from the scheduled arrival time.
+    """
+    if duration is None and max_requests is None:
+        raise ValueError("Give a duration or a request count")
+    rng = np.random.default_rng(seed)
+    samples: List[Sample] = []
+    slots = asyncio.Semaphore(concurrency)
+    tasks = []
+
+    async def fire(request: ReplayRequest, scheduled: float):
+        async with slots:
+            await _send(client, request, scheduled, samples)
+
+    start = time.perf_counter()
+    arrival = 0.0
+    for i in itertools.count():
+        if max_requests is not None and i >= max_requests:
+            break
+        arrival += rng.exponential(1.0 / rate) if poisson else 1.0 / rate
+        if duration is not None and arrival >= duration:
+            break
+        delay = start + arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(fire(corpus[i % len(corpus)], start + arrival)))
+    await asyncio.gather(*tasks)
+    return samples
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 60.0) -> None:
+    """
+    Poll ``/health/ready`` until it answers 200 (or 404: no probe).
+    """
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            status = (await client.get("/health/ready")).status_code
+            if status in (200, 404):
+                return
+        except httpx.HTTPError:
+            pass
+        if time.perf_counter() >= deadline:
+            raise TimeoutError(f"Target not ready after {timeout} s")
+        await asyncio.sleep(0.05)
+
+
+async def run_load(
+    corpus: Sequence[ReplayRequest],
+    *,
+    target_app: Any = None,
+    url: Optional[str] = None,
+    concurrency: int = 8,
+    rate: Optional[float] = None,
+    duration: Optional[float] = None,
+    max_requests: Optional[int] = None,
+    warmup: int = 10,
+    poisson: bool = True,
+    seed: int = 0,
+    timeout: float = 30.0,
+) -> Dict[str, Any]:
+    """
+    Replay ``corpus`` against an in-process ASGI app or a URL and return
+    the summary (see ``summarize``).
+    """
+    if (target_app is None) == (url is None):
+        raise ValueError("Give exactly one of target_app and url")
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    if target_app is not None:
+        lifespan = target_app.router.lifespan_context(target_app)
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=target_app),
+            base_url="http://loadtest",
+            timeout=timeout,
+        )
+    else:
+        lifespan = None
+        client = httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits)
+
+    async with client:
+        if lifespan is not None:
+            await lifespan.__aenter__()
+        try:
+            await wait_ready(client)
+            for request in corpus[:warmup]:
+                await _send(client, request, time.perf_counter(), [])
+
+            started = time.perf_counter()
+            if rate is None:
+                samples = await closed_loop(
+                    client, corpus, concurrency=concurrency,
+                    duration=duration, max_requests=max_requests,
+                )
+            else:
+                samples = await open_loop(
+                    client, corpus, rate=rate, concurrency=concurrency,
+                    duration=duration, max_requests=max_requests,
+                    poisson=poisson, seed=seed,
+                )
+            elapsed = time.perf_counter() - started
+        finally:
+            if lifespan is not None:
+                await lifespan.__aexit__(None, None, None)
+
+    summary = summarize(samples, elapsed)
+    summary["config"] = {
+        "target": url or "in-process",
+        "mode": "closed" if rate is None else "open",
+        "concurrency": concurrency,
+        "rate": rate,
+        "duration": duration,
+        "max_requests": max_requests,
+    }
+    return summary
+
+
+# -------------------------------------------------------------------
+# Report
+# -------------------------------------------------------------------
+def _stats(samples: Sequence[Sample], elapsed: float) -> Dict[str, Any]:
+    latencies = np.array([s.latency for s in samples]) * 1000.0
+    errors = sum(1 for s in samples if not 200 <= s.status < 400)
+    stats: Dict[str, Any] = {
+        "requests": len(samples),
+        "rows": sum(s.rows for s in samples),
+        "errors": errors,
+        "error_rate": errors / len(samples) if samples else 0.0,
+        "requests_per_s": len(samples) / elapsed if elapsed > 0 else 0.0,
+        "rows_per_s": sum(s.rows for s in samples) / elapsed if elapsed > 0 else 0.0,
+        "status": dict(sorted(Counter(str(s.status) for s in samples).items())),
+    }
+    if len(samples):
+        for p, value in zip(PERCENTILES, np.percentile(latencies, PERCENTILES)):
+            stats[f"p{p}_ms"] = float(value)
+        stats["mean_ms"] = float(latencies.mean())
+        stats["max_ms"] = float(latencies.max())
+    return stats
+
+
+def summarize(samples: Sequence[Sample], elapsed: float) -> Dict[str, Any]:
+    """
+    Throughput, latency percentiles and errors, overall and per path.
+    """
+    by_path: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        by_path.setdefault(sample.path, []).append(sample)
+    return {
+        "elapsed_s": elapsed,
+        "overall": _stats(samples, elapsed),
+        "paths": {path: _stats(group, elapsed) for path, group in sorted(by_path.items())},
+    }
+
+
+def format_report(summary: Dict[str, Any]) -> str:
+    lines = [
+        f"{'path':<24} {'requests':>9} {'req/s':>9} {'rows/s':>10} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>8}"
+    ]
+    rows = list(summary["paths"].items()) + [("all", summary["overall"])]
+    for path, stats in rows:
+        if not stats["requests"]:
+            continue
+        lines.append(
+            f"{path:<24} {stats['requests']:>9} {stats['requests_per_s']:>9.1f} "
+            f"{stats['rows_per_s']:>10.0f} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} "
+            f"{stats['p99_ms']:>8.2f} {stats['error_rate']:>8.2%}"
+        )
+    lines.append(f"status codes: {summary['overall']['status']}")
+    return "\n".join(lines)
+
+
+# -------------------------------------------------------------------
+# CLI
+# -------------------------------------------------------------------
+@app.command()
+def generate(
+    output: Path = typer.Option(DEFAULT_CORPUS, help="Corpus file to write"),
+    requests: int = typer.Option(1000, help="Number of requests"),
+    batch_fraction: float = typer.Option(0.2, help="Fraction of batch requests"),
+    min_batch: int = typer.Option(2),
+    max_batch: int = typer.Option(100),
+    single_path: str = typer.Option("/predict"),
+    batch_path: str = typer.Option("/predict/batch"),
+    batch_key: Optional[str] = typer.Option(None, help="Wrap batches as {KEY: [...]}"),
+    seed: int = typer.Option(0),
+):
+    """
+    Write a synthetic corpus drawn from the customer schema.
+    """
+    entries = generate_corpus(
+        requests,
+        batch_fraction=batch_fraction,
+        min_batch=min_batch,
+        max_batch=max_batch,
+        single_path=single_path,
+        batch_path=batch_path,
+        batch_key=batch_key,
+        seed=seed,
+    )
+    write_corpus(entries, output)
+    logger.info(f"Wrote {len(entries)} requests to {output}")
+
+
+@app.command()
+def run(
+    corpus: Path = typer.Option(DEFAULT_CORPUS, help="JSON Lines corpus to replay"),
+    target_app: str = typer.Option(DEFAULT_APP, "--app", help="In-process app (module:attr)"),
+    url: Optional[str] = typer.Option(None, help="Base URL of a running server (overrides --app)"),
+    concurrency: int = typer.Option(8, help="Clients (closed loop) or max in flight (open loop)"),
+    rate: Optional[float] = typer.Option(None, help="Open loop: arrivals per second"),
+    constant: bool = typer.Option(False, help="Open loop: evenly spaced instead of Poisson"),
+    duration: Optional[float] = typer.Option(30.0, help="Seconds to run"),
+    max_requests: Optional[int] = typer.Option(None, "--requests", help="Stop after N requests"),
+    warmup: int = typer.Option(10, help="Requests sent (and ignored) before measuring"),
+    seed: int = typer.Option(0),
+    output: Optional[Path] = typer.Option(None, help="Write the summary as JSON"),
+):
+    """
+    Replay the corpus against an app and report throughput and latency.
+    """
+    if corpus.exists():
+        requests = load_corpus(corpus)
+    else:
+        logger.info(f"No corpus at {corpus}; replaying a synthetic one")
+        requests = parse_corpus(json.dumps(e) for e in generate_corpus(1000, seed=seed))
+
+    asgi_app = None
+    if url is None:
+        from uvicorn.importer import import_from_string
+
+        asgi_app = import_from_string(target_app)
+
+    summary = asyncio.run(
+        run_load(
+            requests,
+            target_app=asgi_app,
+            url=url,
+            concurrency=concurrency,
+            rate=rate,
+            duration=duration,
+            max_requests=max_requests,
+            warmup=warmup,
+            poisson=not constant,
+            seed=seed,
+        )
+    )
+    typer.echo(format_report(summary))
+    if output is not None:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(summary, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    app()
@@ -1,79 +1,42 @@
 # marketing_campaign_response/main.py
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from marketing_campaign_response.modeling.predict import Predictor
-from pydantic import BaseModel
+from fastapi import Request
+from marketing_campaign_response.app_factory import create_app
+from marketing_campaign_response.modeling.responses import ScoreResponse
+from marketing_campaign_response.modeling.validation import customer_body, json_body
+from marketing_campaign_response.schema import validate_records
 from typing import List, Dict, Any
 
 # ------------------------------
 # App Initialization
 # ------------------------------
 
-app = FastAPI(
-    title="Marketing Campaign Predictor",
+# The model loads in the background once the server starts (see
+# /health/ready); inference runs on its own bounded pool so the probes
+# never wait behind it, and a full pool answers 503 with Retry-After.
+# CORS is open for the Vite frontend.
+app = create_app(
+    "Marketing Campaign Predictor",
     version="0.1.0",
-    description="Predicts customer response for marketing campaigns using ML model"
+    description="Predicts customer response for marketing campaigns using ML model",
+    cors_origins=["http://localhost:5173"],
 )
-
-# ✅ CORS Middleware for Vite frontend
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173"],  # frontend URL
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# ------------------------------
-# Predictor Instance
-# ------------------------------
-
-predictor = Predictor()
-
-# ------------------------------
-# Pydantic Model
-# ------------------------------
-
-class CustomerModel(BaseModel):
-    custAge: int
-    profession: str
-    marital: str
-    schooling: str
-    default: str
-    housing: str
-    contact: str
-    month: str
-    day_of_week: str
-    campaign: int
-    pdays: int
-    previous: int
-    poutcome: str
-    emp_var_rate: float
-    cons_price_idx: float
-    cons_conf_idx: float
-    euribor3m: float
-    nr_employed: float
-    pmonths: int
-    pastEmail: int
+service = app.state.model_service
+executor = app.state.executor
 
 # ------------------------------
 # API Endpoints
 # ------------------------------
 
-@app.get("/health", tags=["Health"])
-def health_check() -> Dict[str, str]:
-    """
-    Health check endpoint to verify backend is running
-    """
-    return {"status": "ok"}
+def _predict_customers(customers: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return service.predict_arrays(validate_records(customers))
 
 
-@app.post("/predict", tags=["Prediction"])
-def predict(customers: List[CustomerModel]) -> Dict[str, Any]:
+@app.post("/predict", tags=["Prediction"], openapi_extra=customer_body(many=True))
+async def predict(request: Request) -> Dict[str, Any]:
     """
     Accepts a list of customer data and returns predictions
     """
-    rows = [customer.dict() for customer in customers]
-    predictions = predictor.predict(rows)
-    return predictions
+    customers = await json_body(request)
+    result = await executor.run(_predict_customers, customers)
+    return ScoreResponse(result, accept=request.headers.get("accept"))
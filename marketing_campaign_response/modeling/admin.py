@@ -0,0 +1,92 @@
+# marketing_campaign_response/modeling/admin.py
+
+"""
+Admin endpoints for swapping the served model without a restart.
+
+- ``GET /admin/model``: version being served, the registry's active
+  version, activation history and published versions;
+- ``POST /admin/model/reload``: load the registry's active version, or
+  ``?version=...`` (which is activated first), warm it up and swap it in;
+- ``POST /admin/model/rollback``: return to the previously active version.
+
+Activations go through the registry's ``state.json``, so the other
+worker processes pick the change up on their next registry check (see
+``ModelService``); the process answering the request swaps immediately.
+
+The endpoints are disabled (``403``) unless the ``MODEL_ADMIN_TOKEN``
+environment variable is set; requests must then carry it in the
+``X-Admin-Token`` header::
+
+    MODEL_ADMIN_TOKEN=$(openssl rand -hex 32) uvicorn marketing_campaign_response.modeling.api:app
+    curl -X POST -H "X-Admin-Token: $MODEL_ADMIN_TOKEN" localhost:8000/admin/model/rollback
+"""
+
+import os
+import secrets
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, FastAPI, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from marketing_campaign_response.modeling.service import ModelService
+
+ADMIN_TOKEN_ENV = "MODEL_ADMIN_TOKEN"
+
+
+def _check_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    # Fail closed: without a configured token nobody may swap the model
+    expected = os.getenv(ADMIN_TOKEN_ENV)
+    if not expected:
+        raise HTTPException(
+            status_code=403, detail=f"Admin endpoints are disabled; set {ADMIN_TOKEN_ENV}"
+        )
+    if not secrets.compare_digest(x_admin_token or "", expected):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+def register_admin(app: FastAPI, service: ModelService) -> None:
+    """
+    Add the ``/admin/model`` endpoints for ``service`` to ``app``.
+    """
+    router = APIRouter(prefix="/admin/model", tags=["Admin"], dependencies=[Depends(_check_token)])
+
+    @router.get("")
+    async def model_info() -> Dict[str, Any]:
+        """
+        Served version, registry state and published versions.
+        """
+        info: Dict[str, Any] = {"serving": service.health().get("model_version")}
+        registry = service.registry
+        if registry is not None:
+            info.update(registry.state())
+            info["versions"] = registry.versions()
+        return info
+
+    @router.post("/reload")
+    async def reload_model(version: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Load, warm up and swap in a version; in-flight requests finish on
+        the previous one.
+        """
+        from marketing_campaign_response.modeling.registry import RegistryError
+
+        try:
+            if version is None:
+                return await run_in_threadpool(service.reload)
+            return await run_in_threadpool(service.activate, version)
+        except RegistryError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+
+    @router.post("/rollback")
+    async def rollback_model() -> Dict[str, Any]:
+        """
+        Swap the previously active version back in.
+        """
+        from marketing_campaign_response.modeling.registry import RegistryError
+
+        try:
+            return await run_in_threadpool(service.rollback)
+        except RegistryError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+
+    app.include_router(router)
@@ -4,66 +4,62 @@ FastAPI backend for Marketing Campaign Response Prediction.
 
 Provides endpoints for:
 - Predicting response for a single customer
-- Predicting response for a batch of customers
+- Predicting response for a batch of customers (JSON, raw float32 or
+  Arrow responses, chosen by the ``Accept`` header)
+- Columnar JSON / Arrow IPC batch scoring without per-record objects
+- Streaming predictions for NDJSON/CSV uploads of any size
 - Retrieving categorical mappings for frontend form population
-- Health check for service status
+- Liveness/readiness probes (see ``app_factory``)
 """
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import List, Optional
-import joblib
-from marketing_campaign_response.modeling.predict import Predictor
-from marketing_campaign_response.config import MODELS_DIR
+from fastapi import HTTPException, Request, Response
+from typing import Any, Dict, List
+from marketing_campaign_response.app_factory import create_app
+from marketing_campaign_response.features import MAPPINGS_CACHE
+from marketing_campaign_response.modeling.columnar import ColumnarFormatError, score_columnar
+from marketing_campaign_response.modeling.executor import ExecutorSaturated
+from marketing_campaign_response.modeling.responses import ScoreResponse
+from marketing_campaign_response.modeling.service import ModelNotReady
+from marketing_campaign_response.modeling.streaming import (
+    DuplexStreamingResponse,
+    detect_format,
+    stream_predictions,
+)
+from marketing_campaign_response.modeling.validation import customer_body, json_body
+from marketing_campaign_response.schema import (
+    SchemaValidationError,
+    validate_record,
+    validate_records,
+)
 
-app = FastAPI(title="Marketing Campaign Response Predictor")
-predictor = Predictor()
-
-
-# -------------------------------
-# Pydantic model for a single customer
-# -------------------------------
-class Customer(BaseModel):
-    """
-    Pydantic schema representing a single customer's features.
-
-    All fields are optional to allow partial submissions.
-    This schema is used for both single and batch predictions.
-    """
-    custAge: Optional[int]
-    profession: Optional[str]
-    marital: Optional[str]
-    schooling: Optional[str]
-    default: Optional[str]
-    housing: Optional[str]
-    contact: Optional[str]
-    month: Optional[str]
-    day_of_week: Optional[str]
-    campaign: Optional[int]
-    pdays: Optional[int]
-    previous: Optional[int]
-    poutcome: Optional[str]
-    emp_var_rate: Optional[float]
-    cons_price_idx: Optional[float]
-    cons_conf_idx: Optional[float]
-    euribor3m: Optional[float]
-    nr_employed: Optional[float]
-    pmonths: Optional[int]
-    pastEmail: Optional[int]
+# The model loads in the background once the server starts; concurrent
+# single-customer requests are scored together in micro-batches and batch
+# requests run on the bounded executor (503 + Retry-After when full)
+app = create_app(
+    "Marketing Campaign Response Predictor",
+    micro_batching=True,
+    batcher_kwargs={"max_batch_size": 256, "max_wait_ms": 2.0},
+)
+service = app.state.model_service
+executor = app.state.executor
 
 
 # -------------------------------
 # Single customer prediction
 # -------------------------------
-@app.post("/predict")
-def predict_customer(customer: Customer):
+@app.post("/predict", openapi_extra=customer_body())
+async def predict_customer(request: Request):
     """
     Predict marketing campaign response for a single customer.
 
+    Concurrent calls are coalesced by the micro-batcher into a single
+    vectorized model call; each caller receives only its own result.
+
     Parameters
     ----------
-    customer : Customer
-        Pydantic model with customer features.
+    request : Request
+        JSON object with the customer features (see ``CUSTOMER_SCHEMA``);
+        every feature is optional.
 
     Returns
     -------
@@ -71,16 +67,28 @@ def predict_customer(customer: Customer):
         Dictionary containing:
         - predictions: list of predicted classes (0/1)
         - probabilities: list of predicted probabilities for class 1
+        - model_version: version of the model that scored the request
+
+        Binary formats are available through ``Accept`` as for
+        ``/predict/batch``.
 
     Raises
     ------
+    SchemaValidationError
+        If a value is invalid (answered with 422 and an error report).
     HTTPException
         If prediction fails on the backend.
+    ExecutorSaturated
+        If too many requests are queued (answered with 503).
+    ModelNotReady
+        If the model is still loading (answered with 503).
     """
-    customer_dict = customer.dict()
+    customer = validate_record(await json_body(request))
     try:
-        result = predictor.predict([customer_dict])
-        return result
+        result = await service.predict_async(customer)
+        return ScoreResponse(result, accept=request.headers.get("accept"))
+    except (ExecutorSaturated, ModelNotReady):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -88,15 +96,22 @@ def predict_customer(customer: Customer):
 # -------------------------------
 # Batch predictions
 # -------------------------------
-@app.post("/predict/batch")
-def predict_batch(customers: List[Customer]):
+def _predict_customers(customers: List[Dict[str, Any]]) -> dict:
+    return service.predict_arrays(validate_records(customers))
+
+
+@app.post("/predict/batch", openapi_extra=customer_body(many=True))
+async def predict_batch(request: Request):
     """
     Predict marketing campaign response for a batch of customers.
 
+    The whole batch is validated column by column; see
+    ``marketing_campaign_response.schema``.
+
     Parameters
     ----------
-    customers : List[Customer]
-        List of Pydantic models, each representing a customer.
+    request : Request
+        JSON array of customer objects.
 
     Returns
     -------
@@ -104,30 +119,122 @@ def predict_batch(customers: List[Customer]):
         Dictionary containing:
         - predictions: list of predicted classes (0/1)
         - probabilities: list of predicted probabilities for class 1
+        - model_version: version of the model that scored the batch
+
+        ``Accept: application/octet-stream`` returns the probabilities as
+        raw little-endian float32 and ``Accept:
+        application/vnd.apache.arrow.stream`` an Arrow stream instead (see
+        ``serialization``); the model version is then in ``X-Model-Version``.
 
     Raises
     ------
+    SchemaValidationError
+        If values are invalid (answered with 422 and an error report).
     HTTPException
         If prediction fails on the backend.
+    ExecutorSaturated
+        If the inference executor is full (answered with 503).
+    ModelNotReady
+        If the model is still loading (answered with 503).
     """
+    customers = await json_body(request)
     try:
-        rows = [c.dict() for c in customers]
-        result = predictor.predict(rows)
-        return result
+        result = await executor.run(_predict_customers, customers)
+        return ScoreResponse(result, accept=request.headers.get("accept"))
+    except (ExecutorSaturated, ModelNotReady, SchemaValidationError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/predict/columnar")
+async def predict_columnar(request: Request):
+    """
+    Predict for a batch sent column by column.
+
+    The body is either columnar JSON (``{"custAge": [...], ...}``) or, with
+    ``Content-Type: application/vnd.apache.arrow.stream``, an Arrow IPC
+    stream. Columns go straight into ``prepare_features``; no per-record
+    objects are built. The response uses the request's format: columnar
+    JSON ``{"predictions": [...], "probabilities": [...]}`` or an Arrow
+    stream with ``prediction`` and ``probability`` columns, unless the
+    ``Accept`` header asks for another supported format. The
+    ``X-Model-Version`` header names the model that scored the batch.
+
+    Raises
+    ------
+    SchemaValidationError
+        If values are invalid (answered with 422 and an error report).
+    HTTPException
+        422 if the body cannot be decoded, 500 if prediction fails.
+    ExecutorSaturated
+        If the inference executor is full (answered with 503).
+    ModelNotReady
+        If the model is still loading (answered with 503).
+    """
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+    model = service.current
+    try:
+        content, media_type = await executor.run(
+            score_columnar, model.predictor, body, content_type, request.headers.get("accept")
+        )
+    except (ExecutorSaturated, SchemaValidationError):
+        raise
+    except ColumnarFormatError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return Response(
+        content=content, media_type=media_type, headers={"X-Model-Version": model.version}
+    )
+
+
+# -------------------------------
+# Streaming predictions
+# -------------------------------
+@app.post("/predict/stream")
+async def predict_stream(request: Request, chunk_size: int = 1000):
+    """
+    Score an NDJSON or CSV upload while it is still being received.
+
+    The body (``Content-Type: text/csv`` for CSV with a header line,
+    anything else is read as NDJSON) is parsed incrementally and scored in
+    chunks of ``chunk_size`` rows on the inference executor; predictions
+    are streamed back as NDJSON, so memory stays flat whatever the upload
+    size.
+
+    Returns
+    -------
+    StreamingResponse
+        ``application/x-ndjson`` lines ``{"row", "prediction",
+        "probability"}``, or ``{"error", "start_row", "end_row"}`` for a
+        chunk that could not be scored. The whole stream is scored by the
+        model named in the ``X-Model-Version`` header.
+    """
+    if not 1 <= chunk_size <= 10_000:
+        raise HTTPException(status_code=422, detail="chunk_size must be between 1 and 10000")
+    fmt = detect_format(request.headers.get("content-type"))
+    model = service.current
+    return DuplexStreamingResponse(
+        stream_predictions(request.stream(), model.predictor, fmt, chunk_size, run=executor.run),
+        headers={"X-Model-Version": model.version},
+    )
+
+
 # -------------------------------
 # Categorical mappings
 # -------------------------------
 @app.get("/categorical_mappings")
-def get_categorical_mappings():
+async def get_categorical_mappings(response: Response):
     """
     Returns allowed categorical values for all categorical columns.
 
     Frontend should fetch this endpoint to populate dropdowns dynamically
-    for user-friendly input forms.
+    for user-friendly input forms. These are the mappings of the model
+    being served (the default mappings file while it loads), from the
+    in-process cache; the ``X-Mappings-Version`` header carries their
+    content hash.
 
     Returns
     -------
@@ -140,30 +247,13 @@ def get_categorical_mappings():
     HTTPException
         If the mappings file does not exist or cannot be loaded.
     """
-    mappings_file = MODELS_DIR / "categorical_mappings.pkl"
-    if not mappings_file.exists():
-        raise HTTPException(status_code=404, detail="Categorical mappings not found")
-    
     try:
-        mappings = joblib.load(mappings_file)
-        return mappings
+        mappings = service.predictor.mappings if service.ready else MAPPINGS_CACHE
+        snapshot = mappings.get()
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Categorical mappings not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading categorical mappings: {str(e)}")
 
-
-# -------------------------------
-# Health check
-# -------------------------------
-@app.get("/health")
-def health_check():
-    """
-    Simple health check endpoint.
-
-    Returns
-    -------
-    dict
-        Dictionary indicating service status.
-        Example: {"status": "ok"}
-    """
-    return {"status": "ok"}
-
+    response.headers["X-Mappings-Version"] = snapshot.version
+    return snapshot.mappings
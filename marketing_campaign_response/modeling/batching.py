@@ -0,0 +1,213 @@
+# marketing_campaign_response/modeling/batching.py
+
+"""
+Dynamic micro-batching in front of the Predictor.
+
+Single-customer API traffic arrives as many tiny, concurrent requests.
+``MicroBatcher`` queues them, lets a dispatcher thread collect whatever
+arrives within ``max_wait_ms`` (up to ``max_batch_size`` records) and
+scores the lot with one vectorized ``Predictor.predict`` call. Every
+caller gets back only its own slice of the result, identical to what
+scoring its request alone would have returned.
+"""
+
+from concurrent.futures import Future
+import asyncio
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from marketing_campaign_response.features import normalize_records
+from marketing_campaign_response.metrics import METRICS
+from marketing_campaign_response.modeling.executor import ExecutorSaturated
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent prediction requests into vectorized batches.
+
+    Parameters
+    ----------
+    predictor : Predictor
+        Model wrapper whose ``predict`` accepts a list of records.
+    max_batch_size : int
+        Maximum number of records scored in one call. A single request
+        larger than this is scored on its own.
+    max_wait_ms : float
+        How long the dispatcher waits for more requests after the first
+        one of a batch arrived.
+    max_pending : int
+        Number of queued requests beyond which ``submit`` rejects new ones
+        with ``ExecutorSaturated``.
+    """
+
+    def __init__(
+        self,
+        predictor,
+        max_batch_size: int = 256,
+        max_wait_ms: float = 2.0,
+        max_pending: int = 4096,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_pending = max_pending
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self.batches = 0
+        self.requests = 0
+        self.records = 0
+        self.rejected = 0
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """
+        Number of batches, requests and records dispatched so far.
+        """
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "records": self.records,
+            "rejected": self.rejected,
+            "mean_batch_size": self.records / self.batches if self.batches else 0.0,
+            "pending": self._queue.qsize(),
+        }
+
+    def start(self) -> None:
+        """
+        Start the dispatcher thread (done automatically on first submit).
+        """
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="micro-batcher", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Finish queued requests and stop the dispatcher thread.
+        """
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, records: List[Dict[str, Any]]) -> Future:
+        """
+        Queue ``records`` for scoring and return a future of their result.
+
+        Raises
+        ------
+        ExecutorSaturated
+            If ``max_pending`` requests are already waiting.
+        """
+        if not records:
+            raise ValueError("Input records are empty")
+        if self._queue.qsize() >= self.max_pending:
+            self.rejected += 1
+            raise ExecutorSaturated()
+        if self._thread is None:
+            self.start()
+        future: Future = Future()
+        # Resolve aliases/absent columns per request before mixing requests
+        self._queue.put((normalize_records(records), future))
+        return future
+
+    def predict(self, records: List[Dict[str, Any]], timeout: Optional[float] = None) -> dict:
+        """
+        Blocking equivalent of ``Predictor.predict`` through the batcher.
+        """
+        return self.submit(records).result(timeout)
+
+    async def predict_async(self, records: List[Dict[str, Any]]) -> dict:
+        """
+        Awaitable equivalent of ``Predictor.predict`` through the batcher.
+        """
+        return await asyncio.wrap_future(self.submit(records))
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+
+            batch = [item]
+            size = len(item[0])
+            deadline = time.monotonic() + self.max_wait
+            stopping = False
+
+            while size < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                if size + len(item[0]) > self.max_batch_size:
+                    # Keep the request for the next batch
+                    self._dispatch(batch)
+                    batch, size = [], 0
+                batch.append(item)
+                size += len(item[0])
+
+            if batch:
+                self._dispatch(batch)
+            if stopping:
+                return
+
+    def _dispatch(self, batch: List[Tuple[list, Future]]) -> None:
+        # Drop requests whose caller already gave up
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        records = [record for request, _ in batch for record in request]
+        self.batches += 1
+        self.requests += len(batch)
+        self.records += len(records)
+        METRICS.observe_rows("microbatch", len(records))
+
+        try:
+            result = self.predictor.predict(records)
+        except Exception as exc:
+            if len(batch) == 1:
+                batch[0][1].set_exception(exc)
+                return
+            # Score requests one by one so a bad record only fails its caller
+            logger.warning("Batched prediction failed; retrying requests individually")
+            for request, future in batch:
+                try:
+                    future.set_result(self.predictor.predict(request))
+                except Exception as exc:
+                    future.set_exception(exc)
+            return
+
+        offset = 0
+        for request, future in batch:
+            end = offset + len(request)
+            future.set_result(_slice_result(result, offset, end))
+            offset = end
+
+
+def _slice_result(result: dict, start: int, end: int) -> dict:
+    # Per-row outputs are lists; anything else (e.g. metadata) is shared
+    return {
+        key: value[start:end] if isinstance(value, list) else value
+        for key, value in result.items()
+    }
+
@@ -0,0 +1,169 @@
+# marketing_campaign_response/modeling/cache.py
+
+"""
+LRU/TTL cache of model scores keyed on encoded feature rows.
+
+Campaign tooling re-scores the same customers many times a day. Rows are
+keyed on a hash of their canonicalized, fully encoded feature vector plus
+the model version, so a hit is only possible for the exact same model
+input. Lookups are done once per distinct row of a batch: duplicates
+inside a batch are collapsed, only cache misses are sent to the model (in
+one vectorized call) and the scores are scattered back into input order.
+"""
+
+from collections import OrderedDict
+import hashlib
+import threading
+import time
+from typing import Callable, Dict
+
+import numpy as np
+
+
+def canonicalize(X: np.ndarray) -> np.ndarray:
+    """
+    Return a C-contiguous float64 copy of ``X`` with a single NaN bit
+    pattern and no negative zeros, so equal rows have equal bytes.
+    """
+    X = np.array(X, dtype=np.float64, order="C", copy=True)
+    X += 0.0  # -0.0 + 0.0 == +0.0
+    X[np.isnan(X)] = np.nan
+    return X
+
+
+class PredictionCache:
+    """
+    Thread-safe, size- and age-bounded cache of positive-class probabilities.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of cached rows; the least recently used row is
+        evicted first.
+    ttl : float
+        Seconds a cached score stays valid.
+    clock : callable
+        Monotonic time source, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 100_000,
+        ttl: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.deduplicated = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Hit/miss/eviction counters and the current size.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "deduplicated": self.deduplicated,
+            "size": len(self._entries),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def row_keys(X: np.ndarray, version: str) -> list:
+        """
+        Hash every row of a canonicalized matrix together with ``version``.
+        """
+        salt = version.encode()
+        return [
+            hashlib.blake2b(row, digest_size=16, key=salt[:64]).digest()
+            for row in map(bytes, X)
+        ]
+
+    def score(
+        self,
+        X: np.ndarray,
+        scorer: Callable[[np.ndarray], np.ndarray],
+        version: str,
+    ) -> np.ndarray:
+        """
+        Score ``X``, calling ``scorer`` only for rows not in the cache.
+
+        Parameters
+        ----------
+        X : np.ndarray
+            Encoded feature matrix, one row per record.
+        scorer : callable
+            Maps a feature matrix to probabilities, e.g. the booster.
+        version : str
+            Model version; part of every key.
+
+        Returns
+        -------
+        np.ndarray
+            Probabilities in the row order of ``X``.
+        """
+        X = canonicalize(X)
+        n_rows = X.shape[0]
+
+        # Collapse identical rows so each distinct input is looked up once
+        row_view = X.view(np.dtype((np.void, X.dtype.itemsize * X.shape[1]))).ravel()
+        _, first, inverse = np.unique(row_view, return_index=True, return_inverse=True)
+        unique = X[first]
+        keys = self.row_keys(unique, version)
+
+        scores = np.empty(len(keys), dtype=np.float64)
+        missing = []
+        now = self._clock()
+        with self._lock:
+            self.deduplicated += n_rows - len(keys)
+            for i, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] <= now:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+                if entry is None:
+                    missing.append(i)
+                    continue
+                self._entries.move_to_end(key)
+                scores[i] = entry[0]
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            missing = np.asarray(missing)
+            fresh = np.asarray(scorer(unique[missing]), dtype=np.float64)
+            scores[missing] = fresh
+            self._store([keys[i] for i in missing], fresh.tolist())
+
+        return scores[inverse.ravel()]
+
+    def _store(self, keys: list, values: list) -> None:
+        expires_at = self._clock() + self.ttl
+        with self._lock:
+            for key, value in zip(keys, values):
+                self._entries[key] = (value, expires_at)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
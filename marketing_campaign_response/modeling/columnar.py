@@ -0,0 +1,131 @@
+# marketing_campaign_response/modeling/columnar.py
+
+"""
+Column-oriented request and response bodies for batch scoring.
+
+``/predict/batch`` receives a JSON array of records: Pydantic builds one
+model object per record, ``.dict()`` turns each back into a dict and
+pandas turns the dicts back into columns. The formats here are columnar
+end to end, so a batch goes straight into a DataFrame of NumPy columns
+and to ``prepare_features`` without any per-row Python objects:
+
+- columnar JSON: ``{"custAge": [...], "profession": [...], ...}``, every
+  value a list of the same length; answered with
+  ``{"predictions": [...], "probabilities": [...]}``;
+- Apache Arrow IPC stream (``application/vnd.apache.arrow.stream``) with
+  one column per feature; answered with an Arrow stream holding the
+  ``prediction`` (int8) and ``probability`` (float64) columns.
+
+An ``Accept`` header naming another supported format (see
+``serialization``) overrides the response format.
+"""
+
+import json
+from typing import Optional, Tuple
+
+import pandas as pd
+
+from marketing_campaign_response.metrics import METRICS
+from marketing_campaign_response.modeling.serialization import (
+    ARROW_STREAM_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    encode,
+    negotiate,
+    score_arrays,
+)
+from marketing_campaign_response.schema import validate_frame
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+
+class ColumnarFormatError(ValueError):
+    """
+    Raised when a columnar request body cannot be decoded.
+    """
+
+
+def is_arrow(content_type: str) -> bool:
+    return ARROW_STREAM_MEDIA_TYPE in (content_type or "").lower()
+
+
+def _loads(body: bytes):
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def frame_from_columnar_json(body: bytes) -> pd.DataFrame:
+    """
+    Decode a columnar JSON object into a DataFrame.
+
+    Raises
+    ------
+    ColumnarFormatError
+        If the body is not an object of equally long, non-empty lists.
+    """
+    try:
+        columns = _loads(body)
+    except ValueError as exc:
+        raise ColumnarFormatError(f"Invalid JSON: {exc}") from exc
+
+    if not isinstance(columns, dict) or not columns:
+        raise ColumnarFormatError("Expected a JSON object mapping column names to lists")
+    lengths = {}
+    for name, values in columns.items():
+        if not isinstance(values, list):
+            raise ColumnarFormatError(f"Column '{name}' is not a list")
+        lengths[name] = len(values)
+    if len(set(lengths.values())) != 1:
+        raise ColumnarFormatError(f"Columns have different lengths: {lengths}")
+    if not next(iter(lengths.values())):
+        raise ColumnarFormatError("Columns are empty")
+
+    return pd.DataFrame(columns)
+
+
+def frame_from_arrow(body: bytes) -> pd.DataFrame:
+    """
+    Decode an Arrow IPC stream into a DataFrame.
+
+    Raises
+    ------
+    ColumnarFormatError
+        If the body is not a valid, non-empty Arrow IPC stream.
+    """
+    import pyarrow as pa
+
+    try:
+        table = pa.ipc.open_stream(body).read_all()
+    except pa.ArrowInvalid as exc:
+        raise ColumnarFormatError(f"Invalid Arrow IPC stream: {exc}") from exc
+    if table.num_rows == 0:
+        raise ColumnarFormatError("Arrow stream has no rows")
+    return table.to_pandas()
+
+
+def score_columnar(
+    predictor, body: bytes, content_type: str, accept: Optional[str] = None
+) -> Tuple[bytes, str]:
+    """
+    Decode ``body``, validate it (``validate_frame``), score it and
+    encode the result in the same format, or the one ``accept`` asks for.
+
+    Returns
+    -------
+    tuple
+        Response body and its media type.
+    """
+    mark = METRICS.stopwatch()
+    arrow = is_arrow(content_type)
+    frame = frame_from_arrow(body) if arrow else frame_from_columnar_json(body)
+    mark("parse")
+    probs = predictor.predict_proba(validate_frame(frame))
+
+    mark = METRICS.stopwatch()
+    media_type = negotiate(accept, default=ARROW_STREAM_MEDIA_TYPE if arrow else JSON_MEDIA_TYPE)
+    content = encode(score_arrays(probs), media_type)
+    mark("serialize")
+    return content, media_type
@@ -0,0 +1,418 @@
+# marketing_campaign_response/modeling/evaluation.py
+
+"""
+Evaluation report of a scored customer base.
+
+Marketing looks at more than accuracy and AUC when choosing who to
+contact: decile lift, cumulative gains, calibration, precision/recall at
+contact budgets and AUC per segment. This module computes all of them
+from one pass over the scores, in chunks of any size:
+
+- ``ScoreHistogram`` bins each chunk's scores into ``SCORE_BINS``
+  equal-width bins on [0, 1] and accumulates, with ``np.bincount``, the
+  rows, positives and score sums per bin, overall and per segment value;
+- ``evaluation_report`` derives every metric from the histograms. Bins
+  are already ordered by score, so ranking needs no sort: cumulative
+  sums from the top bin give the positives captured by the first ``k``
+  rows (interpolated inside the bin that ``k`` ends in), and AUC is the
+  Mann-Whitney statistic over bins.
+
+Memory is fixed by ``SCORE_BINS`` and the number of segment values, not
+by the number of rows. Scores closer than one bin (1e-4) count as ties,
+which moves AUC by at most about that much.
+
+``write_report`` saves the result as JSON and a self-contained HTML page
+under ``reports/evaluation/``.
+
+Usage::
+
+    python -m marketing_campaign_response.modeling.evaluation data/processed/scored_base.csv --score-col probability
+"""
+
+from datetime import datetime, timezone
+import html
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import joblib
+from loguru import logger
+import numpy as np
+import pandas as pd
+import typer
+
+from marketing_campaign_response.config import MODEL_PATH, REPORTS_DIR
+from marketing_campaign_response.features import TARGET_COL, prepare_features
+
+app = typer.Typer()
+
+EVALUATION_DIR = REPORTS_DIR / "evaluation"
+
+# Resolution of the score histograms
+SCORE_BINS = 10_000
+CALIBRATION_BINS = 10
+# Segment columns with their own AUC
+SEGMENT_COLS: Tuple[str, ...] = ("profession", "month", "contact")
+# Contact budgets, as fractions of the scored base
+BUDGETS: Tuple[float, ...] = (0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5)
+
+
+def response_labels(values: pd.Series) -> np.ndarray:
+    """
+    0/1 labels of a target column, with the rule of ``prepare_features``.
+    """
+    return values.astype(str).str.lower().isin(["yes", "1", "true"]).to_numpy(dtype=np.int8)
+
+
+class ScoreHistogram:
+    """
+    Rows, positives and score sums per score bin, overall and per segment.
+
+    Parameters
+    ----------
+    segment_cols : sequence of str
+        Columns whose values get their own histograms.
+    bins : int
+        Number of equal-width score bins on [0, 1].
+    """
+
+    def __init__(self, segment_cols: Sequence[str] = SEGMENT_COLS, bins: int = SCORE_BINS):
+        self.bins = bins
+        self.rows = np.zeros(bins)
+        self.positives = np.zeros(bins)
+        self.score_sum = np.zeros(bins)
+        self.log_loss_sum = 0.0
+        self.brier_sum = 0.0
+        self.segment_cols = tuple(segment_cols)
+        # Per column: value -> row of the (values, bins) arrays below
+        self.segment_values: Dict[str, Dict[str, int]] = {col: {} for col in self.segment_cols}
+        self.segment_rows = {col: np.zeros((0, bins)) for col in self.segment_cols}
+        self.segment_positives = {col: np.zeros((0, bins)) for col in self.segment_cols}
+
+    def update(
+        self,
+        y_true: Any,
+        y_score: Any,
+        segments: Optional[Mapping[str, Any]] = None,
+    ) -> "ScoreHistogram":
+        """
+        Add a chunk of 0/1 labels, positive-class scores and, for every
+        segment column, the rows' values (a DataFrame or a mapping).
+        """
+        y = np.asarray(y_true, dtype=np.float64)
+        p = np.asarray(y_score, dtype=np.float64)
+        if y.shape != p.shape or y.ndim != 1:
+            raise ValueError(f"Labels {y.shape} and scores {p.shape} must be 1-D and aligned")
+        if len(p) and (p.min() < 0 or p.max() > 1):
+            raise ValueError("Scores must be probabilities in [0, 1]")
+
+        idx = np.minimum((p * self.bins).astype(np.intp), self.bins - 1)
+        self.rows += np.bincount(idx, minlength=self.bins)
+        self.positives += np.bincount(idx, weights=y, minlength=self.bins)
+        self.score_sum += np.bincount(idx, weights=p, minlength=self.bins)
+        clipped = np.clip(p, 1e-15, 1 - 1e-15)
+        self.log_loss_sum -= float(np.sum(y * np.log(clipped) + (1 - y) * np.log1p(-clipped)))
+        self.brier_sum += float(np.sum((p - y) ** 2))
+
+        for col in self.segment_cols:
+            if segments is None or col not in segments:
+                raise ValueError(f"Missing segment column {col!r}")
+            self._update_segment(col, pd.Series(np.asarray(segments[col])), idx, y)
+        return self
+
+    def _update_segment(self, col: str, values: pd.Series, idx: np.ndarray, y: np.ndarray):
+        # Only the distinct values are normalized
+        codes, uniques = pd.factorize(values, use_na_sentinel=False)
+        uniques = ["missing" if pd.isna(v) else str(v).strip().lower() for v in uniques]
+        known = self.segment_values[col]
+        for value in uniques:
+            known.setdefault(value, len(known))
+        new_rows = len(known) - len(self.segment_rows[col])
+        if new_rows:
+            pad = np.zeros((new_rows, self.bins))
+            self.segment_rows[col] = np.vstack([self.segment_rows[col], pad])
+            self.segment_positives[col] = np.vstack([self.segment_positives[col], pad])
+
+        rows = np.array([known[value] for value in uniques], dtype=np.intp)[codes]
+        flat = rows * self.bins + idx
+        size = len(known) * self.bins
+        self.segment_rows[col] += np.bincount(flat, minlength=size).reshape(-1, self.bins)
+        self.segment_positives[col] += np.bincount(flat, weights=y, minlength=size).reshape(
+            -1, self.bins
+        )
+
+
+def histogram_auc(rows: np.ndarray, positives: np.ndarray) -> Optional[float]:
+    """
+    AUC of binned scores (bins in ascending score order); ties count half.
+
+    None when either class is absent.
+    """
+    negatives = rows - positives
+    n_pos, n_neg = positives.sum(), negatives.sum()
+    if n_pos == 0 or n_neg == 0:
+        return None
+    negatives_below = np.cumsum(negatives) - negatives
+    return float(np.sum(positives * (negatives_below + 0.5 * negatives)) / (n_pos * n_neg))
+
+
+class _Ranking:
+    """
+    Positives among, and score cut-off of, the ``k`` highest-scored rows.
+    """
+
+    def __init__(self, rows: np.ndarray, positives: np.ndarray):
+        bins = len(rows)
+        top_down = np.arange(bins)[::-1]
+        filled = top_down[rows[top_down] > 0]
+        self.cum_rows = np.concatenate([[0.0], np.cumsum(rows[filled])])
+        self.cum_positives = np.concatenate([[0.0], np.cumsum(positives[filled])])
+        # Upper then lower edge of each filled bin, walking down
+        self.edges = np.concatenate([[(filled[0] + 1) / bins], filled / bins])
+
+    def positives(self, k: np.ndarray) -> np.ndarray:
+        return np.interp(k, self.cum_rows, self.cum_positives)
+
+    def threshold(self, k: np.ndarray) -> np.ndarray:
+        return np.interp(k, self.cum_rows, self.edges)
+
+
+def evaluation_report(
+    hist: ScoreHistogram,
+    *,
+    budgets: Sequence[float] = BUDGETS,
+    calibration_bins: int = CALIBRATION_BINS,
+) -> Dict[str, Any]:
+    """
+    All metrics of the accumulated scores, as a JSON-serializable dict.
+
+    Sections: ``summary`` (rows, base rate, AUC, log loss, Brier score,
+    accuracy at 0.5), ``deciles`` (rate and lift per tenth of the base
+    ranked by score), ``gains`` (share of responders captured in the top
+    1%..100%), ``calibration`` (mean score vs observed rate in
+    ``calibration_bins`` equal-width bins, with the expected calibration
+    error in the summary), ``budgets`` (precision/recall when contacting
+    the top ``budget`` fraction) and ``segments`` (rows, rate and AUC per
+    value of every segment column).
+    """
+    n = float(hist.rows.sum())
+    n_pos = float(hist.positives.sum())
+    if not n:
+        raise ValueError("No scores were accumulated")
+    base_rate = n_pos / n
+    ranking = _Ranking(hist.rows, hist.positives)
+
+    # Cut-off 0.5 is a bin edge when the bin count is even
+    above = np.arange(hist.bins) >= hist.bins // 2
+    true_pos = hist.positives[above].sum()
+    true_neg = (hist.rows - hist.positives)[~above].sum()
+
+    decile_k = np.linspace(0, n, 11)
+    decile_pos = np.diff(ranking.positives(decile_k))
+    decile_thresholds = ranking.threshold(decile_k)
+    deciles = [
+        {
+            "decile": i + 1,
+            "min_score": float(decile_thresholds[i + 1]),
+            "response_rate": float(decile_pos[i] / (n / 10)),
+            "lift": float(decile_pos[i] / (n / 10) / base_rate) if base_rate else None,
+            "cumulative_lift": float(
+                ranking.positives(decile_k[i + 1]) / decile_k[i + 1] / base_rate
+            ) if base_rate else None,
+        }
+        for i in range(10)
+    ]
+
+    share = np.arange(1, 101) / 100
+    captured = ranking.positives(share * n)
+    gains = [
+        {"population": float(s), "responders": float(c / n_pos) if n_pos else None}
+        for s, c in zip(share, captured)
+    ]
+
+    if hist.bins % calibration_bins:
+        raise ValueError(f"{calibration_bins} calibration bins do not divide {hist.bins} score bins")
+    group = hist.bins // calibration_bins
+    cal_rows = hist.rows.reshape(calibration_bins, group).sum(axis=1)
+    cal_pos = hist.positives.reshape(calibration_bins, group).sum(axis=1)
+    cal_score = hist.score_sum.reshape(calibration_bins, group).sum(axis=1)
+    calibration, ece = [], 0.0
+    for i in range(calibration_bins):
+        entry = {
+            "low": i / calibration_bins,
+            "high": (i + 1) / calibration_bins,
+            "rows": int(cal_rows[i]),
+            "mean_score": None,
+            "observed_rate": None,
+        }
+        if cal_rows[i]:
+            entry["mean_score"] = float(cal_score[i] / cal_rows[i])
+            entry["observed_rate"] = float(cal_pos[i] / cal_rows[i])
+            ece += cal_rows[i] / n * abs(entry["mean_score"] - entry["observed_rate"])
+        calibration.append(entry)
+
+    budget_k = np.asarray(budgets, dtype=np.float64) * n
+    budget_pos = ranking.positives(budget_k)
+    budget_thresholds = ranking.threshold(budget_k)
+    budget_rows = [
+        {
+            "budget": float(b),
+            "contacts": int(round(k)),
+            "min_score": float(t),
+            "precision": float(tp / k) if k else None,
+            "recall": float(tp / n_pos) if n_pos else None,
+            "lift": float(tp / k / base_rate) if k and base_rate else None,
+        }
+        for b, k, tp, t in zip(budgets, budget_k, budget_pos, budget_thresholds)
+    ]
+
+    segments: Dict[str, List[Dict[str, Any]]] = {}
+    for col in hist.segment_cols:
+        rows, positives = hist.segment_rows[col], hist.segment_positives[col]
+        entries = [
+            {
+                "segment": value,
+                "rows": int(rows[i].sum()),
+                "response_rate": float(positives[i].sum() / rows[i].sum()),
+                "auc": histogram_auc(rows[i], positives[i]),
+            }
+            for value, i in hist.segment_values[col].items()
+            if rows[i].sum()
+        ]
+        segments[col] = sorted(entries, key=lambda e: -e["rows"])
+
+    return {
+        "summary": {
+            "rows": int(n),
+            "positives": int(n_pos),
+            "base_rate": base_rate,
+            "auc": histogram_auc(hist.rows, hist.positives),
+            "log_loss": hist.log_loss_sum / n,
+            "brier": hist.brier_sum / n,
+            "accuracy_at_0.5": float((true_pos + true_neg) / n),
+            "expected_calibration_error": float(ece),
+            "score_bins": hist.bins,
+        },
+        "deciles": deciles,
+        "gains": gains,
+        "calibration": calibration,
+        "budgets": budget_rows,
+        "segments": segments,
+    }
+
+
+def evaluate_chunks(
+    chunks: Iterable[Tuple[Any, Any, Optional[Mapping[str, Any]]]],
+    *,
+    segment_cols: Sequence[str] = SEGMENT_COLS,
+    budgets: Sequence[float] = BUDGETS,
+) -> Dict[str, Any]:
+    """
+    Report of ``(labels, scores, segments)`` chunks, in one pass.
+    """
+    hist = ScoreHistogram(segment_cols)
+    for y_true, y_score, segments in chunks:
+        hist.update(y_true, y_score, segments)
+    return evaluation_report(hist, budgets=budgets)
+
+
+def _fmt(value: Any) -> str:
+    if value is None:
+        return "–"
+    if isinstance(value, float):
+        return f"{value:.4f}"
+    return html.escape(str(value))
+
+
+def _table(title: str, rows: List[Dict[str, Any]]) -> str:
+    if not rows:
+        return ""
+    head = "".join(f"<th>{html.escape(col)}</th>" for col in rows[0])
+    body = "".join(
+        "<tr>" + "".join(f"<td>{_fmt(v)}</td>" for v in row.values()) + "</tr>" for row in rows
+    )
+    return f"<h2>{html.escape(title)}</h2><table><tr>{head}</tr>{body}</table>"
+
+
+def render_html(report: Dict[str, Any]) -> str:
+    """
+    Self-contained HTML page of a report.
+    """
+    summary = [{"metric": key, "value": value} for key, value in report["summary"].items()]
+    gains = [g for g in report["gains"] if round(g["population"] * 100) % 10 == 0]
+    sections = [
+        _table("Summary", summary),
+        _table("Decile lift", report["deciles"]),
+        _table("Cumulative gains", gains),
+        _table("Calibration", report["calibration"]),
+        _table("Contact budgets", report["budgets"]),
+        *(_table(f"AUC by {col}", rows) for col, rows in report["segments"].items()),
+    ]
+    style = (
+        "body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin-bottom:1.5em}"
+        "td,th{border:1px solid #ccc;padding:.25em .6em;text-align:right}th{background:#f4f4f4}"
+    )
+    title = html.escape(report.get("title", "Evaluation report"))
+    return (
+        f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{title}</title>"
+        f"<style>{style}</style></head><body><h1>{title}</h1>{''.join(sections)}</body></html>\n"
+    )
+
+
+def write_report(
+    report: Dict[str, Any], name: str = "evaluation", out_dir: Path = EVALUATION_DIR
+) -> Tuple[Path, Path]:
+    """
+    Write ``<name>.json`` and ``<name>.html`` under ``out_dir``.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    json_path, html_path = out_dir / f"{name}.json", out_dir / f"{name}.html"
+    json_path.write_text(json.dumps(report, indent=2) + "\n")
+    html_path.write_text(render_html(report))
+    logger.info(f"Evaluation report -> {json_path}, {html_path}")
+    return json_path, html_path
+
+
+@app.command()
+def main(
+    scored: Path = typer.Argument(..., help="CSV with the target column (and scores)"),
+    score_col: Optional[str] = typer.Option(
+        None, help="Column of positive-class scores; scored with the model when omitted"
+    ),
+    model_path: Path = typer.Option(MODEL_PATH, help="Model used when there is no score column"),
+    chunk_size: int = typer.Option(500_000, help="CSV rows read at a time"),
+    name: Optional[str] = typer.Option(None, help="Report file name (default: CSV name)"),
+):
+    """
+    Evaluate a scored (or raw, to be scored) customer base in one pass.
+    """
+    model = joblib.load(model_path) if score_col is None else None
+
+    def chunks():
+        for chunk in pd.read_csv(scored, chunksize=chunk_size):
+            if model is None:
+                scores = chunk[score_col].to_numpy()
+                labels = response_labels(chunk[TARGET_COL])
+            else:
+                X, y = prepare_features(chunk, training=True, target_col=TARGET_COL)
+                scores, labels = model.predict(X), y.to_numpy()
+            yield labels, scores, chunk
+
+    report = {
+        "title": f"Evaluation of {scored.name}",
+        "source": str(scored),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        **evaluate_chunks(chunks()),
+    }
+    write_report(report, name or scored.stem)
+    summary = report["summary"]
+    # Both are None when the file holds a single class
+    auc, lift = summary["auc"], report["deciles"][0]["lift"]
+    logger.success(
+        f"{summary['rows']} rows, AUC {'n/a' if auc is None else format(auc, '.4f')}, "
+        f"top-decile lift {'n/a' if lift is None else format(lift, '.2f')}"
+    )
+
+
+if __name__ == "__main__":
+    app()
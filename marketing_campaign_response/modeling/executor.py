@@ -0,0 +1,167 @@
+# marketing_campaign_response/modeling/executor.py
+
+"""
+Bounded executor for CPU-bound inference work.
+
+FastAPI runs sync endpoints on Starlette's shared threadpool, so a few
+large batch requests can starve cheap endpoints such as ``/health``.
+Async endpoints instead hand model work to a dedicated, size-bounded
+``InferenceExecutor``. When its workers and queue are full it rejects new
+work with ``ExecutorSaturated`` straight away, which the apps turn into a
+``503`` with a ``Retry-After`` header, instead of letting latency grow
+without limit.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+class ExecutorSaturated(RuntimeError):
+    """
+    Raised when the inference executor cannot accept more work.
+
+    Attributes
+    ----------
+    retry_after : int
+        Suggested number of seconds before the client retries.
+    """
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Inference capacity exhausted, retry later")
+        self.retry_after = retry_after
+
+
+class InferenceExecutor:
+    """
+    Thread pool with a bounded queue and queueing statistics.
+
+    Parameters
+    ----------
+    max_workers : int
+        Number of inference threads.
+    max_queue : int
+        Number of tasks allowed to wait for a free worker. Submissions
+        beyond ``max_workers + max_queue`` in-flight tasks are rejected.
+    retry_after : int
+        Value of the ``Retry-After`` hint attached to rejections.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 32, retry_after: int = 1):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Number of accepted tasks still waiting for a worker.
+        """
+        return self._in_flight - self._running
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Capacity, queue depth, counters and queue wait times (seconds).
+        """
+        with self._lock:
+            started = self.completed + self._running
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queue_depth": self._in_flight - self._running,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "completed": self.completed,
+                "wait_seconds_avg": self._wait_total / started if started else 0.0,
+                "wait_seconds_max": self._wait_max,
+            }
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Schedule ``fn(*args, **kwargs)`` on an inference thread.
+
+        Raises
+        ------
+        ExecutorSaturated
+            If all workers are busy and the queue is full.
+        """
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturated(self.retry_after)
+            self._in_flight += 1
+            self.submitted += 1
+
+        task = functools.partial(self._run, time.perf_counter(), fn, args, kwargs)
+        try:
+            return self._pool.submit(task)
+        except BaseException:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Awaitable version of ``submit``; returns ``fn``'s result.
+        """
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+    def _run(self, queued_at: float, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        waited = time.perf_counter() - queued_at
+        with self._lock:
+            self._running += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._in_flight -= 1
+                self.completed += 1
+
+
+def register_executor(app: FastAPI, executor: InferenceExecutor) -> None:
+    """
+    Wire ``executor`` into ``app``.
+
+    Adds the ``ExecutorSaturated`` -> 503 + ``Retry-After`` handler and a
+    ``GET /stats/executor`` endpoint exposing queue depth and wait times.
+    """
+
+    async def saturated_handler(request: Request, exc: ExecutorSaturated) -> JSONResponse:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": str(exc)},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
+    app.add_exception_handler(ExecutorSaturated, saturated_handler)
+
+    @app.get("/stats/executor", tags=["Health"])
+    async def executor_stats() -> Dict[str, Any]:
+        """
+        Inference executor capacity, queue depth and queue wait times.
+        """
+        return executor.stats
@@ -0,0 +1,95 @@
+# marketing_campaign_response/modeling/export.py
+
+"""
+Export the trained model into serving artifacts.
+
+Besides the joblib pickle used by ``Predictor``, two representations are
+written next to it:
+
+- ``lgbm_marketing.txt``: LightGBM's native text model, loadable without
+  unpickling;
+- ``lgbm_marketing_forest/``: the flattened tree arrays of the NumPy tree
+  engine as plain ``.npy`` files, which every serving worker can
+  memory-map so the pages are shared through the OS page cache.
+
+Both carry the model version (content hash of the pickle) so a stale
+export is never paired with a newer model.
+
+Usage::
+
+    python -m marketing_campaign_response.modeling.export
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, Tuple
+
+import joblib
+from loguru import logger
+import typer
+
+from marketing_campaign_response.config import FOREST_DIR, MODEL_PATH, MODEL_TXT_PATH
+from marketing_campaign_response.modeling.tree_engine import flatten_booster
+
+app = typer.Typer()
+
+
+def model_version(model_path: Path = MODEL_PATH) -> str:
+    """
+    Content hash identifying a pickled model file.
+    """
+    return hashlib.sha256(Path(model_path).read_bytes()).hexdigest()[:16]
+
+
+def export_paths(model_path: Path = MODEL_PATH) -> Tuple[Path, Path]:
+    """
+    Native text model and forest directory next to a pickled model
+    (``MODEL_TXT_PATH`` and ``FOREST_DIR`` for ``MODEL_PATH``).
+    """
+    model_path = Path(model_path)
+    return model_path.with_suffix(".txt"), model_path.with_name(f"{model_path.stem}_forest")
+
+
+def export_model(
+    model,
+    version: str,
+    txt_path: Path = MODEL_TXT_PATH,
+    forest_dir: Path = FOREST_DIR,
+) -> Dict[str, Path]:
+    """
+    Write the native text model and the flat forest arrays.
+
+    Parameters
+    ----------
+    model : lightgbm.Booster
+        Trained booster.
+    version : str
+        Version of the pickled model the artifacts belong to.
+    txt_path : Path
+        Destination of the native LightGBM model.
+    forest_dir : Path
+        Destination directory of the flat forest arrays.
+
+    Returns
+    -------
+    dict
+        Paths of the written artifacts.
+    """
+    model.save_model(str(txt_path))
+    flatten_booster(model).save(forest_dir, model_version=version)
+    logger.info(f"Exported model {version} to {txt_path} and {forest_dir}")
+    return {"txt": txt_path, "forest": forest_dir}
+
+
+@app.command()
+def main(model_path: Path = typer.Option(MODEL_PATH, help="Pickled model to export")):
+    """
+    Export serving artifacts of the trained model, next to it.
+    """
+    if not model_path.exists():
+        raise typer.BadParameter(f"Model file not found: {model_path}")
+    export_model(joblib.load(model_path), model_version(model_path), *export_paths(model_path))
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,184 @@
+# marketing_campaign_response/modeling/feature_cache.py
+
+"""
+On-disk cache of prepared training data.
+
+Training used to re-read the CSV with type inference, rerun
+``prepare_features`` and bin every feature into LightGBM histograms on
+each run. This cache stores the outcome of those steps under a key made
+of the source file's content hash and a feature version::
+
+    data/interim/feature_cache/
+        <source sha256[:16]>-<feature version>/
+            manifest.json
+            train.bin       # lgb.Dataset.save_binary: bins and labels
+            train.parquet   # prepared training features + target
+            val.parquet     # prepared validation features + target
+
+The feature version hashes everything else the cached files depend on:
+the source of ``features.py``, the categorical mappings, the LightGBM
+Dataset parameters, the train/validation split and the LightGBM
+version. Changing any of them, or the data, changes the key, so stale
+entries are never read; older entries of the same source file are
+deleted when a new one is written.
+
+Entries are written to a temporary directory and renamed into place.
+On a hit, the training set is loaded straight from ``train.bin``, which
+skips CSV parsing, feature preparation and histogram construction. Only
+the validation features are read, from Parquet, whose schema keeps the
+dtypes (category order included); they are checked against the dtypes
+recorded in the manifest.
+"""
+
+from datetime import datetime, timezone
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from typing import Any, Dict, NamedTuple, Optional
+
+import lightgbm as lgb
+from loguru import logger
+import pandas as pd
+
+from marketing_campaign_response import features
+from marketing_campaign_response.config import FEATURE_CACHE_DIR
+from marketing_campaign_response.features import MAPPINGS_CACHE, TARGET_COL
+from marketing_campaign_response.hashing import file_digest
+
+MANIFEST_FILE = "manifest.json"
+TRAIN_BINARY = "train.bin"
+TRAIN_FEATURES = "train.parquet"
+VAL_FEATURES = "val.parquet"
+
+# Bump when the layout of an entry changes
+CACHE_FORMAT = 1
+
+
+class TrainingData(NamedTuple):
+    """
+    Inputs of ``train.fit_model``.
+
+    ``X_train``/``y_train`` are None when the training set was loaded
+    from its binary file. ``val_set`` is the already binned validation
+    set when it was built without an in-memory frame (``out_of_core``);
+    ``X_val`` is then a (memory-mapped) feature matrix.
+    """
+
+    train_set: lgb.Dataset
+    X_val: pd.DataFrame
+    y_val: pd.Series
+    X_train: Optional[pd.DataFrame] = None
+    y_train: Optional[pd.Series] = None
+    val_set: Optional[lgb.Dataset] = None
+
+
+def feature_version(dataset_params: Dict[str, Any], split: Dict[str, Any]) -> str:
+    """
+    Hash of the feature code, mappings and settings the cache depends on.
+    """
+    digest = hashlib.sha256(Path(features.__file__).read_bytes())
+    digest.update(MAPPINGS_CACHE.get().version.encode())
+    settings = {
+        "format": CACHE_FORMAT,
+        "lightgbm": lgb.__version__,
+        "dataset_params": dataset_params,
+        "split": split,
+    }
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+    return digest.hexdigest()[:16]
+
+
+class FeatureCache:
+    """
+    Prepared training data keyed by source content and feature version.
+
+    Parameters
+    ----------
+    root : Path
+        Cache directory (created on first write).
+    """
+
+    def __init__(self, root: Path = FEATURE_CACHE_DIR):
+        self.root = Path(root)
+
+    def key(self, source: Path, version: str) -> str:
+        return f"{file_digest(source)[:16]}-{version}"
+
+    def load(self, key: str, dataset_params: Dict[str, Any]) -> Optional[TrainingData]:
+        """
+        The cached entry ``key``, or None if it is missing or unreadable.
+        """
+        entry = self.root / key
+        try:
+            manifest = json.loads((entry / MANIFEST_FILE).read_text())
+            train_set = lgb.Dataset(str(entry / TRAIN_BINARY), params=dict(dataset_params))
+            train_set.construct()
+            # Not kept in the binary file; needed to encode pandas input
+            # the same way at prediction time
+            train_set.pandas_categorical = manifest["pandas_categorical"]
+            val = pd.read_parquet(entry / VAL_FEATURES)
+            y_val = val.pop(TARGET_COL)
+            dtypes = {col: str(dtype) for col, dtype in val.dtypes.items()}
+            if dtypes != manifest["dtypes"]:
+                raise ValueError(f"validation dtypes {dtypes} != {manifest['dtypes']}")
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            logger.warning(f"Ignoring unreadable feature cache entry {key}: {exc!r}")
+            return None
+        return TrainingData(train_set, val, y_val)
+
+    def save(self, key: str, data: TrainingData, source: Path) -> Path:
+        """
+        Store ``data`` (with its training features) as entry ``key``.
+        """
+        if data.X_train is None:
+            raise ValueError("Training features are needed to populate the cache")
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{key}-", dir=self.root))
+        try:
+            data.train_set.construct().save_binary(str(staging / TRAIN_BINARY))
+            data.X_train.assign(**{TARGET_COL: data.y_train}).to_parquet(
+                staging / TRAIN_FEATURES, index=False
+            )
+            data.X_val.assign(**{TARGET_COL: data.y_val}).to_parquet(
+                staging / VAL_FEATURES, index=False
+            )
+            manifest = {
+                "key": key,
+                "source": str(Path(source).resolve()),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "rows": {"train": len(data.X_train), "val": len(data.X_val)},
+                "dtypes": {col: str(dtype) for col, dtype in data.X_val.dtypes.items()},
+                "pandas_categorical": data.train_set.pandas_categorical,
+            }
+            (staging / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2) + "\n")
+            entry = self.root / key
+            if entry.exists():
+                shutil.rmtree(entry)
+            os.rename(staging, entry)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self._prune(manifest["source"], keep=key)
+        logger.info(f"Cached prepared training data in {entry}")
+        return entry
+
+    def _prune(self, source: str, keep: str) -> None:
+        """
+        Delete the other entries of ``source``; they can no longer match.
+        """
+        for manifest_path in self.root.glob(f"*/{MANIFEST_FILE}"):
+            entry = manifest_path.parent
+            if entry.name == keep:
+                continue
+            try:
+                if json.loads(manifest_path.read_text()).get("source") != source:
+                    continue
+            except ValueError:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            logger.info(f"Removed stale feature cache entry {entry.name}")
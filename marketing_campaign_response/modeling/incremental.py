@@ -0,0 +1,211 @@
+# marketing_campaign_response/modeling/incremental.py
+
+"""
+Incremental (warm-start) retraining on new campaign outcomes.
+
+A full run of ``train.py`` boosts up to 1000 rounds from scratch on the
+whole history. When a week of new outcomes arrives, this module continues
+the current model instead:
+
+1. the booster at ``MODEL_PATH`` (or ``--model-path``) is the
+   ``init_model``, so its trees are kept and new rounds fit the residuals
+   it leaves on the new data;
+2. the new data is binned against the bin boundaries of the original
+   training set (``BIN_REFERENCE_PATH``, written by ``train.save_model``),
+   so new trees split on the same thresholds as the old ones;
+3. the most recent rows of the new data (rows are taken to be in arrival
+   order) form a rolling validation window for early stopping, and at
+   most ``max_rounds`` rounds are added;
+4. the updated model replaces the one it continued, at the same path and
+   with its exports next to it, and is published like a full training
+   run, as a new registry version. Continuing another model than
+   ``MODEL_PATH`` therefore leaves the production pickle alone.
+
+Usage::
+
+    python -m marketing_campaign_response.modeling.incremental data/processed/week_42.csv
+"""
+
+from pathlib import Path
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import joblib
+import lightgbm as lgb
+from loguru import logger
+import pandas as pd
+from sklearn.metrics import accuracy_score, roc_auc_score
+import typer
+
+from marketing_campaign_response.config import BIN_REFERENCE_PATH, MODEL_PATH
+from marketing_campaign_response.features import TARGET_COL, prepare_features
+from marketing_campaign_response.modeling.export import model_version
+from marketing_campaign_response.modeling.train import (
+    DATASET_PARAMS,
+    save_model,
+    tuned_params,
+)
+
+app = typer.Typer()
+
+
+def load_bin_reference(path: Path = BIN_REFERENCE_PATH) -> lgb.Dataset:
+    """
+    Dataset holding the bin boundaries of the original training set.
+    """
+    if not Path(path).exists():
+        raise FileNotFoundError(
+            f"No bin boundaries at {path}; run a full training (train.py) first"
+        )
+    return lgb.Dataset(str(path), params=dict(DATASET_PARAMS)).construct()
+
+
+def rolling_split(
+    X: pd.DataFrame, y: pd.Series, val_window: float
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
+    """
+    Split off the last rows as the validation window.
+
+    ``val_window`` is a fraction of the rows when below 1, else a row count.
+    """
+    n_val = int(round(len(X) * val_window)) if val_window < 1 else int(val_window)
+    if not 0 < n_val < len(X):
+        raise ValueError(f"Validation window of {n_val} rows does not fit {len(X)} rows")
+    split = len(X) - n_val
+    return X.iloc[:split], X.iloc[split:], y.iloc[:split], y.iloc[split:]
+
+
+def update_model(
+    model: lgb.Booster,
+    df: pd.DataFrame,
+    *,
+    reference: lgb.Dataset,
+    params: Optional[Dict[str, Any]] = None,
+    max_rounds: int = 200,
+    early_stopping_rounds: Optional[int] = 20,
+    val_window: float = 0.2,
+    log_period: int = 0,
+) -> Tuple[lgb.Booster, Dict[str, Any]]:
+    """
+    Continue boosting ``model`` on the new raw training frame ``df``.
+
+    Parameters
+    ----------
+    model : lgb.Booster
+        Current model; it is not modified.
+    df : pd.DataFrame
+        New data with the target column, oldest rows first.
+    reference : lgb.Dataset
+        Bin boundaries of the original training set (``load_bin_reference``).
+    params : dict, optional
+        LightGBM parameters (default ``train.tuned_params()``);
+        ``scale_pos_weight`` is set from the new labels.
+    max_rounds : int
+        Most boosting rounds to add.
+    early_stopping_rounds : int, optional
+        Patience on the validation window's AUC; None adds exactly
+        ``max_rounds`` rounds.
+    val_window : float
+        Validation window: fraction (< 1) or number of the newest rows.
+    log_period : int
+        Log the validation AUC every ``log_period`` rounds (0: never).
+
+    Returns
+    -------
+    tuple
+        The updated booster and the validation ``accuracy``, ``auc``,
+        ``base_auc`` (the current model on the same window) and
+        ``rounds_added``.
+    """
+    X, y = prepare_features(df, training=True, target_col=TARGET_COL)
+    X_fit, X_val, y_fit, y_val = rolling_split(X, y, val_window)
+
+    pos_ratio = y_fit.mean()
+    train_params = {
+        **(params or tuned_params()),
+        "scale_pos_weight": (1 - pos_ratio) / pos_ratio,
+        "metric": "auc",
+    }
+    # Not kept in the binary file; the new data must encode its
+    # categories the way the model was trained on
+    reference.pandas_categorical = model.pandas_categorical
+    # Not constructed here: lgb.train first sets the init scores from
+    # ``model``, which needs the raw features
+    train_set = lgb.Dataset(
+        X_fit, label=y_fit, reference=reference, params=dict(DATASET_PARAMS), free_raw_data=False
+    )
+    val_set = lgb.Dataset(X_val, label=y_val, reference=train_set, params=dict(DATASET_PARAMS))
+
+    callbacks = []
+    if early_stopping_rounds:
+        callbacks.append(lgb.early_stopping(early_stopping_rounds, verbose=False))
+    if log_period:
+        callbacks.append(lgb.log_evaluation(log_period))
+    updated = lgb.train(
+        train_params,
+        train_set,
+        num_boost_round=max_rounds,
+        init_model=model,
+        valid_sets=[val_set],
+        valid_names=["val"],
+        callbacks=callbacks,
+    )
+
+    val_preds = updated.predict(X_val)
+    metrics = {
+        "accuracy": accuracy_score(y_val, (val_preds >= 0.5).astype(int)),
+        "auc": roc_auc_score(y_val, val_preds),
+        "base_auc": roc_auc_score(y_val, model.predict(X_val)),
+        "rounds_added": updated.current_iteration() - model.current_iteration(),
+    }
+    return updated, metrics
+
+
+@app.command()
+def main(
+    new_data: Path = typer.Argument(..., help="CSV of new outcomes, oldest rows first"),
+    model_path: Path = typer.Option(
+        MODEL_PATH, help="Model to continue; the updated model replaces it"
+    ),
+    bins_path: Path = typer.Option(BIN_REFERENCE_PATH, help="Bin boundaries of its training set"),
+    max_rounds: int = typer.Option(200, help="Most boosting rounds to add"),
+    early_stopping_rounds: int = typer.Option(20),
+    val_window: float = typer.Option(0.2, help="Newest rows used for validation (fraction or count)"),
+):
+    """
+    Add boosting rounds on new data and publish the result as a new version.
+    """
+    start = time.perf_counter()
+    model = joblib.load(model_path)
+    base_version = model_version(model_path)
+    df = pd.read_csv(new_data)
+    logger.info(f"Continuing model {base_version} on {len(df)} new rows from {new_data}")
+
+    updated, metrics = update_model(
+        model,
+        df,
+        reference=load_bin_reference(bins_path),
+        max_rounds=max_rounds,
+        early_stopping_rounds=early_stopping_rounds,
+        val_window=val_window,
+        log_period=25,
+    )
+    bundle = save_model(
+        updated,
+        metrics,
+        model_path=model_path,
+        metadata={
+            "incremental": True,
+            "base_model_version": base_version,
+            "rounds_added": metrics["rounds_added"],
+            "training_data": str(new_data),
+        },
+    )
+    logger.success(
+        f"Added {metrics['rounds_added']} rounds in {time.perf_counter() - start:.1f} s: "
+        f"validation AUC {metrics['base_auc']:.4f} -> {metrics['auc']:.4f} ({bundle.version})"
+    )
+
+
+if __name__ == "__main__":
+    app()
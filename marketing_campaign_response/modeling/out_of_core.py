@@ -0,0 +1,269 @@
+# marketing_campaign_response/modeling/out_of_core.py
+
+"""
+Out-of-core training for training sets larger than memory.
+
+``train.py`` reads the whole CSV into a DataFrame, copies it in
+``prepare_features`` and splits it with ``train_test_split``, so its
+peak memory grows with the file. This module streams the file instead:
+
+1. the CSV is read ``chunk_size`` rows at a time;
+2. each chunk goes through the same ``prepare_features`` and is turned
+   into a float64 matrix the way LightGBM converts a DataFrame
+   (category codes, missing categories as NaN);
+3. ``StratifiedStreamSplit`` assigns its rows to training or validation,
+   keeping every class at the validation fraction of ``SPLIT``;
+4. the rows are appended to spool files on disk, one per split;
+5. the training and validation Datasets are built from the spools,
+   memory-mapped, through ``lightgbm.Sequence``: LightGBM samples rows
+   for the bin boundaries, then bins the rows batch by batch.
+
+The Python-side peak is a few chunks plus LightGBM's bin sample
+(``bin_construct_sample_cnt`` rows, about 80 MB at the default 200,000),
+and is independent of the file size. What stays in memory is what
+LightGBM itself keeps: the binned training set (about one byte per
+feature and row) and the labels.
+``fit_model`` then trains as usual; it scores the memory-mapped
+validation matrix for the final metrics.
+
+Spool files are written to ``INTERIM_DATA_DIR`` (on disk, unlike a
+tmpfs ``/tmp``) and removed after training.
+
+Usage::
+
+    python -m marketing_campaign_response.modeling.out_of_core data/processed/history.csv --chunk-size 200000
+"""
+
+from pathlib import Path
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import lightgbm as lgb
+from loguru import logger
+import numpy as np
+import pandas as pd
+import typer
+
+from marketing_campaign_response.config import INTERIM_DATA_DIR, PROCESSED_DATA_DIR
+from marketing_campaign_response.features import (
+    CATEGORICAL_COLS,
+    FEATURE_COLS,
+    TARGET_COL,
+    prepare_features,
+)
+from marketing_campaign_response.modeling.feature_cache import TrainingData
+from marketing_campaign_response.modeling.train import (
+    DATASET_PARAMS,
+    SPLIT,
+    fit_model,
+    save_model,
+    tuned_params,
+)
+from marketing_campaign_response.modeling.tree_engine import frame_to_matrix
+
+app = typer.Typer()
+
+# Rows per CSV chunk
+CHUNK_SIZE = 100_000
+
+
+class StratifiedStreamSplit:
+    """
+    Stratified train/validation split of rows arriving in chunks.
+
+    For every class, the number of validation rows seen so far is kept at
+    ``round(test_size * rows of that class seen so far)``; which rows of
+    a chunk fill that quota is drawn at random.
+
+    Parameters
+    ----------
+    test_size : float
+        Fraction of each class assigned to validation.
+    seed : int
+        Seed of the row draws; equal seeds and chunks give equal splits.
+    """
+
+    def __init__(
+        self,
+        test_size: float = SPLIT["test_size"],
+        seed: int = SPLIT["random_state"],
+    ):
+        self.test_size = test_size
+        self.rng = np.random.default_rng(seed)
+        self.seen: Dict[Any, int] = {}
+        self.held_out: Dict[Any, int] = {}
+
+    def __call__(self, y: np.ndarray) -> np.ndarray:
+        """
+        Boolean mask of the validation rows of a chunk with labels ``y``.
+        """
+        y = np.asarray(y)
+        mask = np.zeros(len(y), dtype=bool)
+        for label in np.unique(y):
+            rows = np.flatnonzero(y == label)
+            seen = self.seen.get(label, 0) + len(rows)
+            quota = int(round(self.test_size * seen)) - self.held_out.get(label, 0)
+            mask[self.rng.choice(rows, size=quota, replace=False)] = True
+            self.seen[label] = seen
+            self.held_out[label] = self.held_out.get(label, 0) + quota
+        return mask
+
+
+class RowSpool:
+    """
+    Feature rows and labels appended to files under ``directory``.
+    """
+
+    def __init__(self, directory: Path, name: str, n_features: int):
+        self.features_path = Path(directory) / f"{name}.features"
+        self.labels_path = Path(directory) / f"{name}.labels"
+        self.n_features = n_features
+        self.rows = 0
+        self._features = open(self.features_path, "wb")
+        self._labels = open(self.labels_path, "wb")
+
+    def append(self, X: np.ndarray, y: np.ndarray) -> None:
+        np.ascontiguousarray(X, dtype=np.float64).tofile(self._features)
+        np.asarray(y, dtype=np.int8).tofile(self._labels)
+        self.rows += len(X)
+
+    def finish(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Close the files; the features memory-mapped and the labels.
+        """
+        self._features.close()
+        self._labels.close()
+        if not self.rows:
+            raise ValueError(f"No rows were spooled to {self.features_path.stem}")
+        features = np.memmap(
+            self.features_path, dtype=np.float64, mode="r", shape=(self.rows, self.n_features)
+        )
+        return features, np.fromfile(self.labels_path, dtype=np.int8)
+
+
+class MatrixSequence(lgb.Sequence):
+    """
+    ``lightgbm.Sequence`` over a (memory-mapped) 2-D array.
+    """
+
+    def __init__(self, rows: np.ndarray, batch_size: int = lgb.Sequence.batch_size):
+        self.rows = rows
+        self.batch_size = batch_size
+
+    def __getitem__(self, idx):
+        return np.asarray(self.rows[idx])
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+def load_streaming_training_data(
+    source: Path,
+    spool_dir: Path,
+    *,
+    chunk_size: int = CHUNK_SIZE,
+    split: Optional[StratifiedStreamSplit] = None,
+    dataset_params: Optional[Dict[str, Any]] = None,
+) -> TrainingData:
+    """
+    Training data of the CSV file ``source``, prepared chunk by chunk.
+
+    Parameters
+    ----------
+    source : Path
+        Raw training CSV with the target column.
+    spool_dir : Path
+        Directory for the spool files; ``X_val`` is memory-mapped from it,
+        so it must outlive training.
+    chunk_size : int
+        CSV rows read and prepared at a time.
+    split : StratifiedStreamSplit, optional
+        Train/validation assignment (default: ``SPLIT``).
+    dataset_params : dict, optional
+        Dataset parameters (default ``train.DATASET_PARAMS``).
+
+    Returns
+    -------
+    TrainingData
+        Constructed training and validation Datasets (``val_set``), the
+        validation feature matrix and labels.
+    """
+    split = split or StratifiedStreamSplit()
+    params = dict(dataset_params or DATASET_PARAMS)
+    spools = {
+        name: RowSpool(spool_dir, name, len(FEATURE_COLS)) for name in ("train", "val")
+    }
+
+    pandas_categorical: Optional[List[List]] = None
+    for chunk in pd.read_csv(source, chunksize=chunk_size):
+        X, y = prepare_features(chunk, training=True, target_col=TARGET_COL)
+        if y is None:
+            raise ValueError(f"{source} has no {TARGET_COL!r} column")
+        categories = [list(X[col].cat.categories) for col in CATEGORICAL_COLS]
+        if pandas_categorical is None:
+            pandas_categorical = categories
+        elif categories != pandas_categorical:
+            raise ValueError("Categorical mappings changed while reading the training data")
+
+        matrix, labels = frame_to_matrix(X), y.to_numpy()
+        is_val = split(labels)
+        spools["train"].append(matrix[~is_val], labels[~is_val])
+        spools["val"].append(matrix[is_val], labels[is_val])
+    if pandas_categorical is None:
+        raise ValueError(f"{source} has no rows")
+
+    X_train, y_train = spools["train"].finish()
+    X_val, y_val = spools["val"].finish()
+    logger.info(f"Spooled {len(X_train)} training and {len(X_val)} validation rows")
+
+    train_set = lgb.Dataset(
+        MatrixSequence(X_train),
+        label=y_train,
+        feature_name=FEATURE_COLS,
+        categorical_feature=CATEGORICAL_COLS,
+        params=params,
+    )
+    # Not derived from a Sequence; recorded in the model so pandas input
+    # is encoded the same way at prediction time
+    train_set.pandas_categorical = pandas_categorical
+    train_set.construct()
+    val_set = lgb.Dataset(
+        MatrixSequence(X_val),
+        label=y_val,
+        feature_name=FEATURE_COLS,
+        categorical_feature=CATEGORICAL_COLS,
+        reference=train_set,
+        params=dict(params),
+    ).construct()
+    return TrainingData(train_set, X_val, y_val, val_set=val_set)
+
+
+@app.command()
+def main(
+    source: Path = typer.Argument(
+        PROCESSED_DATA_DIR / "marketing_training.csv", help="Raw training CSV"
+    ),
+    chunk_size: int = typer.Option(CHUNK_SIZE, help="CSV rows read at a time"),
+    spool_dir: Path = typer.Option(INTERIM_DATA_DIR, help="Where the spool files go"),
+):
+    """
+    Train, save and publish a model without loading the CSV into memory.
+    """
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix="out_of_core-", dir=spool_dir) as workdir:
+        start = time.perf_counter()
+        data = load_streaming_training_data(source, Path(workdir), chunk_size=chunk_size)
+        logger.info(f"Training data ready in {time.perf_counter() - start:.2f} s")
+
+        model, metrics = fit_model(data, params=tuned_params())
+        save_model(
+            model,
+            metrics,
+            train_set=data.train_set,
+            metadata={"out_of_core": True, "training_data": str(source)},
+        )
+
+
+if __name__ == "__main__":
+    app()
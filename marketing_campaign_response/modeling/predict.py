@@ -9,14 +9,84 @@ both batch and single-record inference and is designed to be reused
 by APIs, CLIs, and notebooks.
 """
 
-from typing import List, Dict, Union, Optional
+from typing import List, Dict, Sequence, Union, Optional
 from pathlib import Path
+import hashlib
+import io
+import threading
 
+import numpy as np
 import pandas as pd
 import joblib
 
-from marketing_campaign_response.config import MODELS_DIR
-from marketing_campaign_response.features import prepare_features
+from marketing_campaign_response.config import FOREST_DIR, MODELS_DIR
+from marketing_campaign_response.features import (
+    FEATURE_COLS,
+    MAPPINGS_CACHE,
+    CategoricalMappingsCache,
+    RecordMatrixEncoder,
+    prepare_features,
+)
+from marketing_campaign_response.metrics import METRICS
+from marketing_campaign_response.modeling.cache import PredictionCache
+from marketing_campaign_response.modeling.serialization import score_arrays
+from marketing_campaign_response.modeling.tree_engine import (
+    FlatForest,
+    flatten_booster,
+    frame_to_matrix,
+)
+
+
+class InputBufferPool:
+    """
+    Thread-safe pool of reusable float64 input matrices.
+
+    Buffers are bucketed by the next power of two of the requested row
+    count, so a steady stream of small requests keeps reusing the same
+    few arrays instead of allocating a new one per call.
+
+    Parameters
+    ----------
+    n_features : int
+        Number of columns of every buffer.
+    max_rows : int
+        Largest batch that is pooled; bigger requests get a fresh array.
+    max_per_bucket : int
+        Number of idle buffers kept per bucket.
+    """
+
+    def __init__(self, n_features: int, max_rows: int = 4096, max_per_bucket: int = 8):
+        self.n_features = n_features
+        self.max_rows = max_rows
+        self.max_per_bucket = max_per_bucket
+        self._lock = threading.Lock()
+        self._free: Dict[int, List[np.ndarray]] = {}
+
+    def acquire(self, n_rows: int) -> np.ndarray:
+        """
+        Return a buffer with at least ``n_rows`` rows.
+        """
+        if n_rows > self.max_rows:
+            return np.empty((n_rows, self.n_features), dtype=np.float64)
+
+        bucket = 1 << max(n_rows - 1, 0).bit_length()
+        with self._lock:
+            free = self._free.get(bucket)
+            if free:
+                return free.pop()
+        return np.empty((bucket, self.n_features), dtype=np.float64)
+
+    def release(self, buffer: np.ndarray) -> None:
+        """
+        Give a buffer obtained from ``acquire`` back to the pool.
+        """
+        bucket = buffer.shape[0]
+        if bucket > self.max_rows or bucket & (bucket - 1):
+            return
+        with self._lock:
+            free = self._free.setdefault(bucket, [])
+            if len(free) < self.max_per_bucket:
+                free.append(buffer)
 
 
 class Predictor:
@@ -30,24 +100,115 @@ class Predictor:
 
     This class is intentionally lightweight and stateless beyond
     model loading to keep inference fast and deterministic.
+
+    Small batches of records (up to ``FAST_PATH_MAX_ROWS``) skip pandas
+    entirely and go through ``predict_records``.
     """
 
-    def __init__(self):
+    # List inputs up to this size use the DataFrame-free fast path; it beats
+    # the pandas path up to a few thousand records
+    FAST_PATH_MAX_ROWS = 1024
+
+    BACKENDS = ("lightgbm", "numpy", "auto")
+
+    def __init__(
+        self,
+        backend: str = "lightgbm",
+        cache: Optional[PredictionCache] = None,
+        model_path: Optional[Path] = None,
+        forest_dir: Optional[Path] = FOREST_DIR,
+        num_threads: Optional[int] = None,
+        mappings_path: Optional[Path] = None,
+    ):
         """
         Initialize the Predictor by loading the trained model.
 
+        Parameters
+        ----------
+        backend : str
+            ``"lightgbm"`` scores through the booster's C API; ``"numpy"``
+            uses the array-backed tree engine, which gives identical
+            probabilities. ``"auto"`` uses the tree engine only for batches
+            small enough to be walked row by row
+            (``FlatForest.SCALAR_MAX_ROWS``), where it avoids the booster's
+            fixed per-call overhead, and LightGBM for everything else.
+        cache : PredictionCache, optional
+            Cache of scores keyed on encoded rows and the model version.
+            Only rows not found in it are sent to the model.
+        model_path : Path, optional
+            Trained model to load; a joblib pickle (default
+            ``models/lgbm_marketing.pkl``) or a native LightGBM ``.txt``
+            model.
+        forest_dir : Path, optional
+            Exported tree-engine arrays (see ``modeling.export``). When they
+            belong to the loaded model they are memory-mapped instead of
+            flattening the booster, so forked serving workers share them.
+        num_threads : int, optional
+            OpenMP threads LightGBM may use per prediction call; defaults
+            to LightGBM's own setting (all cores). Set it when several
+            processes score at once so they do not oversubscribe the CPUs.
+        mappings_path : Path, optional
+            Categorical mappings the model was trained with (a registry
+            bundle's own copy). Defaults to the process-wide
+            ``MAPPINGS_CACHE`` of ``models/categorical_mappings.pkl``.
+
         Raises
         ------
         FileNotFoundError
             If the trained model file does not exist at the expected path.
+        ValueError
+            If ``backend`` is not supported.
         """
-        self.model_path: Path = MODELS_DIR / "lgbm_marketing.pkl"
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {self.BACKENDS}")
+        self.backend = backend
+
+        self.model_path: Path = Path(model_path or MODELS_DIR / "lgbm_marketing.pkl")
 
         if not self.model_path.exists():
             raise FileNotFoundError(f"Model file not found: {self.model_path}")
 
-        # Load trained LightGBM model
-        self.model = joblib.load(self.model_path)
+        # Load trained LightGBM model; its content hash versions the model
+        payload = self.model_path.read_bytes()
+        self.model_version: str = hashlib.sha256(payload).hexdigest()[:16]
+        if self.model_path.suffix == ".txt":
+            import lightgbm as lgb
+
+            self.model = lgb.Booster(model_str=payload.decode())
+        else:
+            self.model = joblib.load(io.BytesIO(payload))
+        self.cache = cache
+        self.num_threads = num_threads
+
+        self.forest: Optional[FlatForest] = None
+        if backend != "lightgbm":
+            self.forest = self._load_forest(forest_dir)
+
+        # Build the categorical encoder now rather than on the first request
+        self.mappings: CategoricalMappingsCache = (
+            CategoricalMappingsCache(mappings_path) if mappings_path is not None else MAPPINGS_CACHE
+        )
+        self.mappings.get()
+
+        self._buffers = InputBufferPool(len(FEATURE_COLS))
+        self._record_encoder: Optional[RecordMatrixEncoder] = None
+        self._record_encoder_version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _load_forest(self, forest_dir: Optional[Path]) -> FlatForest:
+        # Reuse the exported arrays only if they were built from this model
+        if forest_dir is not None and (Path(forest_dir) / "meta.json").exists():
+            meta = FlatForest.read_metadata(forest_dir)
+            if meta.get("model_version") == self.model_version:
+                return FlatForest.load(forest_dir, mmap_mode="r")
+        return flatten_booster(self.model)
+
+    @property
+    def mappings_version(self) -> str:
+        """
+        Version (content hash) of the categorical mappings in use.
+        """
+        return self.mappings.get().version
 
     def predict(
         self,
@@ -81,25 +242,126 @@ class Predictor:
         - A probability threshold of 0.5 is used to generate class labels.
         - Feature preparation runs in inference mode (training=False).
         """
+        if isinstance(rows, list) and 0 < len(rows) <= self.FAST_PATH_MAX_ROWS:
+            return self.predict_records(rows)
+        return self._format(self.predict_proba(rows))
+
+    def predict_proba(
+        self,
+        rows: Union[List[Dict[str, Optional[str]]], pd.DataFrame],
+    ) -> np.ndarray:
+        """
+        Positive-class probabilities as a float64 array.
+
+        Same input handling as ``predict``, without building Python lists;
+        meant for callers that serialize the scores themselves.
+        """
         # Normalize input format
         if isinstance(rows, list):
-            df = pd.DataFrame(rows)
-        else:
-            df = rows.copy()
+            if 0 < len(rows) <= self.FAST_PATH_MAX_ROWS:
+                return self._predict_records_proba(rows)
+            rows = pd.DataFrame(rows)
 
-        # Apply feature engineering (no fitting during inference)
-        X, _ = prepare_features(df, training=False)
+        # Apply feature engineering (no fitting during inference); it works
+        # on a copy, the caller's frame is left untouched
+        X, _ = prepare_features(rows, training=False, encoder=self.mappings.get().encoder)
 
         # Generate probability scores
-        probs = self.model.predict(X)
+        if self.cache is not None or self._uses_forest(len(X)):
+            X = frame_to_matrix(X, getattr(self.model, "pandas_categorical", None))
+        return self._score_matrix(X)
+
+    def predict_arrays(
+        self,
+        rows: Union[List[Dict[str, Optional[str]]], pd.DataFrame],
+    ) -> Dict[str, np.ndarray]:
+        """
+        Like ``predict``, with ``predictions`` (int8) and ``probabilities``
+        (float64) as NumPy arrays.
+
+        Skips the ``tolist()`` conversion; for callers that encode the
+        result with ``serialization.encode``.
+        """
+        return score_arrays(self.predict_proba(rows))
+
+    def predict_records(self, records: Sequence[Dict]) -> Dict[str, List[float]]:
+        """
+        Predict directly from raw records without building a DataFrame.
+
+        Records are written into a pooled float64 matrix in
+        ``FEATURE_COLS`` order (see ``RecordMatrixEncoder``) that is handed
+        straight to the booster. Results are identical to ``predict`` on
+        the same records.
+
+        Parameters
+        ----------
+        records : sequence of dict
+            Input customer records.
+
+        Returns
+        -------
+        dict
+            Same structure as ``predict``.
+        """
+        return self._format(self._predict_records_proba(records))
+
+    def _predict_records_proba(self, records: Sequence[Dict]) -> np.ndarray:
+        mark = METRICS.stopwatch()
+        encoder = self._get_record_encoder()
+        buffer = self._buffers.acquire(len(records))
+        try:
+            X = encoder.encode(records, out=buffer)
+            mark("features.records")
+            return self._score_matrix(X)
+        finally:
+            self._buffers.release(buffer)
+
+    def _uses_forest(self, n_rows: int) -> bool:
+        if self.backend == "auto":
+            return n_rows <= FlatForest.SCALAR_MAX_ROWS
+        return self.backend == "numpy"
+
+    def _score_matrix(self, X) -> np.ndarray:
+        if self.cache is None:
+            return self._score(X)
+        return self.cache.score(X, self._score, self.model_version)
+
+    def _score(self, X) -> np.ndarray:
+        METRICS.observe_rows("predict", len(X))
+        mark = METRICS.stopwatch()
+        if self._uses_forest(len(X)):
+            probs = self.forest.predict(X)
+        elif self.num_threads is not None:
+            probs = self.model.predict(X, num_threads=self.num_threads)
+        else:
+            probs = self.model.predict(X)
+        mark("predict")
+        return probs
+
+    def _get_record_encoder(self) -> RecordMatrixEncoder:
+        snapshot = self.mappings.get()
+        if self._record_encoder_version != snapshot.version:
+            with self._lock:
+                if self._record_encoder_version != snapshot.version:
+                    self._record_encoder = RecordMatrixEncoder(
+                        snapshot.encoder,
+                        model_categories=getattr(self.model, "pandas_categorical", None),
+                    )
+                    self._record_encoder_version = snapshot.version
+        return self._record_encoder
 
+    @staticmethod
+    def _format(probs: np.ndarray) -> Dict[str, List[float]]:
+        mark = METRICS.stopwatch()
         # Convert probabilities to binary predictions
         preds = (probs >= 0.5).astype(int)
 
-        return {
+        result = {
             "predictions": preds.tolist(),
             "probabilities": probs.tolist(),
         }
+        mark("format")
+        return result
 
 
 # -------------------------------------------------------------------
@@ -0,0 +1,328 @@
+# marketing_campaign_response/modeling/registry.py
+
+"""
+Directory-based registry of versioned model bundles.
+
+A bundle is a trained model together with the categorical mappings it
+was trained with, stored under its own version directory with a
+manifest::
+
+    models/registry/
+        20260116093000-3fa1c2d4/
+            manifest.json
+            model.pkl
+            categorical_mappings.pkl
+        state.json          # {"active": <version>, "history": [...]}
+
+Bundles are immutable once published: they are written to a temporary
+directory and renamed into place, and the version ends with the content
+hash of the model and mappings, so publishing the same files twice
+returns the existing bundle. ``state.json`` is the pointer to the active
+version, replaced atomically; the previously active versions are kept in
+``history`` so ``rollback`` can return to them.
+
+Serving processes (``ModelService``) load the active bundle and watch
+``state.json``, so activating or rolling back a version reaches every
+worker without a restart.
+
+Usage::
+
+    python -m marketing_campaign_response.modeling.registry publish --activate
+    python -m marketing_campaign_response.modeling.registry list
+    python -m marketing_campaign_response.modeling.registry rollback
+"""
+
+from datetime import datetime, timezone
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from loguru import logger
+import typer
+
+from marketing_campaign_response.config import (
+    CATEGORICAL_MAPPINGS_FILE,
+    MODEL_PATH,
+    REGISTRY_DIR,
+)
+from marketing_campaign_response.hashing import file_digest
+
+app = typer.Typer()
+
+MANIFEST_FILE = "manifest.json"
+STATE_FILE = "state.json"
+MODEL_FILE = "model.pkl"
+MAPPINGS_FILE = "categorical_mappings.pkl"
+
+
+class RegistryError(RuntimeError):
+    """
+    Raised for unknown versions and impossible activations or rollbacks.
+    """
+
+
+class Bundle(NamedTuple):
+    """
+    Paths and manifest of one published version.
+    """
+
+    version: str
+    model_path: Path
+    mappings_path: Path
+    manifest: Dict[str, Any]
+
+
+def _write_json_atomic(path: Path, payload: Dict[str, Any]) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class ModelRegistry:
+    """
+    Versioned model bundles under ``root``.
+
+    Parameters
+    ----------
+    root : Path
+        Registry directory; created on the first publish.
+    """
+
+    def __init__(self, root: Path = REGISTRY_DIR):
+        self.root = Path(root)
+
+    # ---------------------------------------------------------------
+    # Reading
+    # ---------------------------------------------------------------
+    def versions(self) -> List[str]:
+        """
+        Published versions, oldest first.
+        """
+        if not self.root.is_dir():
+            return []
+        return sorted(
+            p.name for p in self.root.iterdir() if (p / MANIFEST_FILE).is_file()
+        )
+
+    def bundle(self, version: str) -> Bundle:
+        """
+        Paths and manifest of ``version``.
+
+        Raises
+        ------
+        RegistryError
+            If the version was never published.
+        """
+        directory = self.root / version
+        manifest_path = directory / MANIFEST_FILE
+        if not manifest_path.is_file():
+            raise RegistryError(f"Unknown model version: {version}")
+        manifest = json.loads(manifest_path.read_text())
+        return Bundle(
+            version,
+            directory / manifest["model"]["file"],
+            directory / manifest["mappings"]["file"],
+            manifest,
+        )
+
+    def state(self) -> Dict[str, Any]:
+        """
+        Active version and activation history (``{}`` before any activation).
+        """
+        path = self.root / STATE_FILE
+        if not path.is_file():
+            return {}
+        return json.loads(path.read_text())
+
+    def active_version(self) -> Optional[str]:
+        return self.state().get("active")
+
+    def active_bundle(self) -> Optional[Bundle]:
+        """
+        The active bundle, or None when nothing has been activated.
+        """
+        version = self.active_version()
+        return self.bundle(version) if version is not None else None
+
+    # ---------------------------------------------------------------
+    # Writing
+    # ---------------------------------------------------------------
+    def publish(
+        self,
+        model_path: Path = MODEL_PATH,
+        mappings_path: Path = CATEGORICAL_MAPPINGS_FILE,
+        *,
+        metadata: Optional[Dict[str, Any]] = None,
+        activate: bool = False,
+    ) -> Bundle:
+        """
+        Copy a model and its mappings into a new immutable bundle.
+
+        Parameters
+        ----------
+        model_path, mappings_path : Path
+            Trained model (joblib pickle or native ``.txt``) and the
+            categorical mappings it was trained with.
+        metadata : dict, optional
+            Free-form information stored in the manifest (metrics,
+            training data, ...).
+        activate : bool
+            Make the bundle the active version.
+
+        Returns
+        -------
+        Bundle
+            The new bundle, or the existing one if the same model and
+            mappings were already published.
+        """
+        model_path, mappings_path = Path(model_path), Path(mappings_path)
+        model_sha, mappings_sha = file_digest(model_path), file_digest(mappings_path)
+        bundle_hash = hashlib.sha256(f"{model_sha}:{mappings_sha}".encode()).hexdigest()[:8]
+
+        for version in self.versions():
+            if version.endswith(f"-{bundle_hash}"):
+                bundle = self.bundle(version)
+                logger.info(f"Model bundle already published as {version}")
+                break
+        else:
+            bundle = self._write_bundle(
+                model_path, mappings_path, model_sha, mappings_sha, bundle_hash, metadata
+            )
+
+        if activate:
+            self.activate(bundle.version)
+        return bundle
+
+    def _write_bundle(
+        self,
+        model_path: Path,
+        mappings_path: Path,
+        model_sha: str,
+        mappings_sha: str,
+        bundle_hash: str,
+        metadata: Optional[Dict[str, Any]],
+    ) -> Bundle:
+        created_at = datetime.now(timezone.utc)
+        version = f"{created_at:%Y%m%d%H%M%S}-{bundle_hash}"
+        model_file = MODEL_FILE if model_path.suffix != ".txt" else "model.txt"
+        manifest = {
+            "version": version,
+            "created_at": created_at.isoformat(),
+            # Same content hash as Predictor.model_version
+            "model_version": model_sha[:16],
+            "model": {"file": model_file, "sha256": model_sha, "source": str(model_path)},
+            "mappings": {"file": MAPPINGS_FILE, "sha256": mappings_sha, "source": str(mappings_path)},
+            "metadata": metadata or {},
+        }
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=self.root, prefix=".staging-"))
+        try:
+            shutil.copyfile(model_path, staging / model_file)
+            shutil.copyfile(mappings_path, staging / MAPPINGS_FILE)
+            (staging / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+            # A bundle appears complete or not at all
+            os.rename(staging, self.root / version)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        logger.info(f"Published model bundle {version}")
+        return self.bundle(version)
+
+    def activate(self, version: str) -> None:
+        """
+        Make ``version`` the active bundle; the current one goes to history.
+
+        Raises
+        ------
+        RegistryError
+            If the version was never published.
+        """
+        self.bundle(version)
+        state = self.state()
+        active = state.get("active")
+        if active == version:
+            return
+        history = list(state.get("history", []))
+        if active is not None:
+            history.append(active)
+        _write_json_atomic(self.root / STATE_FILE, {"active": version, "history": history})
+        logger.info(f"Activated model {version} (was {active})")
+
+    def rollback(self) -> str:
+        """
+        Re-activate the previously active version and return it.
+
+        Raises
+        ------
+        RegistryError
+            If there is no earlier version to return to.
+        """
+        state = self.state()
+        history = list(state.get("history", []))
+        if not history:
+            raise RegistryError("No previous model version to roll back to")
+        version = history.pop()
+        _write_json_atomic(self.root / STATE_FILE, {"active": version, "history": history})
+        logger.info(f"Rolled back model {state.get('active')} -> {version}")
+        return version
+
+
+# -------------------------------------------------------------------
+# CLI
+# -------------------------------------------------------------------
+@app.command()
+def publish(
+    model_path: Path = typer.Option(MODEL_PATH, help="Trained model to publish"),
+    mappings_path: Path = typer.Option(CATEGORICAL_MAPPINGS_FILE, help="Its categorical mappings"),
+    activate: bool = typer.Option(False, help="Make it the active version"),
+    registry_dir: Path = typer.Option(REGISTRY_DIR),
+):
+    """
+    Publish a model and its mappings as a new version.
+    """
+    bundle = ModelRegistry(registry_dir).publish(model_path, mappings_path, activate=activate)
+    typer.echo(bundle.version)
+
+
+@app.command("list")
+def list_versions(registry_dir: Path = typer.Option(REGISTRY_DIR)):
+    """
+    List published versions; the active one is marked with an asterisk.
+    """
+    registry = ModelRegistry(registry_dir)
+    active = registry.active_version()
+    for version in registry.versions():
+        typer.echo(f"{'*' if version == active else ' '} {version}")
+
+
+@app.command("activate")
+def activate_version(version: str, registry_dir: Path = typer.Option(REGISTRY_DIR)):
+    """
+    Activate a published version.
+    """
+    ModelRegistry(registry_dir).activate(version)
+
+
+@app.command()
+def rollback(registry_dir: Path = typer.Option(REGISTRY_DIR)):
+    """
+    Re-activate the previously active version.
+    """
+    typer.echo(ModelRegistry(registry_dir).rollback())
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,71 @@
+# marketing_campaign_response/modeling/responses.py
+
+"""
+Response classes of the scoring endpoints.
+
+Prediction endpoints return their result wrapped in ``ScoreResponse``
+instead of a bare dict, so FastAPI's ``jsonable_encoder`` pass over every
+list element is skipped. The result may hold NumPy arrays
+(``Predictor.predict_arrays``), which are encoded without building
+Python lists (see ``serialization``), in the format the client accepts:
+JSON, raw float32 or Arrow. The rendering time is recorded as the
+``serialize`` stage (see ``marketing_campaign_response.metrics``).
+"""
+
+from typing import Any, Mapping, Optional
+
+from fastapi.responses import Response
+
+from marketing_campaign_response.metrics import METRICS
+from marketing_campaign_response.modeling.serialization import (
+    FLOAT_PRECISION,
+    JSON_MEDIA_TYPE,
+    encode,
+    negotiate,
+)
+
+
+class ScoreResponse(Response):
+    """
+    Prediction result rendered in the format negotiated from ``accept``.
+
+    Parameters
+    ----------
+    content : mapping
+        ``predictions`` and ``probabilities`` (lists or NumPy arrays),
+        optionally ``model_version``.
+    accept : str, optional
+        The request's ``Accept`` header; JSON when missing.
+    precision : int, optional
+        Decimals of JSON floats (default ``MCR_FLOAT_PRECISION``, else full).
+
+    Every format carries the model version in ``X-Model-Version`` and the
+    row count in ``X-Rows``; the binary ones hold nothing else.
+    """
+
+    media_type = JSON_MEDIA_TYPE
+
+    def __init__(
+        self,
+        content: Mapping[str, Any],
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        *,
+        accept: Optional[str] = None,
+        precision: Optional[int] = FLOAT_PRECISION,
+    ):
+        self.precision = precision
+        headers = {
+            **(headers or {}),
+            "Vary": "Accept",
+            "X-Rows": str(len(content["probabilities"])),
+        }
+        if "model_version" in content:
+            headers["X-Model-Version"] = str(content["model_version"])
+        super().__init__(content, status_code, headers, negotiate(accept))
+
+    def render(self, content: Mapping[str, Any]) -> bytes:
+        mark = METRICS.stopwatch()
+        body = encode(content, self.media_type, self.precision)
+        mark("serialize")
+        return body
@@ -0,0 +1,372 @@
+# marketing_campaign_response/modeling/service.py
+
+"""
+Background model loading, readiness and hot-swapping for the API processes.
+
+Creating a ``Predictor`` imports LightGBM (and, through it, scikit-learn)
+and unpickles the model, which used to happen while the app module was
+imported: the server could not even answer a liveness probe until it was
+done, and a broken model file made the import itself fail.
+``ModelService`` moves that work to a background thread started with the
+app. The service is *ready* only once the model is loaded and a warm-up
+prediction has run through both scoring paths, priming the booster and
+the categorical encoders; until then (or if loading failed) endpoints
+that need the model answer ``503`` with ``Retry-After``.
+
+Models come from the active bundle of the model registry
+(``modeling.registry``) when there is one, otherwise from
+``models/lgbm_marketing.pkl``. A new version is loaded and warmed up
+next to the current one and then swapped in with a single reference
+assignment: requests read ``service.current`` once and finish on the
+model they started with, so a reload never fails or mixes versions.
+The loader thread also watches the registry, so a version activated or
+rolled back from any process reaches every worker.
+"""
+
+from pathlib import Path
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+from loguru import logger
+
+# Record used to warm up the model; the other features take their defaults
+WARMUP_RECORD: Dict[str, Any] = {"custAge": 40}
+
+
+class ModelNotReady(RuntimeError):
+    """
+    Raised when the model is requested before it finished loading.
+
+    Attributes
+    ----------
+    retry_after : int
+        Suggested number of seconds before the client retries.
+    """
+
+    def __init__(self, status: str, retry_after: int = 1):
+        super().__init__(f"Model not ready ({status})")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class LoadedModel(NamedTuple):
+    """
+    One loaded model version; replaced as a whole on reload.
+    """
+
+    predictor: Any
+    batcher: Any  # None without micro-batching
+    version: str
+
+
+class ModelService:
+    """
+    Owns the process' ``Predictor`` and tracks its readiness.
+
+    Parameters
+    ----------
+    micro_batching : bool
+        Also create a ``MicroBatcher`` in front of the predictor.
+    batcher_kwargs : dict, optional
+        Arguments of the ``MicroBatcher``.
+    registry_dir : Path, optional
+        Model registry to serve the active bundle from. Ignored when
+        ``model_path`` pins the model.
+    watch_interval : float, optional
+        Seconds between two checks of the registry's active version;
+        ``None`` disables watching.
+    retire_after : float
+        Seconds a replaced micro-batcher keeps running for requests that
+        picked it up just before the swap.
+    **predictor_kwargs
+        Arguments of the ``Predictor``.
+    """
+
+    STARTING, LOADING, WARMING, READY, FAILED = "starting", "loading", "warming", "ready", "failed"
+
+    def __init__(
+        self,
+        micro_batching: bool = False,
+        batcher_kwargs: Optional[Dict[str, Any]] = None,
+        registry_dir: Optional[Path] = None,
+        watch_interval: Optional[float] = 5.0,
+        retire_after: float = 5.0,
+        **predictor_kwargs,
+    ):
+        self.micro_batching = micro_batching
+        self.batcher_kwargs = batcher_kwargs or {}
+        self.predictor_kwargs = predictor_kwargs
+        self.registry_dir = None if "model_path" in predictor_kwargs else registry_dir
+        self.watch_interval = watch_interval
+        self.retire_after = retire_after
+
+        self.status = self.STARTING
+        self.error: Optional[str] = None
+        self.timings: Dict[str, float] = {}
+        self.reloads = 0
+        self._current: Optional[LoadedModel] = None
+        self._registry = None
+        self._ready = threading.Event()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._created_at = time.perf_counter()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    @property
+    def current(self) -> LoadedModel:
+        """
+        The model version serving requests right now.
+
+        Read it once per request and use its predictor, batcher and
+        version together.
+
+        Raises
+        ------
+        ModelNotReady
+            If the model is still loading or failed to load.
+        """
+        if not self._ready.is_set():
+            raise ModelNotReady(self.status)
+        return self._current
+
+    @property
+    def predictor(self):
+        """
+        The current ``Predictor`` (see ``current``).
+        """
+        return self.current.predictor
+
+    @property
+    def batcher(self):
+        """
+        The current ``MicroBatcher`` (``micro_batching=True`` only).
+        """
+        return self.current.batcher
+
+    @property
+    def registry(self):
+        """
+        The ``ModelRegistry`` in use, or None when serving a fixed model.
+        """
+        if self._registry is None and self.registry_dir is not None:
+            from marketing_campaign_response.modeling.registry import ModelRegistry
+
+            self._registry = ModelRegistry(self.registry_dir)
+        return self._registry
+
+    def predict(self, rows) -> Dict[str, Any]:
+        """
+        ``Predictor.predict`` on the current model, tagged with its version.
+        """
+        model = self.current
+        result = model.predictor.predict(rows)
+        result["model_version"] = model.version
+        return result
+
+    def predict_arrays(self, rows) -> Dict[str, Any]:
+        """
+        ``Predictor.predict_arrays`` on the current model, tagged with its version.
+        """
+        model = self.current
+        result = model.predictor.predict_arrays(rows)
+        result["model_version"] = model.version
+        return result
+
+    async def predict_async(self, records) -> Dict[str, Any]:
+        """
+        Like ``predict``, through the current micro-batcher.
+        """
+        model = self.current
+        result = await model.batcher.predict_async(records)
+        return {**result, "model_version": model.version}
+
+    def start(self) -> None:
+        """
+        Load (if needed) and warm up the model on a background thread.
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="model-loader", daemon=True
+                )
+                self._thread.start()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the service is ready; False on timeout.
+        """
+        return self._ready.wait(timeout)
+
+    def load(self) -> None:
+        """
+        Import the modelling stack and create the predictor, synchronously.
+
+        A preforking server calls this in the parent so forked workers
+        share the loaded model; ``start`` then only warms up.
+        """
+        with self._lock:
+            if self._current is not None:
+                return
+            self.status = self.LOADING
+            start = time.perf_counter()
+            self._current = self._build()
+            self.timings["load_seconds"] = time.perf_counter() - start
+
+    def warm_up(self, model: Optional[LoadedModel] = None) -> None:
+        """
+        Score a record through the record and the DataFrame paths.
+
+        Warms up the current model, or ``model`` before it is swapped in.
+        """
+        import pandas as pd
+
+        predictor = (model or self._current).predictor
+        if model is None:
+            self.status = self.WARMING
+        start = time.perf_counter()
+        predictor.predict([WARMUP_RECORD])
+        predictor.predict(pd.DataFrame([WARMUP_RECORD, WARMUP_RECORD]))
+        if model is None:
+            self.timings["warmup_seconds"] = time.perf_counter() - start
+
+    def reload(self, version: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Load, warm up and swap in a model version, synchronously.
+
+        Parameters
+        ----------
+        version : str, optional
+            Registry version to serve; defaults to the registry's active
+            version (or the model file again without a registry).
+
+        Returns
+        -------
+        dict
+            ``previous`` and new ``version``, and whether a swap happened.
+
+        Raises
+        ------
+        RegistryError
+            If ``version`` is not in the registry. The current model keeps
+            serving whenever a reload fails.
+        """
+        with self._reload_lock:
+            previous = self._current
+            if (
+                previous is not None
+                and self.registry is not None
+                and (version or self.registry.active_version()) == previous.version
+            ):
+                return {"previous": previous.version, "version": previous.version, "reloaded": False}
+
+            start = time.perf_counter()
+            model = self._build(version)
+            self.warm_up(model)
+            # In-flight requests keep the LoadedModel they already hold
+            self._current = model
+            self.reloads += 1
+            self.timings["reload_seconds"] = time.perf_counter() - start
+            if not self._ready.is_set():
+                self.status = self.READY
+                self.error = None
+                self._ready.set()
+
+        if previous is not None and previous.batcher is not None:
+            retire = threading.Timer(self.retire_after, previous.batcher.stop)
+            retire.daemon = True
+            retire.start()
+        old = previous.version if previous is not None else None
+        logger.info(f"Swapped model {old} -> {model.version} in {self.timings['reload_seconds']:.2f} s")
+        return {"previous": old, "version": model.version, "reloaded": True}
+
+    def activate(self, version: str) -> Dict[str, Any]:
+        """
+        Activate ``version`` in the registry and swap it in.
+        """
+        self._require_registry().activate(version)
+        return self.reload(version)
+
+    def rollback(self) -> Dict[str, Any]:
+        """
+        Re-activate the previously active registry version and swap it in.
+        """
+        return self.reload(self._require_registry().rollback())
+
+    def stop(self) -> None:
+        self._stopping.set()
+        current = self._current
+        if current is not None and current.batcher is not None:
+            current.batcher.stop()
+
+    def health(self) -> Dict[str, Any]:
+        """
+        Readiness status, model version and load timings.
+        """
+        info: Dict[str, Any] = {"status": self.status, **self.timings}
+        if self.error is not None:
+            info["error"] = self.error
+        if self._ready.is_set():
+            info["model_version"] = self._current.version
+            info["reloads"] = self.reloads
+        return info
+
+    def _require_registry(self):
+        from marketing_campaign_response.modeling.registry import RegistryError
+
+        if self.registry is None:
+            raise RegistryError("No model registry configured")
+        return self.registry
+
+    def _build(self, version: Optional[str] = None) -> LoadedModel:
+        from marketing_campaign_response.modeling.predict import Predictor
+
+        kwargs = dict(self.predictor_kwargs)
+        bundle = None
+        if self.registry is not None:
+            bundle = self.registry.bundle(version) if version else self.registry.active_bundle()
+        if bundle is not None:
+            kwargs.update(
+                model_path=bundle.model_path, mappings_path=bundle.mappings_path, forest_dir=None
+            )
+
+        predictor = Predictor(**kwargs)
+        batcher = None
+        if self.micro_batching:
+            from marketing_campaign_response.modeling.batching import MicroBatcher
+
+            batcher = MicroBatcher(predictor, **self.batcher_kwargs)
+        version = bundle.version if bundle is not None else predictor.model_version
+        return LoadedModel(predictor, batcher, version)
+
+    def _run(self) -> None:
+        try:
+            self.load()
+            self.warm_up()
+        except Exception as exc:
+            self.status = self.FAILED
+            self.error = f"{type(exc).__name__}: {exc}"
+            logger.exception("Model failed to load; the service stays unready")
+            return
+        self.timings["ready_seconds"] = time.perf_counter() - self._created_at
+        self.status = self.READY
+        self._ready.set()
+        logger.info(f"Model ready: {self.timings}")
+
+        if self.registry is not None and self.watch_interval:
+            self._watch()
+
+    def _watch(self) -> None:
+        # Follow activations and rollbacks made by other processes
+        while not self._stopping.wait(self.watch_interval):
+            try:
+                active = self.registry.active_version()
+                if active is not None and active != self._current.version:
+                    self.reload(active)
+            except Exception:
+                logger.exception("Model reload failed; the current version keeps serving")
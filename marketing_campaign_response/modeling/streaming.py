@@ -0,0 +1,318 @@
+# marketing_campaign_response/modeling/streaming.py
+
+"""
+Incremental scoring of NDJSON or CSV request bodies.
+
+Uploads used to be parsed as one JSON array into a full list of records
+and a full DataFrame before the first row was scored. Here the body is
+consumed as a stream of byte chunks: complete lines are cut off as they
+arrive, every ``chunk_size`` rows are parsed and scored as one batch, and
+the predictions are emitted as NDJSON straight away. At most two chunks
+(the one being scored and the one being read) are held at any time, so
+memory does not grow with the size of the upload.
+
+Every output line is either a prediction::
+
+    {"row": 0, "prediction": 0, "probability": 0.0731}
+
+or, when a chunk cannot be parsed, validated or scored, an error covering
+its rows (``end_row`` exclusive); the stream then carries on with the next
+chunk::
+
+    {"error": "...", "start_row": 1000, "end_row": 2000}
+
+Validation errors also carry the schema error list (``errors``), with row
+numbers relative to the whole stream.
+
+The response status is sent before the first chunk is scored, so a
+chunk the runner cannot take is not raised either: while the inference
+executor is saturated the chunk is resubmitted (which also holds back
+reading the body), and after ``saturated_timeout`` seconds, or on any
+other failure of the runner, its rows get an error line.
+"""
+
+import asyncio
+import io
+import json
+import time
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, List, Optional
+
+from fastapi.responses import StreamingResponse
+import pandas as pd
+
+from marketing_campaign_response.metrics import METRICS
+from marketing_campaign_response.modeling.executor import ExecutorSaturated
+from marketing_campaign_response.modeling.predict import Predictor
+from marketing_campaign_response.schema import (
+    SchemaValidationError,
+    validate_frame,
+    validate_records,
+)
+
+FORMATS = ("ndjson", "csv")
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Delay between resubmissions of a chunk to a saturated executor
+SATURATED_RETRY_SECONDS = 0.05
+
+
+def detect_format(content_type: Optional[str]) -> str:
+    """
+    Map a request ``Content-Type`` to ``"csv"`` or ``"ndjson"`` (default).
+    """
+    if content_type and "csv" in content_type.lower():
+        return "csv"
+    return "ndjson"
+
+
+class LineSplitter:
+    """
+    Cut a stream of byte chunks into complete lines.
+
+    Parameters
+    ----------
+    quoted : bool
+        Treat ``"`` as CSV quoting: a newline inside a quoted field does
+        not end the line.
+    max_line_bytes : int
+        Longest accepted line; protects memory against bodies without
+        newlines.
+    """
+
+    def __init__(self, quoted: bool = False, max_line_bytes: int = 1 << 20):
+        self.quoted = quoted
+        self.max_line_bytes = max_line_bytes
+        self._buffer = b""
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """
+        Add ``data`` and return the lines it completed.
+
+        Raises
+        ------
+        ValueError
+            If the pending, incomplete line exceeds ``max_line_bytes``.
+        """
+        buffer = self._buffer + data
+        if b"\n" not in data:
+            self._buffer = buffer
+            self._check_length()
+            return []
+
+        lines = buffer.split(b"\n")
+        self._buffer = lines.pop()
+        if self.quoted and b'"' in buffer:
+            lines = self._join_quoted(lines)
+        self._check_length()
+        return [line.rstrip(b"\r") for line in lines]
+
+    def close(self) -> List[bytes]:
+        """
+        Return the last line if the body did not end with a newline.
+        """
+        rest, self._buffer = self._buffer.rstrip(b"\r"), b""
+        return [rest] if rest else []
+
+    def _join_quoted(self, lines: List[bytes]) -> List[bytes]:
+        complete, pending, quotes = [], [], 0
+        for line in lines:
+            pending.append(line)
+            quotes += line.count(b'"')
+            if quotes % 2 == 0:
+                complete.append(b"\n".join(pending))
+                pending, quotes = [], 0
+        if pending:
+            # Still inside a quoted field; wait for more data
+            self._buffer = b"\n".join(pending + [self._buffer])
+        return complete
+
+    def _check_length(self) -> None:
+        if len(self._buffer) > self.max_line_bytes:
+            raise ValueError(f"Line longer than {self.max_line_bytes} bytes")
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    ``StreamingResponse`` that may start answering before the request body
+    has been fully read.
+
+    Starlette's ``StreamingResponse`` (for ASGI servers older than spec
+    2.4, uvicorn included) reads ``receive`` concurrently to detect client
+    disconnects, which would steal body chunks from a body iterator that
+    is still consuming the request. Here the body iterator owns
+    ``receive``; a disconnect surfaces there as ``ClientDisconnect``.
+    """
+
+    media_type = NDJSON_MEDIA_TYPE
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def parse_chunk(lines: List[bytes], fmt: str, header: Optional[bytes] = None):
+    """
+    Parse one chunk of data lines into something ``Predictor.predict`` takes.
+
+    NDJSON lines become a list of dicts; CSV lines are parsed together with
+    the ``header`` line by ``pd.read_csv`` (as the training data is). Both
+    are validated against the customer schema.
+    """
+    mark = METRICS.stopwatch()
+    if fmt == "csv":
+        frame = pd.read_csv(io.BytesIO(b"\n".join([header, *lines])))
+        mark("parse")
+        return validate_frame(frame)
+    records = [json.loads(line) for line in lines]
+    mark("parse")
+    return validate_records(records)
+
+
+def format_predictions(result: dict, start_row: int) -> bytes:
+    """
+    Render a ``Predictor.predict`` result as one NDJSON line per row.
+    """
+    mark = METRICS.stopwatch()
+    body = "".join(
+        f'{{"row":{start_row + i},"prediction":{int(label)},"probability":{float(prob)!r}}}\n'
+        for i, (label, prob) in enumerate(zip(result["predictions"], result["probabilities"]))
+    ).encode()
+    mark("serialize")
+    return body
+
+
+def format_error(error: Exception, start_row: int, end_row: int) -> bytes:
+    line = {"error": str(error), "start_row": start_row, "end_row": end_row}
+    if isinstance(error, SchemaValidationError):
+        line["errors"] = [
+            {**e, "row": None if e["row"] is None else start_row + e["row"]}
+            for e in error.errors
+        ]
+    return (json.dumps(line) + "\n").encode()
+
+
+def score_chunk(
+    predictor: Predictor,
+    lines: List[bytes],
+    fmt: str,
+    start_row: int,
+    header: Optional[bytes] = None,
+) -> bytes:
+    """
+    Parse and score one chunk; errors are reported in-band, not raised.
+    """
+    try:
+        result = predictor.predict(parse_chunk(lines, fmt, header))
+    except Exception as exc:
+        return format_error(exc, start_row, start_row + len(lines))
+    return format_predictions(result, start_row)
+
+
+async def _to_thread(fn: Callable, *args):
+    return await asyncio.to_thread(fn, *args)
+
+
+async def stream_predictions(
+    body: AsyncIterable[bytes],
+    predictor: Predictor,
+    fmt: str = "ndjson",
+    chunk_size: int = 1000,
+    run: Callable[..., Awaitable] = _to_thread,
+    saturated_timeout: float = 30.0,
+) -> AsyncIterator[bytes]:
+    """
+    Score an NDJSON or CSV byte stream chunk by chunk.
+
+    Parameters
+    ----------
+    body : async iterable of bytes
+        Request body chunks, e.g. ``Request.stream()``.
+    predictor : Predictor
+        Model wrapper used for every chunk.
+    fmt : str
+        ``"ndjson"`` (one JSON object per line) or ``"csv"`` (header line
+        first).
+    chunk_size : int
+        Number of rows scored per ``Predictor.predict`` call.
+    run : callable
+        Awaitable runner for the CPU-bound scoring, e.g.
+        ``InferenceExecutor.run``; defaults to ``asyncio.to_thread``.
+    saturated_timeout : float
+        How long a chunk is resubmitted while ``run`` raises
+        ``ExecutorSaturated`` before its rows are reported as an error.
+
+    Yields
+    ------
+    bytes
+        NDJSON prediction (or error) lines, in input row order. Scoring of
+        one chunk overlaps with reading the next.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}', expected one of {FORMATS}")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    splitter = LineSplitter(quoted=fmt == "csv")
+    header: Optional[bytes] = None
+    lines: List[bytes] = []
+    next_row = 0
+    pending: Optional[asyncio.Future] = None
+
+    async def score(chunk: List[bytes], start_row: int) -> bytes:
+        # Failures of ``run`` itself become error lines, as in score_chunk
+        deadline = time.monotonic() + saturated_timeout
+        while True:
+            try:
+                return await run(score_chunk, predictor, chunk, fmt, start_row, header)
+            except ExecutorSaturated as exc:
+                if time.monotonic() >= deadline:
+                    return format_error(exc, start_row, start_row + len(chunk))
+                await asyncio.sleep(SATURATED_RETRY_SECONDS)
+            except Exception as exc:
+                return format_error(exc, start_row, start_row + len(chunk))
+
+    async def submit(chunk: List[bytes]) -> Optional[bytes]:
+        # Start scoring ``chunk`` and return the output of the previous one
+        nonlocal next_row, pending
+        task = asyncio.ensure_future(score(chunk, next_row))
+        next_row += len(chunk)
+        previous, pending = pending, task
+        return await previous if previous is not None else None
+
+    try:
+        async for data in _with_tail(body, splitter):
+            new_lines = [line for line in data if line.strip()]
+            if fmt == "csv" and header is None and new_lines:
+                header = new_lines.pop(0)
+            lines.extend(new_lines)
+            while len(lines) >= chunk_size:
+                chunk, lines = lines[:chunk_size], lines[chunk_size:]
+                output = await submit(chunk)
+                if output:
+                    yield output
+        if lines:
+            output = await submit(lines)
+            lines = []
+            if output:
+                yield output
+        if pending is not None:
+            output, pending = await pending, None
+            yield output
+    except ValueError as exc:
+        # Malformed stream (e.g. an endless line): report and stop
+        if pending is not None:
+            output, pending = await pending, None
+            yield output
+        yield format_error(exc, next_row, next_row + len(lines))
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def _with_tail(body: AsyncIterable[bytes], splitter: LineSplitter):
+    # Complete lines of every body chunk, then the unterminated last line
+    async for data in body:
+        yield splitter.feed(data)
+    yield splitter.close()
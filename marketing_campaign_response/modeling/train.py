@@ -8,10 +8,17 @@ customer will respond to a marketing campaign. It includes feature
 preparation, class imbalance handling, model evaluation, and persistence.
 
 The resulting model artifact is saved to disk and later used for inference.
+Prepared features and the binned LightGBM training set are cached between
+runs (``modeling.feature_cache``), so retraining on an unchanged CSV skips
+parsing, feature engineering and histogram construction. Training sets
+that do not fit in memory go through ``modeling.out_of_core`` instead.
 """
 
+import json
 import logging
 from pathlib import Path
+import time
+from typing import Any, Dict, Optional, Tuple
 
 import joblib
 import lightgbm as lgb
@@ -19,8 +26,19 @@ import pandas as pd
 from sklearn.metrics import accuracy_score, roc_auc_score
 from sklearn.model_selection import train_test_split
 
-from marketing_campaign_response.config import PROCESSED_DATA_DIR, MODELS_DIR
+from marketing_campaign_response.config import (
+    BEST_PARAMS_PATH,
+    MODELS_DIR,
+    PROCESSED_DATA_DIR,
+)
 from marketing_campaign_response.features import prepare_features, TARGET_COL
+from marketing_campaign_response.modeling.export import export_model, export_paths, model_version
+from marketing_campaign_response.modeling.feature_cache import (
+    FeatureCache,
+    TrainingData,
+    feature_version,
+)
+from marketing_campaign_response.modeling.registry import Bundle, ModelRegistry
 
 # -------------------------------------------------------------------
 # Logging configuration
@@ -32,55 +50,129 @@ logger = logging.getLogger(__name__)
 MODEL_PATH = MODELS_DIR / "lgbm_marketing.pkl"
 
 
-def main():
-    """
-    Train and persist a LightGBM marketing response model.
+# LightGBM parameters; scale_pos_weight is added from the training split
+PARAMS = {
+    "objective": "binary",
+    "metric": ["binary_logloss", "auc"],
+    "boosting_type": "gbdt",
+    "learning_rate": 0.05,
+    "num_leaves": 31,
+    "max_depth": -1,
+    "verbose": -1,
+    "seed": 42,
+}
 
-    Workflow:
-    1. Load preprocessed training data
-    2. Apply feature engineering and target extraction
-    3. Split data into training and validation sets
-    4. Address class imbalance using scale_pos_weight
-    5. Train LightGBM with early stopping
-    6. Evaluate model performance
-    7. Save trained model to disk
 
-    This function is intended to be executed as a script and does not
-    return a value.
-    """
+# Dataset construction (binning) parameters; part of the feature cache key.
+# No feature pre-filtering, so min_child_samples can vary per training run
+# (modeling/tune.py) on the same binned Dataset
+DATASET_PARAMS = {"verbose": -1, "seed": PARAMS["seed"], "feature_pre_filter": False}
 
-    # ---------------------------------------------------------------
-    # Load training data
-    # ---------------------------------------------------------------
-    train_csv = PROCESSED_DATA_DIR / "marketing_training.csv"
-    logger.info(f"Loading training data from {train_csv}")
+# Train / validation split
+SPLIT = {"test_size": 0.2, "random_state": 42}
 
-    df = pd.read_csv(train_csv)
 
-    # ---------------------------------------------------------------
-    # Feature engineering
-    # ---------------------------------------------------------------
+def prepare_training_data(df: pd.DataFrame) -> TrainingData:
+    """
+    Feature engineering and stratified train/validation split of a raw
+    training frame (steps 2-3 of ``main``).
+    """
     X, y = prepare_features(
         df,
         training=True,
         target_col=TARGET_COL
     )
 
-    # ---------------------------------------------------------------
-    # Train / validation split
-    # ---------------------------------------------------------------
     X_train, X_val, y_train, y_val = train_test_split(
         X,
         y,
-        test_size=0.2,
-        random_state=42,
-        stratify=y
+        stratify=y,
+        **SPLIT,
+    )
+
+    lgb_train = lgb.Dataset(
+        X_train,
+        label=y_train,
+        categorical_feature="auto",
+        params=dict(DATASET_PARAMS),
     )
+    return TrainingData(lgb_train, X_val, y_val, X_train, y_train)
+
+
+def load_training_data(
+    source: Path, cache: Optional[FeatureCache] = None
+) -> Tuple[TrainingData, bool]:
+    """
+    Prepared training data of the CSV file ``source``, through ``cache``.
+
+    Returns
+    -------
+    tuple
+        The training data and whether it came from the cache.
+    """
+    if cache is None:
+        return prepare_training_data(pd.read_csv(source)), False
+
+    key = cache.key(source, feature_version(DATASET_PARAMS, SPLIT))
+    data = cache.load(key, DATASET_PARAMS)
+    if data is not None:
+        return data, True
+    data = prepare_training_data(pd.read_csv(source))
+    cache.save(key, data, source)
+    return data, False
+
+
+def tuned_params(path: Path = BEST_PARAMS_PATH) -> Dict[str, Any]:
+    """
+    ``PARAMS`` with the best parameters of the last search (``tune.py``)
+    merged over them, or ``PARAMS`` alone when there is none.
+    """
+    if not path.exists():
+        return dict(PARAMS)
+    best = json.loads(path.read_text())["params"]
+    logger.info(f"Using tuned parameters from {path}: {best}")
+    return {**PARAMS, **best}
+
+
+def fit_model(
+    data: TrainingData,
+    *,
+    params: Optional[Dict[str, Any]] = None,
+    num_boost_round: int = 1000,
+    early_stopping_rounds: Optional[int] = 50,
+    log_period: int = 50,
+) -> Tuple[lgb.Booster, Dict[str, float]]:
+    """
+    Train and validate a LightGBM model on prepared training data (steps
+    4-6 of ``main``: class imbalance weighting, training and validation).
+
+    Parameters
+    ----------
+    data : TrainingData
+        Training set and validation features (``prepare_training_data``,
+        the feature cache or ``out_of_core.load_streaming_training_data``).
+    params : dict, optional
+        LightGBM parameters (default ``PARAMS``); ``scale_pos_weight`` is
+        added from the training labels.
+    num_boost_round : int
+        Maximum number of boosting rounds.
+    early_stopping_rounds : int, optional
+        Stop when the validation metrics have not improved for this many
+        rounds; ``None`` trains exactly ``num_boost_round`` rounds.
+    log_period : int
+        Log the evaluation metrics every ``log_period`` rounds (0: never).
+
+    Returns
+    -------
+    tuple
+        The booster and its validation ``accuracy`` and ``auc``.
+    """
+    lgb_train, X_val, y_val = data.train_set, data.X_val, data.y_val
 
     # ---------------------------------------------------------------
     # Handle class imbalance
     # ---------------------------------------------------------------
-    pos_ratio = y_train.sum() / y_train.shape[0]
+    pos_ratio = float(lgb_train.construct().get_label().mean())
     scale_pos_weight = (1 - pos_ratio) / pos_ratio
 
     logger.info(
@@ -91,48 +183,33 @@ def main():
     # ---------------------------------------------------------------
     # LightGBM datasets
     # ---------------------------------------------------------------
-    lgb_train = lgb.Dataset(
-        X_train,
-        label=y_train,
-        categorical_feature="auto"
-    )
-
-    lgb_val = lgb.Dataset(
-        X_val,
-        label=y_val,
-        categorical_feature="auto",
-        reference=lgb_train
-    )
-
-    # ---------------------------------------------------------------
-    # Model parameters
-    # ---------------------------------------------------------------
-    params = {
-        "objective": "binary",
-        "metric": ["binary_logloss", "auc"],
-        "boosting_type": "gbdt",
-        "learning_rate": 0.05,
-        "num_leaves": 31,
-        "max_depth": -1,
-        "scale_pos_weight": scale_pos_weight,
-        "verbose": -1,
-        "seed": 42,
-    }
+    lgb_val = data.val_set
+    if lgb_val is None:
+        lgb_val = lgb.Dataset(
+            X_val,
+            label=y_val,
+            categorical_feature="auto",
+            reference=lgb_train,
+            params=dict(DATASET_PARAMS),
+        )
 
     # ---------------------------------------------------------------
     # Model training
     # ---------------------------------------------------------------
     logger.info("Training LightGBM model...")
 
+    callbacks = []
+    if early_stopping_rounds:
+        callbacks.append(lgb.early_stopping(stopping_rounds=early_stopping_rounds))
+    if log_period:
+        callbacks.append(lgb.log_evaluation(log_period))
+
     model = lgb.train(
-        params=params,
+        params={**(params or PARAMS), "scale_pos_weight": scale_pos_weight},
         train_set=lgb_train,
-        num_boost_round=1000,
+        num_boost_round=num_boost_round,
         valid_sets=[lgb_train, lgb_val],
-        callbacks=[
-            lgb.early_stopping(stopping_rounds=50),
-            lgb.log_evaluation(50),
-        ],
+        callbacks=callbacks,
     )
 
     # ---------------------------------------------------------------
@@ -147,13 +224,117 @@ def main():
     logger.info(f"Validation Accuracy: {acc:.4f}")
     logger.info(f"Validation AUC: {auc:.4f}")
 
+    return model, {"accuracy": acc, "auc": auc}
+
+
+def train_model(
+    df: pd.DataFrame,
+    *,
+    num_boost_round: int = 1000,
+    early_stopping_rounds: Optional[int] = 50,
+    log_period: int = 50,
+) -> Tuple[lgb.Booster, Dict[str, float]]:
+    """
+    Train a LightGBM model on a raw training frame, without the feature
+    cache (``prepare_training_data`` then ``fit_model``).
+    """
+    return fit_model(
+        prepare_training_data(df),
+        num_boost_round=num_boost_round,
+        early_stopping_rounds=early_stopping_rounds,
+        log_period=log_period,
+    )
+
+
+def main(use_cache: bool = True):
+    """
+    Train and persist a LightGBM marketing response model.
+
+    Workflow:
+    1. Load preprocessed training data (steps 1-3 come from the feature
+       cache when the CSV and feature code are unchanged, unless
+       ``use_cache`` is False)
+    2. Apply feature engineering and target extraction
+    3. Split data into training and validation sets
+    4. Address class imbalance using scale_pos_weight
+    5. Train LightGBM with early stopping (tuned parameters from
+       ``models/best_params.json`` when a search has written them)
+    6. Evaluate model performance
+    7. Save trained model to disk, plus its native and flat-array exports
+       and the bin boundaries of its training set
+    8. Publish it with its mappings as a new (inactive) registry version
+
+    This function is intended to be executed as a script and does not
+    return a value.
+    """
+
     # ---------------------------------------------------------------
-    # Persist trained model
+    # Load training data
     # ---------------------------------------------------------------
-    MODELS_DIR.mkdir(parents=True, exist_ok=True)
-    joblib.dump(model, MODEL_PATH)
+    train_csv = PROCESSED_DATA_DIR / "marketing_training.csv"
+    logger.info(f"Loading training data from {train_csv}")
+
+    # Prepared features and the binned training set are cached per file
+    # content and feature version; see modeling/feature_cache.py
+    start = time.perf_counter()
+    data, cached = load_training_data(train_csv, FeatureCache() if use_cache else None)
+    logger.info(
+        f"Training data ready in {time.perf_counter() - start:.2f} s "
+        f"({'feature cache hit' if cached else 'prepared from CSV'})"
+    )
 
-    logger.info(f"Saved LightGBM model to {MODEL_PATH}")
+    model, metrics = fit_model(data, params=tuned_params())
+
+    save_model(model, metrics, train_set=data.train_set)
+
+
+def save_model(
+    model: lgb.Booster,
+    metrics: Dict[str, float],
+    *,
+    train_set: Optional[lgb.Dataset] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    model_path: Path = MODEL_PATH,
+) -> Bundle:
+    """
+    Persist a trained model (step 7-8 of ``main``).
+
+    Writes the pickle to ``model_path`` (default ``MODEL_PATH``) with its
+    native and flat-array exports next to it (``export.export_paths``)
+    and publishes it to the registry as a new, inactive version
+    (``metrics`` and ``metadata`` go into the manifest). With
+    ``train_set``, its bin boundaries are saved next to it as well
+    (``BIN_REFERENCE_PATH`` for ``MODEL_PATH``) for incremental updates
+    (``modeling.incremental``).
+    """
+    model_path = Path(model_path)
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(model, model_path)
+
+    logger.info(f"Saved LightGBM model to {model_path}")
+
+    # Native text model + flat arrays for memory-mapped multi-worker serving
+    export_model(model, model_version(model_path), *export_paths(model_path))
+
+    if train_set is not None:
+        # One row is enough: a Dataset built against the training set
+        # carries its bin mappers
+        bins_path = model_path.with_suffix(".bins")
+        train_set.construct().subset([0]).construct().save_binary(str(bins_path))
+        logger.info(f"Saved bin boundaries to {bins_path}")
+
+    # Versioned bundle for zero-downtime swaps; serving switches to it once
+    # activated (registry CLI or POST /admin/model/reload?version=...)
+    bundle = ModelRegistry().publish(
+        model_path,
+        metadata={
+            "val_accuracy": metrics["accuracy"],
+            "val_auc": metrics["auc"],
+            **(metadata or {}),
+        },
+    )
+    logger.info(f"Published model bundle {bundle.version}")
+    return bundle
 
 
 # -------------------------------------------------------------------
@@ -0,0 +1,387 @@
+# marketing_campaign_response/modeling/tune.py
+
+"""
+Parallel hyperparameter search for the LightGBM model.
+
+The training data is prepared once (through the feature cache, see
+``train.load_training_data``) and the binned training set is written to
+a LightGBM binary file. Every worker process loads that file and builds
+the validation set against it once, in the pool initializer, so trials
+never re-bin the data. Worker processes are spawned rather than forked:
+the parent has already run OpenMP code while binning, and forking such a
+process can deadlock the child's OpenMP runtime. Each trial is capped at
+``threads_per_worker`` LightGBM threads so the pool does not
+oversubscribe the CPUs (``score.resolve_parallelism``).
+
+Trial parameters are drawn up front from a seeded generator. Trials run
+in waves of ``workers``, and a trial is pruned when its validation AUC
+at a checkpoint (every ``prune_every`` rounds after ``prune_warmup``) is
+below the median AUC that trials of *earlier* waves reached at the same
+checkpoint. Pruning decisions therefore depend only on the seed and on
+the wave layout, never on which process finished first, so a search with
+a fixed seed and fixed ``workers``/``threads_per_worker`` always gives the
+same leaderboard. Unpruned trials also stop early when the validation
+AUC stops improving, as in ``train.fit_model``.
+
+Results are written to ``reports/tuning/leaderboard.csv`` (best first)
+and the best parameters to ``models/best_params.json``, which
+``train.py`` merges over its defaults on the next run.
+
+Usage::
+
+    python -m marketing_campaign_response.modeling.tune --trials 40 --workers 4
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import json
+import math
+import multiprocessing
+from pathlib import Path
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import lightgbm as lgb
+from loguru import logger
+import numpy as np
+import pandas as pd
+import typer
+
+from marketing_campaign_response.config import (
+    BEST_PARAMS_PATH,
+    PROCESSED_DATA_DIR,
+    REPORTS_DIR,
+)
+from marketing_campaign_response.modeling.feature_cache import FeatureCache, TrainingData
+from marketing_campaign_response.modeling.score import resolve_parallelism
+from marketing_campaign_response.modeling.train import (
+    DATASET_PARAMS,
+    PARAMS,
+    load_training_data,
+)
+
+app = typer.Typer()
+
+TUNING_DIR = REPORTS_DIR / "tuning"
+
+# name -> (low, high, kind); "log" ranges are sampled log-uniformly
+SEARCH_SPACE: Dict[str, tuple] = {
+    "learning_rate": (0.01, 0.2, "log"),
+    "num_leaves": (8, 128, "log_int"),
+    "min_child_samples": (5, 100, "int"),
+    "feature_fraction": (0.5, 1.0, "float"),
+    "bagging_fraction": (0.5, 1.0, "float"),
+    "lambda_l2": (1e-3, 10.0, "log"),
+}
+
+
+class TrialResult(NamedTuple):
+    trial: int
+    params: Dict[str, Any]
+    auc: float
+    best_iteration: int
+    rounds: int
+    pruned: bool
+    seconds: float
+    # Validation AUC at every checkpoint reached
+    checkpoints: Dict[int, float]
+
+
+def sample_params(n_trials: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    ``n_trials`` parameter sets drawn from ``SEARCH_SPACE``.
+    """
+    rng = np.random.default_rng(seed)
+    trials = []
+    for _ in range(n_trials):
+        params = {}
+        for name, (low, high, kind) in SEARCH_SPACE.items():
+            if kind.startswith("log"):
+                value = math.exp(rng.uniform(math.log(low), math.log(high)))
+            else:
+                value = rng.uniform(low, high)
+            params[name] = int(round(value)) if kind.endswith("int") else float(value)
+        params["bagging_freq"] = 1
+        trials.append(params)
+    return trials
+
+
+# -------------------------------------------------------------------
+# Worker side
+# -------------------------------------------------------------------
+# Per-process datasets, created by the pool initializer
+_datasets: Optional[tuple] = None
+
+
+def _init_worker(
+    binary_path: str,
+    pandas_categorical: list,
+    X_val: pd.DataFrame,
+    y_val: pd.Series,
+    num_threads: int,
+) -> None:
+    global _datasets
+    train_set = lgb.Dataset(binary_path, params=dict(DATASET_PARAMS)).construct()
+    train_set.pandas_categorical = pandas_categorical
+    val_set = lgb.Dataset(
+        X_val, label=y_val, reference=train_set, params=dict(DATASET_PARAMS)
+    ).construct()
+    _datasets = (train_set, val_set, num_threads)
+
+
+class _Pruned(Exception):
+    pass
+
+
+def _run_trial(
+    trial: int,
+    params: Dict[str, Any],
+    thresholds: Dict[int, float],
+    num_boost_round: int,
+    early_stopping_rounds: int,
+    prune_every: int,
+) -> TrialResult:
+    train_set, val_set, num_threads = _datasets
+    checkpoints: Dict[int, float] = {}
+    trained = [0]
+
+    def prune(env: lgb.callback.CallbackEnv) -> None:
+        rounds = trained[0] = env.iteration + 1
+        if rounds % prune_every:
+            return
+        auc = float(next(r[2] for r in env.evaluation_result_list if r[1] == "auc"))
+        checkpoints[rounds] = auc
+        if rounds in thresholds and auc < thresholds[rounds]:
+            raise _Pruned()
+
+    pos_ratio = float(train_set.get_label().mean())
+    trial_params = {
+        **PARAMS,
+        "scale_pos_weight": (1 - pos_ratio) / pos_ratio,
+        **params,
+        "metric": "auc",
+        "num_threads": num_threads,
+        "deterministic": True,
+    }
+    start = time.perf_counter()
+    try:
+        model = lgb.train(
+            trial_params,
+            train_set,
+            num_boost_round=num_boost_round,
+            valid_sets=[val_set],
+            valid_names=["val"],
+            callbacks=[prune, lgb.early_stopping(early_stopping_rounds, verbose=False)],
+        )
+    except _Pruned:
+        rounds = trained[0]
+        return TrialResult(
+            trial, params, checkpoints[rounds], rounds, rounds, True,
+            time.perf_counter() - start, checkpoints,
+        )
+
+    return TrialResult(
+        trial, params, float(model.best_score["val"]["auc"]), model.best_iteration,
+        trained[0], False, time.perf_counter() - start, checkpoints,
+    )
+
+
+# -------------------------------------------------------------------
+# Search
+# -------------------------------------------------------------------
+def _thresholds(
+    results: List[TrialResult], prune_warmup: int, min_trials: int
+) -> Dict[int, float]:
+    """
+    Median AUC per checkpoint over finished trials (from ``prune_warmup`` on).
+    """
+    by_round: Dict[int, List[float]] = {}
+    for result in results:
+        for rounds, auc in result.checkpoints.items():
+            if rounds >= prune_warmup:
+                by_round.setdefault(rounds, []).append(auc)
+    return {
+        rounds: statistics.median(values)
+        for rounds, values in by_round.items()
+        if len(values) >= min_trials
+    }
+
+
+def search(
+    data: TrainingData,
+    *,
+    n_trials: int = 40,
+    workers: Optional[int] = None,
+    threads_per_worker: Optional[int] = None,
+    seed: int = 0,
+    num_boost_round: int = 1000,
+    early_stopping_rounds: int = 50,
+    prune_every: int = 25,
+    prune_warmup: int = 50,
+    min_trials: int = 3,
+) -> List[TrialResult]:
+    """
+    Run the search and return the trials, best validation AUC first.
+
+    Parameters
+    ----------
+    data : TrainingData
+        Prepared training data (``train.load_training_data``).
+    n_trials : int
+        Number of parameter sets to try.
+    workers, threads_per_worker : int, optional
+        Trial processes and LightGBM threads per trial (default: one
+        process per CPU, CPUs split evenly).
+    seed : int
+        Seed of the parameter sampling; LightGBM's own seed is in ``PARAMS``.
+    num_boost_round, early_stopping_rounds : int
+        Round budget and patience of every trial.
+    prune_every, prune_warmup : int
+        Checkpoint interval, and the first round at which pruning may happen.
+    min_trials : int
+        Finished trials needed at a checkpoint before it can prune.
+    """
+    workers, threads_per_worker = resolve_parallelism(workers, threads_per_worker)
+    trials = sample_params(n_trials, seed)
+    logger.info(
+        f"Searching {n_trials} trials with {workers} worker(s) x {threads_per_worker} thread(s)"
+    )
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix="tune-"))
+    try:
+        binary_path = str(tmp_dir / "train.bin")
+        data.train_set.construct().save_binary(binary_path)
+        initargs = (
+            binary_path,
+            data.train_set.pandas_categorical,
+            data.X_val,
+            data.y_val,
+            threads_per_worker,
+        )
+        settings = (num_boost_round, early_stopping_rounds, prune_every)
+
+        results: List[TrialResult] = []
+        pool = None
+        if workers == 1:
+            _init_worker(*initargs)
+        else:
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=initargs,
+            )
+        try:
+            for wave_start in range(0, n_trials, workers):
+                thresholds = _thresholds(results, prune_warmup, min_trials)
+                wave = range(wave_start, min(wave_start + workers, n_trials))
+                if pool is None:
+                    finished = [_run_trial(i, trials[i], thresholds, *settings) for i in wave]
+                else:
+                    futures = [
+                        pool.submit(_run_trial, i, trials[i], thresholds, *settings)
+                        for i in wave
+                    ]
+                    finished = [f.result() for f in futures]
+                for result in finished:
+                    logger.info(
+                        f"Trial {result.trial}: AUC {result.auc:.4f} after {result.rounds} "
+                        f"rounds{' (pruned)' if result.pruned else ''}"
+                    )
+                results.extend(finished)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return sorted(results, key=lambda r: (r.pruned, -r.auc, r.trial))
+
+
+def leaderboard(results: List[TrialResult]) -> pd.DataFrame:
+    rows = []
+    for rank, result in enumerate(results, 1):
+        rows.append(
+            {
+                "rank": rank,
+                "trial": result.trial,
+                "auc": result.auc,
+                "pruned": result.pruned,
+                "best_iteration": result.best_iteration,
+                "rounds": result.rounds,
+                "seconds": round(result.seconds, 3),
+                **result.params,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def save_results(
+    results: List[TrialResult],
+    *,
+    leaderboard_path: Path = TUNING_DIR / "leaderboard.csv",
+    best_params_path: Path = BEST_PARAMS_PATH,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Write the leaderboard CSV and the best trial's parameters.
+    """
+    leaderboard_path.parent.mkdir(parents=True, exist_ok=True)
+    leaderboard(results).to_csv(leaderboard_path, index=False)
+
+    best = results[0]
+    if best.pruned:
+        raise ValueError("Every trial was pruned; no parameters to save")
+    payload = {
+        "params": best.params,
+        "val_auc": best.auc,
+        "best_iteration": best.best_iteration,
+        "trial": best.trial,
+        **(metadata or {}),
+    }
+    best_params_path.parent.mkdir(parents=True, exist_ok=True)
+    best_params_path.write_text(json.dumps(payload, indent=2) + "\n")
+    logger.info(f"Leaderboard -> {leaderboard_path}; best params -> {best_params_path}")
+    return payload
+
+
+@app.command()
+def main(
+    train_csv: Path = typer.Option(PROCESSED_DATA_DIR / "marketing_training.csv"),
+    trials: int = typer.Option(40, help="Number of parameter sets"),
+    workers: Optional[int] = typer.Option(None, help="Trial processes (default: CPU count)"),
+    threads_per_worker: Optional[int] = typer.Option(
+        None, help="LightGBM threads per trial (default: CPUs / workers)"
+    ),
+    seed: int = typer.Option(0, help="Seed of the parameter sampling"),
+    num_boost_round: int = typer.Option(1000),
+    prune_every: int = typer.Option(25, help="Rounds between pruning checkpoints"),
+    prune_warmup: int = typer.Option(50, help="No pruning before this round"),
+    use_cache: bool = typer.Option(True, help="Use the feature cache"),
+):
+    """
+    Search hyperparameters and save the best ones for train.py.
+    """
+    data, _ = load_training_data(train_csv, FeatureCache() if use_cache else None)
+    start = time.perf_counter()
+    results = search(
+        data,
+        n_trials=trials,
+        workers=workers,
+        threads_per_worker=threads_per_worker,
+        seed=seed,
+        num_boost_round=num_boost_round,
+        prune_every=prune_every,
+        prune_warmup=prune_warmup,
+    )
+    best = save_results(results, metadata={"seed": seed, "n_trials": trials})
+    logger.success(
+        f"{trials} trials in {time.perf_counter() - start:.1f} s, "
+        f"{sum(r.pruned for r in results)} pruned; best AUC {best['val_auc']:.4f}"
+    )
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,74 @@
+# marketing_campaign_response/modeling/validation.py
+
+"""
+FastAPI glue for the customer schema validators.
+
+Endpoints take the raw JSON body and validate it with
+``marketing_campaign_response.schema`` instead of per-record Pydantic
+models. ``register_validation`` turns ``SchemaValidationError`` into a
+``422`` whose body is the error report (offending row indices and
+columns); single-record and batch endpoints share that shape, and its
+``detail`` is FastAPI's usual list of ``{"type", "loc", "msg", "input"}``.
+``customer_body`` documents the expected body in the OpenAPI schema.
+
+The schema module (and with it pandas) is imported when an app registers
+the handler, not when this module is imported, so that importing
+``app_factory`` stays cheap.
+"""
+
+import json
+from typing import Any, Dict
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from marketing_campaign_response.metrics import METRICS
+
+
+def register_validation(app: FastAPI) -> None:
+    """
+    Answer ``SchemaValidationError`` with 422 and the error report.
+    """
+    from marketing_campaign_response.schema import SchemaValidationError
+
+    async def validation_handler(request: Request, exc: SchemaValidationError) -> JSONResponse:
+        return JSONResponse(status_code=422, content=exc.report())
+
+    app.add_exception_handler(SchemaValidationError, validation_handler)
+
+
+async def json_body(request: Request) -> Any:
+    """
+    Parsed JSON request body; decoding is timed as the ``parse`` stage.
+
+    Raises
+    ------
+    SchemaValidationError
+        If the body is not valid JSON.
+    """
+    from marketing_campaign_response.schema import SchemaValidationError
+
+    body = await request.body()
+    mark = METRICS.stopwatch()
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise SchemaValidationError(
+            [{"row": None, "column": None, "value": None, "error": "invalid JSON body"}], 1, {}
+        )
+    mark("parse")
+    return payload
+
+
+def customer_body(many: bool = False) -> Dict[str, Any]:
+    """
+    ``openapi_extra`` documenting a customer (or customer array) body.
+    """
+    from marketing_campaign_response.schema import customer_json_schema
+
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": customer_json_schema(many)}},
+        }
+    }
@@ -0,0 +1,464 @@
+# marketing_campaign_response/schema.py
+
+"""
+Single definition of the customer input schema and its validators.
+
+The APIs used to declare three drifting Pydantic models (all fields
+required in one, all optional in another) and validated every record on
+its own, which dominated the cost of large uploads. ``CUSTOMER_SCHEMA``
+is now the one source of truth: every feature is optional (absent or
+null values get the same defaults as in ``prepare_features``) and has a
+kind and an allowed range.
+
+Batches are validated column by column on arrays (``validate_frame``):
+dtype coercion, integer and range checks are NumPy/pandas operations
+over whole columns. Small batches, including single records, use an
+equivalent per-value path (``validate_records``) that avoids pandas
+overhead. Both report problems the same way, as a
+``SchemaValidationError`` listing the offending row indices and columns.
+"""
+
+from dataclasses import dataclass
+import math
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from marketing_campaign_response.features import (
+    COLUMN_MAPPING,
+    FEATURE_COLS,
+    resolve_record_sources,
+)
+from marketing_campaign_response.metrics import METRICS
+
+NOT_A_NUMBER = "not a number"
+NOT_AN_INTEGER = "not an integer"
+NOT_A_STRING = "not a string"
+NOT_AN_OBJECT = "not an object"
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """
+    One input feature.
+
+    Attributes
+    ----------
+    name : str
+        Feature name used by the model (``FEATURE_COLS``).
+    kind : str
+        ``"int"``, ``"float"`` or ``"category"``.
+    minimum, maximum : float, optional
+        Inclusive bounds of numeric features.
+    description : str
+        Human-readable description (shown in the OpenAPI schema).
+    """
+
+    name: str
+    kind: str
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    description: str = ""
+
+    @property
+    def api_name(self) -> str:
+        """
+        JSON-friendly field name (dots replaced by underscores).
+        """
+        return self.name.replace(".", "_")
+
+    @property
+    def range_error(self) -> str:
+        return f"out of range [{self.minimum:g}, {self.maximum:g}]"
+
+
+CUSTOMER_SCHEMA: Dict[str, FieldSpec] = {
+    spec.name: spec
+    for spec in [
+        FieldSpec("profession", "category", description="Job category"),
+        FieldSpec("marital", "category", description="Marital status"),
+        FieldSpec("schooling", "category", description="Education level"),
+        FieldSpec("default", "category", description="Has credit in default"),
+        FieldSpec("housing", "category", description="Has a housing loan"),
+        FieldSpec("contact", "category", description="Contact communication type"),
+        FieldSpec("month", "category", description="Month of last contact"),
+        FieldSpec("day_of_week", "category", description="Day of last contact"),
+        FieldSpec("poutcome", "category", description="Outcome of the previous campaign"),
+        FieldSpec("custAge", "int", 16, 110, "Customer age in years"),
+        FieldSpec("campaign", "int", 0, 100, "Contacts during this campaign"),
+        FieldSpec("pdays", "int", -1, 999, "Days since last contact (999 or -1: never)"),
+        FieldSpec("previous", "int", 0, 100, "Contacts before this campaign"),
+        FieldSpec("emp.var.rate", "float", -10, 10, "Employment variation rate"),
+        FieldSpec("cons.price.idx", "float", 80, 120, "Consumer price index"),
+        FieldSpec("cons.conf.idx", "float", -100, 0, "Consumer confidence index"),
+        FieldSpec("euribor3m", "float", -1, 10, "Euribor 3 month rate"),
+        FieldSpec("nr.employed", "float", 4000, 6000, "Number of employees (thousands)"),
+        FieldSpec("pmonths", "int", -1, 999, "Months since last contact (999 or -1: never)"),
+        FieldSpec("pastEmail", "int", 0, 1000, "Emails sent before"),
+    ]
+}
+
+assert list(CUSTOMER_SCHEMA) == FEATURE_COLS, "schema out of sync with FEATURE_COLS"
+
+# Input key -> feature, underscore names and COLUMN_MAPPING aliases included
+_KEY_TO_FEATURE: Dict[str, str] = {name: name for name in CUSTOMER_SCHEMA}
+for _spec in CUSTOMER_SCHEMA.values():
+    _KEY_TO_FEATURE.setdefault(_spec.api_name, _spec.name)
+for _alias, _col in COLUMN_MAPPING.items():
+    if _col in CUSTOMER_SCHEMA:
+        _KEY_TO_FEATURE.setdefault(_alias, _col)
+
+# Below this many records the per-value path is faster than pandas
+SMALL_BATCH = 64
+
+
+class SchemaValidationError(ValueError):
+    """
+    Raised when input records do not match ``CUSTOMER_SCHEMA``.
+
+    Attributes
+    ----------
+    errors : list of dict
+        ``{"row", "column", "value", "error"}`` entries (``row`` is the
+        index of the record in the request, ``column`` the key as sent),
+        ordered by row, at most ``max_errors`` of them.
+    error_count : int
+        Total number of invalid values.
+    columns : dict
+        Number of invalid values per column.
+    single : bool
+        Whether the input was a single record (``validate_record``).
+    """
+
+    def __init__(
+        self,
+        errors: List[dict],
+        error_count: int,
+        columns: Dict[str, int],
+        single: bool = False,
+    ):
+        super().__init__(f"{error_count} invalid value(s) in columns {sorted(columns)}")
+        self.errors = errors
+        self.error_count = error_count
+        self.columns = columns
+        self.single = single
+
+    def detail(self) -> List[Dict[str, Any]]:
+        """
+        The errors in FastAPI's request validation shape (``type``,
+        ``loc``, ``msg``, ``input``). ``loc`` is ``["body", row, column]``
+        for batches and ``["body", column]`` for a single record.
+        """
+        detail = []
+        for e in self.errors:
+            loc: List[Any] = ["body"]
+            if e["row"] is not None and not self.single:
+                loc.append(e["row"])
+            if e["column"] is not None:
+                loc.append(e["column"])
+            detail.append(
+                {"type": "value_error", "loc": loc, "msg": e["error"], "input": e["value"]}
+            )
+        return detail
+
+    def report(self) -> Dict[str, Any]:
+        """
+        JSON-serializable error report: ``detail`` keeps FastAPI's list
+        shape, the other keys are the same for single records and batches.
+        """
+        return {
+            "detail": self.detail(),
+            "error_count": self.error_count,
+            "columns": self.columns,
+            "errors": self.errors,
+        }
+
+
+class _ErrorCollector:
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.errors: List[dict] = []
+        self.count = 0
+        self.columns: Dict[str, int] = {}
+
+    def add(self, row: Optional[int], column: Optional[str], value: Any, error: str) -> None:
+        self.count += 1
+        if column is not None:
+            self.columns[column] = self.columns.get(column, 0) + 1
+        self.errors.append({"row": row, "column": column, "value": _jsonable(value), "error": error})
+
+    def add_rows(self, rows: np.ndarray, column: str, values: pd.Series, error: str) -> None:
+        # Only the first max_errors rows are listed; the rest are counted
+        for row in rows[: self.max_errors]:
+            self.add(int(row), column, values.iat[row], error)
+        extra = max(len(rows) - self.max_errors, 0)
+        self.count += extra
+        self.columns[column] += extra
+
+    def raise_if_any(self, column_order: Dict[str, int]) -> None:
+        if not self.count:
+            return
+        self.errors.sort(key=lambda e: (e["row"] is None, e["row"] or 0,
+                                        column_order.get(e["column"], -1)))
+        raise SchemaValidationError(self.errors[: self.max_errors], self.count, self.columns)
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return str(value)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return repr(value)
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or value is pd.NA or (isinstance(value, float) and math.isnan(value))
+
+
+def _is_category_value(value: Any) -> bool:
+    return _is_missing(value) or isinstance(value, (str, int, float, np.number))
+
+
+# -------------------------------------------------------------------
+# Per-value path (single records and small batches)
+# -------------------------------------------------------------------
+def _check_value(spec: FieldSpec, value: Any):
+    """
+    Return ``(coerced, error)`` for one value; ``error`` is None if valid.
+    """
+    if _is_missing(value):
+        return None, None
+
+    if spec.kind == "category":
+        if _is_category_value(value):
+            return value, None
+        return None, NOT_A_STRING
+
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return None, None
+        if "_" in text:
+            return None, NOT_A_NUMBER
+        try:
+            number = float(text)
+        except ValueError:
+            return None, NOT_A_NUMBER
+        if math.isnan(number):
+            return None, NOT_A_NUMBER
+    elif isinstance(value, (int, float, np.number)):
+        number = float(value)
+    else:
+        return None, NOT_A_NUMBER
+
+    if spec.kind == "int" and math.isfinite(number) and number % 1:
+        return None, NOT_AN_INTEGER
+    if not spec.minimum <= number <= spec.maximum:
+        return None, spec.range_error
+    if spec.kind == "int":
+        return int(number), None
+    return number, None
+
+
+def _validate_small(records: Sequence[Any], collector: "_ErrorCollector") -> List[dict]:
+    dict_records = [record if isinstance(record, dict) else {} for record in records]
+
+    sources = resolve_record_sources(dict_records)
+    fields = [
+        (CUSTOMER_SCHEMA[name], key)
+        for name, key in zip(FEATURE_COLS, sources)
+        if key is not None
+    ]
+
+    clean = []
+    for i, record in enumerate(dict_records):
+        out = {}
+        for spec, key in fields:
+            value = record.get(key)
+            coerced, error = _check_value(spec, value)
+            if error is not None:
+                collector.add(i, key, value, error)
+            out[spec.name] = coerced
+        clean.append(out)
+
+    collector.raise_if_any({key: j for j, (_, key) in enumerate(fields)})
+    return clean
+
+
+# -------------------------------------------------------------------
+# Vectorized path
+# -------------------------------------------------------------------
+def _coerce_numeric(spec: FieldSpec, column: str, values: pd.Series,
+                    collector: _ErrorCollector) -> pd.Series:
+    if values.dtype.kind in "iufb":
+        numbers = values.to_numpy(dtype=np.float64, copy=True)
+    else:
+        as_text = values.astype("string").str.strip()
+        missing = values.isna().to_numpy() | (as_text == "").fillna(True).to_numpy()
+        numbers = pd.to_numeric(values.where(~missing), errors="coerce").to_numpy(
+            dtype=np.float64, na_value=np.nan, copy=True
+        )
+        bad = np.isnan(numbers) & ~missing
+        bad |= as_text.str.contains("_", regex=False).fillna(False).to_numpy()
+        if bad.any():
+            collector.add_rows(np.flatnonzero(bad), column, values, NOT_A_NUMBER)
+            numbers[bad] = np.nan
+
+    finite = np.isfinite(numbers)
+    if spec.kind == "int":
+        fractional = finite & (np.mod(numbers, 1, where=finite, out=np.zeros_like(numbers)) != 0)
+        if fractional.any():
+            collector.add_rows(np.flatnonzero(fractional), column, values, NOT_AN_INTEGER)
+            numbers[fractional] = np.nan
+    with np.errstate(invalid="ignore"):
+        out_of_range = (numbers < spec.minimum) | (numbers > spec.maximum)
+    if out_of_range.any():
+        collector.add_rows(np.flatnonzero(out_of_range), column, values, spec.range_error)
+        numbers[out_of_range] = np.nan
+    return pd.Series(numbers, index=values.index, name=spec.name)
+
+
+def _check_category(column: str, values: pd.Series, collector: _ErrorCollector) -> pd.Series:
+    # Strings and numbers pass unchanged (the encoder stringifies them)
+    if values.dtype.kind in "iufb" or pd.api.types.infer_dtype(values, skipna=True) in (
+        "string", "empty", "integer", "floating", "mixed-integer-float", "boolean",
+    ):
+        return values
+    bad = values.map(lambda v: not _is_category_value(v)).to_numpy(dtype=bool)
+    if bad.any():
+        collector.add_rows(np.flatnonzero(bad), column, values, NOT_A_STRING)
+        values = values.where(~bad, None)
+    return values
+
+
+def validate_frame(df: pd.DataFrame, max_errors: int = 100) -> pd.DataFrame:
+    """
+    Validate and coerce a batch held as a DataFrame, column by column.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Raw input; columns may use feature names, underscore API names or
+        ``COLUMN_MAPPING`` aliases. Unknown columns are ignored.
+    max_errors : int
+        Maximum number of entries in the error report.
+
+    Returns
+    -------
+    pd.DataFrame
+        Frame with one column per feature present in ``df`` (feature
+        names), numeric columns as float64 and categoricals as strings
+        or None.
+
+    Raises
+    ------
+    SchemaValidationError
+        If any value has the wrong type or is out of range.
+    """
+    if df.empty:
+        raise SchemaValidationError(
+            [{"row": None, "column": None, "value": None, "error": "no records"}], 1, {}
+        )
+    mark = METRICS.stopwatch()
+    clean = _validate_frame(df, _ErrorCollector(max_errors))
+    mark("validate")
+    return clean
+
+
+def _validate_frame(df: pd.DataFrame, collector: _ErrorCollector) -> pd.DataFrame:
+    # First column aliasing a feature wins, as in prepare_features
+    sources: Dict[str, str] = {}
+    for column in df.columns:
+        name = _KEY_TO_FEATURE.get(column)
+        if name is not None and name not in sources:
+            sources[name] = column
+
+    clean = {}
+    for name in FEATURE_COLS:
+        column = sources.get(name)
+        if column is None:
+            continue
+        spec = CUSTOMER_SCHEMA[name]
+        values = df[column]
+        if spec.kind == "category":
+            clean[name] = _check_category(column, values, collector)
+        else:
+            clean[name] = _coerce_numeric(spec, column, values, collector)
+
+    collector.raise_if_any({column: j for j, column in enumerate(sources.values())})
+    return pd.DataFrame(clean, index=df.index)
+
+
+def validate_records(
+    records: Any, max_errors: int = 100
+) -> Union[List[dict], pd.DataFrame]:
+    """
+    Validate a JSON batch of customer records.
+
+    Batches of up to ``SMALL_BATCH`` records are checked value by value
+    and returned as normalized records (feature names as keys); larger
+    batches go through ``validate_frame`` and come back as a DataFrame.
+    Either result can be passed to ``Predictor.predict`` and both raise
+    the same ``SchemaValidationError`` for the same input.
+
+    Raises
+    ------
+    SchemaValidationError
+        If ``records`` is not a non-empty list of objects or any value
+        is invalid.
+    """
+    if not isinstance(records, list) or not records:
+        raise SchemaValidationError(
+            [{"row": None, "column": None, "value": None,
+              "error": "expected a non-empty JSON array of objects"}],
+            1,
+            {},
+        )
+    mark = METRICS.stopwatch()
+    collector = _ErrorCollector(max_errors)
+    for i, record in enumerate(records):
+        if not isinstance(record, dict):
+            collector.add(i, None, record, NOT_AN_OBJECT)
+    if len(records) <= SMALL_BATCH:
+        clean = _validate_small(records, collector)
+    else:
+        if collector.count:
+            records = [record if isinstance(record, dict) else {} for record in records]
+        clean = _validate_frame(pd.DataFrame(records), collector)
+    mark("validate")
+    return clean
+
+
+def validate_record(record: Any, max_errors: int = 100) -> List[dict]:
+    """
+    Validate one customer object, as sent to a single-record endpoint.
+
+    Same checks as ``validate_records([record])``; a
+    ``SchemaValidationError`` is marked ``single`` so that its ``detail``
+    locates errors by column only.
+    """
+    try:
+        return validate_records([record], max_errors)
+    except SchemaValidationError as exc:
+        exc.single = True
+        raise
+
+
+def customer_json_schema(many: bool = False) -> Dict[str, Any]:
+    """
+    JSON Schema of a customer record (or an array of them) for OpenAPI docs.
+    """
+    types = {"int": "integer", "float": "number", "category": "string"}
+    properties = {}
+    for spec in CUSTOMER_SCHEMA.values():
+        prop: Dict[str, Any] = {"type": [types[spec.kind], "null"], "description": spec.description}
+        if spec.kind != "category":
+            prop.update(minimum=spec.minimum, maximum=spec.maximum)
+        properties[spec.api_name] = prop
+    record = {"type": "object", "title": "Customer", "properties": properties}
+    if many:
+        return {"type": "array", "items": record, "minItems": 1}
+    return record
@@ -0,0 +1,235 @@
+# marketing_campaign_response/serve.py
+
+"""
+Preforking multi-worker server for the prediction API.
+
+Running ``uvicorn --workers N`` makes every worker import the app on its
+own, so each one unpickles the model and keeps a private copy of it. Here
+the parent process binds the listening socket, imports the app and loads
+its model (``app.state.model_service``) exactly once, then forks the
+workers, which only warm the model up before reporting ready. Model
+objects and the memory-mapped tree-engine arrays are shared copy-on-write;
+``gc.freeze()`` keeps the collector from touching, and thereby copying,
+the pages of objects allocated before the fork.
+
+The parent logs the app startup time; every worker logs its own boot time
+and its memory (RSS, PSS and the shared part) once it accepts requests.
+The parent restarts workers that die and forwards SIGINT/SIGTERM to them.
+
+Usage::
+
+    python -m marketing_campaign_response.serve --workers 4 --port 8000
+"""
+
+import gc
+import os
+import signal
+import socket
+import time
+from typing import Dict, List, Optional
+
+from loguru import logger
+import typer
+import uvicorn
+from uvicorn.importer import import_from_string
+
+app = typer.Typer()
+
+DEFAULT_APP = "marketing_campaign_response.main:app"
+
+# /proc/<pid>/smaps_rollup fields reported per worker (kB)
+_MEMORY_FIELDS = {
+    "Rss": "rss_kb",
+    "Pss": "pss_kb",
+    "Shared_Clean": "shared_clean_kb",
+    "Shared_Dirty": "shared_dirty_kb",
+    "Private_Clean": "private_clean_kb",
+    "Private_Dirty": "private_dirty_kb",
+}
+
+
+def memory_usage(pid: Optional[int] = None) -> Dict[str, int]:
+    """
+    Memory of a process in kB, read from ``/proc/<pid>/smaps_rollup``.
+
+    PSS divides shared pages among the processes mapping them, so the sum
+    of PSS over the workers is their real combined footprint, while RSS
+    counts shared pages once per worker.
+
+    Returns an empty dict where smaps are unavailable (non-Linux).
+    """
+    path = f"/proc/{pid or 'self'}/smaps_rollup"
+    usage: Dict[str, int] = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in _MEMORY_FIELDS:
+                    usage[_MEMORY_FIELDS[key]] = int(rest.split()[0])
+    except OSError:
+        return {}
+    return usage
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """
+    Create the listening socket shared by all workers.
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class _WorkerServer(uvicorn.Server):
+    """
+    uvicorn server that reports boot time and memory once it is serving.
+    """
+
+    def __init__(self, config: uvicorn.Config, forked_at: float):
+        super().__init__(config)
+        self.forked_at = forked_at
+
+    async def startup(self, sockets=None) -> None:
+        await super().startup(sockets=sockets)
+        boot = time.perf_counter() - self.forked_at
+        logger.info(f"Worker {os.getpid()} ready in {boot * 1000:.1f} ms, memory {memory_usage()}")
+
+
+def _run_worker(app, sock: socket.socket, log_level: str, forked_at: float) -> None:
+    # Let uvicorn install its own graceful-shutdown handlers
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    config = uvicorn.Config(app, log_level=log_level, access_log=False)
+    _WorkerServer(config, forked_at).run(sockets=[sock])
+
+
+class PreforkServer:
+    """
+    Parent process of the preforked workers.
+
+    Parameters
+    ----------
+    app : str
+        ``"module:attribute"`` of the ASGI app; imported once, in the parent.
+    host, port : str, int
+        Listening address.
+    workers : int
+        Number of worker processes.
+    log_level : str
+        uvicorn log level of the workers.
+    """
+
+    def __init__(
+        self,
+        app: str = DEFAULT_APP,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        workers: int = 2,
+        log_level: str = "info",
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.app_path = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.log_level = log_level
+
+        self.app = None
+        self.sock: Optional[socket.socket] = None
+        self.pids: List[int] = []
+        self.startup_seconds: Optional[float] = None
+        self._stopping = False
+
+    def run(self) -> None:
+        """
+        Load the app, fork the workers and supervise them until stopped.
+        """
+        start = time.perf_counter()
+        self.sock = bind_socket(self.host, self.port)
+        self.app = import_from_string(self.app_path)
+        service = getattr(getattr(self.app, "state", None), "model_service", None)
+        if service is not None:
+            # Load before forking so every worker shares the model
+            service.load()
+        self.startup_seconds = time.perf_counter() - start
+        logger.info(
+            f"Loaded {self.app_path} in {self.startup_seconds * 1000:.1f} ms, "
+            f"parent memory {memory_usage()}"
+        )
+
+        # Objects created so far are shared with the workers; keep the
+        # collector from writing to their pages
+        gc.collect()
+        gc.freeze()
+
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGTERM, self._handle_stop)
+
+        for _ in range(self.workers):
+            self._spawn()
+        logger.info(f"Serving on http://{self.host}:{self.port} with {self.workers} workers")
+
+        try:
+            self._supervise()
+        finally:
+            self.sock.close()
+
+    def _spawn(self) -> None:
+        forked_at = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _run_worker(self.app, self.sock, self.log_level, forked_at)
+            except BaseException:
+                logger.exception(f"Worker {os.getpid()} crashed")
+                code = 1
+            finally:
+                os._exit(code)
+        self.pids.append(pid)
+
+    def _supervise(self) -> None:
+        while self.pids:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            if pid not in self.pids:
+                continue
+            self.pids.remove(pid)
+            if not self._stopping:
+                logger.warning(f"Worker {pid} exited with status {status}; restarting it")
+                self._spawn()
+
+    def _handle_stop(self, signum, frame) -> None:
+        self._stopping = True
+        for pid in self.pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+
+@app.command()
+def main(
+    asgi_app: str = typer.Option(DEFAULT_APP, "--app", help="ASGI app as module:attribute"),
+    host: str = typer.Option("127.0.0.1"),
+    port: int = typer.Option(8000),
+    workers: int = typer.Option(2),
+    log_level: str = typer.Option("info"),
+):
+    """
+    Serve the prediction API with preforked workers.
+    """
+    PreforkServer(app=asgi_app, host=host, port=port, workers=workers, log_level=log_level).run()
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,115 @@
+# marketing_campaign_response/synthetic.py
+
+"""
+Deterministic synthetic customer data built from the feature schema.
+
+Benchmarks and tests use these frames instead of the downloaded dataset,
+so they run offline and always see the same rows for a given seed.
+Categorical values are drawn from the categorical mappings and sprinkled
+with the kind of noise real uploads contain (mixed case, padding and
+values outside the vocabulary).
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from marketing_campaign_response.features import (
+    CATEGORICAL_COLS,
+    NUMERICAL_COLS,
+    TARGET_COL,
+    load_categorical_mappings,
+)
+
+# (low, high) ranges used for the numerical features
+NUMERICAL_RANGES: Dict[str, tuple] = {
+    "custAge": (18, 90),
+    "campaign": (1, 20),
+    "pdays": (0, 30),
+    "previous": (0, 7),
+    "emp.var.rate": (-3.4, 1.4),
+    "cons.price.idx": (92.2, 94.8),
+    "cons.conf.idx": (-50.8, -26.9),
+    "euribor3m": (0.6, 5.1),
+    "nr.employed": (4963.6, 5228.1),
+    "pmonths": (0, 1),
+    "pastEmail": (0, 10),
+}
+
+INTEGER_COLS: List[str] = [
+    "custAge", "campaign", "pdays", "previous", "pmonths", "pastEmail"
+]
+
+
+def make_customers(
+    n_rows: int,
+    *,
+    seed: int = 0,
+    noise: float = 0.05,
+    with_target: bool = False,
+    mappings: Optional[Dict[str, List[str]]] = None,
+) -> pd.DataFrame:
+    """
+    Generate ``n_rows`` synthetic customer records.
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of rows to generate.
+    seed : int
+        Seed of the random generator; equal seeds give equal frames.
+    noise : float
+        Fraction of categorical values that get upper-cased and padded,
+        and (separately) replaced by an out-of-vocabulary value.
+    with_target : bool
+        Add a ``responded`` column ("yes"/"no") correlated with the features.
+    mappings : dict, optional
+        Categorical vocabulary; defaults to the saved categorical mappings.
+
+    Returns
+    -------
+    pd.DataFrame
+        Frame with the training column names (``FEATURE_COLS`` order).
+    """
+    rng = np.random.default_rng(seed)
+    if mappings is None:
+        mappings = load_categorical_mappings()
+
+    data = {}
+    for col in CATEGORICAL_COLS:
+        vocab = np.array([v for v in mappings[col] if v != "unknown"], dtype=object)
+        values = vocab[rng.integers(0, len(vocab), n_rows)]
+
+        shouted = rng.random(n_rows) < noise
+        values[shouted] = [f" {v.upper()} " for v in values[shouted]]
+        unseen = rng.random(n_rows) < noise
+        values[unseen] = "never-seen"
+
+        data[col] = values
+
+    for col in NUMERICAL_COLS:
+        low, high = NUMERICAL_RANGES[col]
+        if col in INTEGER_COLS:
+            data[col] = rng.integers(low, high + 1, n_rows)
+        else:
+            data[col] = np.round(rng.uniform(low, high, n_rows), 3)
+
+    # Most customers were never contacted before
+    never = rng.random(n_rows) < 0.9
+    data["pdays"][never] = 999
+    data["pmonths"][never] = 999
+
+    df = pd.DataFrame(data)
+
+    if with_target:
+        logit = (
+            -2.5
+            + 1.5 * (df["poutcome"] == "success")
+            - 0.4 * df["emp.var.rate"]
+            - 0.1 * df["campaign"]
+        )
+        prob = 1.0 / (1.0 + np.exp(-logit.to_numpy(dtype=float)))
+        df[TARGET_COL] = np.where(rng.random(n_rows) < prob, "yes", "no")
+
+    return df
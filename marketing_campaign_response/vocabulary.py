@@ -0,0 +1,290 @@
+# marketing_campaign_response/vocabulary.py
+
+"""
+Streaming builder of the categorical vocabulary.
+
+``models/create_categorical_mappings.py`` used to read the whole training
+CSV into pandas to collect the distinct values of nine columns, and kept
+every value ever seen. This module builds the same mappings from any
+number of CSV or Parquet files:
+
+- each file is streamed in chunks, reading only the categorical columns;
+  a chunk is reduced to ``value_counts`` of its raw values, and only the
+  distinct values are cleaned (strip + lower, missing as ``"unknown"``),
+  as ``CategoricalEncoder`` cleans them at prediction time;
+- files are counted in parallel, one ``collections.Counter`` per column
+  and file in a worker process, merged when all workers are done. Memory
+  is a chunk per worker plus the counters, whose size is the number of
+  distinct values, not of rows;
+- values seen fewer than ``min_count`` times, or outside the ``top_k``
+  most frequent of their column, are pruned: their rows fall to
+  ``"unknown"``, which is always part of the vocabulary.
+
+``save_vocabulary`` writes ``models/categorical_mappings.pkl`` (column ->
+sorted categories, the format ``features.py`` loads) and, next to it,
+``categorical_vocabulary.json`` with the frequencies, the pruning
+settings and the version: the content hash by which
+``CategoricalMappingsCache`` and the model registry know the mappings.
+
+Usage::
+
+    python -m marketing_campaign_response.vocabulary data/raw/history/*.parquet --min-count 20
+"""
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+from pathlib import Path
+import tempfile
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+import joblib
+from loguru import logger
+import pandas as pd
+import typer
+
+from marketing_campaign_response.config import MODELS_DIR, PROCESSED_DATA_DIR
+from marketing_campaign_response.features import (
+    CATEGORICAL_COLS,
+    CATEGORICAL_MAPPINGS_FILE,
+    COLUMN_MAPPING,
+)
+
+app = typer.Typer()
+
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+VOCABULARY_FILE = MODELS_DIR / "categorical_vocabulary.json"
+UNKNOWN = "unknown"
+CHUNK_SIZE = 200_000
+
+Counts = Dict[str, Counter]
+
+
+class Vocabulary(NamedTuple):
+    """
+    Pruned categories and the frequencies they were chosen from.
+
+    ``frequencies`` counts rows per cleaned value before pruning;
+    ``pruned`` lists the values folded into ``"unknown"``.
+    """
+
+    categories: Dict[str, List[str]]
+    frequencies: Dict[str, Dict[str, int]]
+    pruned: Dict[str, List[str]]
+    rows: int
+
+
+def clean_value(value) -> str:
+    """
+    A raw categorical value as the encoder compares it.
+    """
+    if value is None or value is pd.NA or (isinstance(value, float) and value != value):
+        return UNKNOWN
+    return str(value).strip().lower()
+
+
+def _categorical_columns(path: Path) -> List[str]:
+    """
+    Raw names of the categorical columns present in ``path``.
+    """
+    if path.suffix.lower() in PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq
+
+        names = pq.ParquetFile(path).schema_arrow.names
+    else:
+        names = list(pd.read_csv(path, nrows=0).columns)
+    columns = [name for name in names if COLUMN_MAPPING.get(name, name) in CATEGORICAL_COLS]
+    missing = set(CATEGORICAL_COLS) - {COLUMN_MAPPING.get(name, name) for name in columns}
+    if missing:
+        raise ValueError(f"{path} lacks categorical column(s) {sorted(missing)}")
+    return columns
+
+
+def _iter_columns(path: Path, columns: List[str], chunk_size: int) -> Iterator[pd.DataFrame]:
+    if path.suffix.lower() in PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        dtypes = {col: str for col in columns}
+        with pd.read_csv(path, usecols=columns, dtype=dtypes, chunksize=chunk_size) as reader:
+            yield from reader
+
+
+def count_file(path: Path, chunk_size: int = CHUNK_SIZE) -> Counts:
+    """
+    Rows per cleaned value of every categorical column of one file.
+    """
+    path = Path(path)
+    columns = _categorical_columns(path)
+    counts: Counts = {col: Counter() for col in CATEGORICAL_COLS}
+    for chunk in _iter_columns(path, columns, chunk_size):
+        for raw_name in columns:
+            counter = counts[COLUMN_MAPPING.get(raw_name, raw_name)]
+            for value, n in chunk[raw_name].value_counts(dropna=False).items():
+                counter[clean_value(value)] += int(n)
+    return counts
+
+
+def count_files(
+    paths: Sequence[Path],
+    *,
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Counts:
+    """
+    Merged value counts of ``paths``, one worker process per file up to
+    ``workers`` (default: CPU count); a single worker counts in-process.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    totals: Counts = {col: Counter() for col in CATEGORICAL_COLS}
+    if workers <= 1:
+        results = (count_file(path, chunk_size) for path in paths)
+        for counts in results:
+            for col, counter in counts.items():
+                totals[col].update(counter)
+        return totals
+
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        for counts in pool.map(count_file, paths, [chunk_size] * len(paths)):
+            for col, counter in counts.items():
+                totals[col].update(counter)
+    return totals
+
+
+def prune(counts: Counts, *, min_count: int = 1, top_k: Optional[int] = None) -> Vocabulary:
+    """
+    Keep, per column, the values seen at least ``min_count`` times and
+    among the ``top_k`` most frequent (ties broken by value); the rest
+    become ``"unknown"``.
+    """
+    categories, frequencies, pruned = {}, {}, {}
+    for col in CATEGORICAL_COLS:
+        counter = counts[col]
+        ranked = sorted(
+            (v for v in counter if v != UNKNOWN and counter[v] >= min_count),
+            key=lambda v: (-counter[v], v),
+        )
+        kept = set(ranked[:top_k] if top_k is not None else ranked)
+        categories[col] = sorted(kept | {UNKNOWN})
+        frequencies[col] = {v: counter[v] for v in sorted(counter, key=lambda v: (-counter[v], v))}
+        pruned[col] = sorted(v for v in counter if v not in kept and v != UNKNOWN)
+    rows = sum(counts[CATEGORICAL_COLS[0]].values())
+    return Vocabulary(categories, frequencies, pruned, rows)
+
+
+def build_vocabulary(
+    paths: Sequence[Path],
+    *,
+    min_count: int = 1,
+    top_k: Optional[int] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Vocabulary:
+    """
+    Count ``paths`` (see ``count_files``) and prune the result.
+    """
+    if not paths:
+        raise ValueError("No input files")
+    if min_count < 1 or (top_k is not None and top_k < 1):
+        raise ValueError("min_count and top_k must be at least 1")
+    counts = count_files(paths, workers=workers, chunk_size=chunk_size)
+    return prune(counts, min_count=min_count, top_k=top_k)
+
+
+def _write_atomic(path: Path, payload: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}-", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def save_vocabulary(
+    vocabulary: Vocabulary,
+    *,
+    mappings_path: Path = CATEGORICAL_MAPPINGS_FILE,
+    vocabulary_path: Path = VOCABULARY_FILE,
+    metadata: Optional[Dict] = None,
+) -> str:
+    """
+    Write the mappings pickle and the vocabulary JSON; returns the version.
+
+    The pickle is written last, so readers that watch it
+    (``CategoricalMappingsCache``) never see it ahead of its JSON.
+    """
+    buffer = io.BytesIO()
+    joblib.dump(vocabulary.categories, buffer)
+    payload = buffer.getvalue()
+    version = hashlib.sha256(payload).hexdigest()[:16]
+
+    document = {
+        "version": version,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "rows": vocabulary.rows,
+        **(metadata or {}),
+        "columns": {
+            col: {
+                "categories": vocabulary.categories[col],
+                "frequencies": vocabulary.frequencies[col],
+                "pruned": vocabulary.pruned[col],
+            }
+            for col in CATEGORICAL_COLS
+        },
+    }
+    _write_atomic(Path(vocabulary_path), (json.dumps(document, indent=2) + "\n").encode())
+    _write_atomic(Path(mappings_path), payload)
+    logger.info(f"Categorical mappings {version} -> {mappings_path}, {vocabulary_path}")
+    return version
+
+
+@app.command()
+def main(
+    paths: List[Path] = typer.Argument(
+        None, help="CSV/Parquet files (default: the processed training CSV)"
+    ),
+    min_count: int = typer.Option(1, help="Fewest rows for a value to be kept"),
+    top_k: Optional[int] = typer.Option(None, help="Most values kept per column"),
+    workers: Optional[int] = typer.Option(None, help="Counting processes (default: CPU count)"),
+    chunk_size: int = typer.Option(CHUNK_SIZE, help="Rows read at a time"),
+):
+    """
+    Build and save the categorical mappings with their frequencies.
+    """
+    paths = paths or [PROCESSED_DATA_DIR / "marketing_training.csv"]
+    start = time.perf_counter()
+    vocabulary = build_vocabulary(
+        paths, min_count=min_count, top_k=top_k, workers=workers, chunk_size=chunk_size
+    )
+    version = save_vocabulary(
+        vocabulary,
+        metadata={
+            "sources": [str(p) for p in paths],
+            "min_count": min_count,
+            "top_k": top_k,
+        },
+    )
+    kept = sum(len(c) for c in vocabulary.categories.values())
+    dropped = sum(len(p) for p in vocabulary.pruned.values())
+    logger.success(
+        f"{vocabulary.rows} rows from {len(paths)} file(s) in {time.perf_counter() - start:.2f} s: "
+        f"{kept} categories kept, {dropped} pruned (version {version})"
+    )
+
+
+if __name__ == "__main__":
+    app()
@@ -2,30 +2,31 @@
 """
 Script to generate and save categorical mappings from training data.
 
-This script reads the processed marketing campaign training CSV,
-applies column renaming, extracts unique values for each categorical
-column, and saves them in a deterministic order to a pickle file.
-These mappings are later used by the API and frontend to populate
-dropdowns and ensure consistency during model inference.
+This script reads the processed marketing campaign training CSV and
+collects the cleaned values of each categorical column (stripped,
+lowercased, missing values as "unknown"), saved in a deterministic order
+to a pickle file. These mappings are later used by the API and frontend
+to populate dropdowns and ensure consistency during model inference.
+
+The work is done by ``marketing_campaign_response.vocabulary``, which
+streams the file and also writes the value frequencies next to the
+mappings; use it directly for several files or frequency pruning.
 """
 
 import sys
 from pathlib import Path
-import joblib
-import pandas as pd
 
 # Add project root to sys.path
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from marketing_campaign_response.features import (
-    CATEGORICAL_COLS,
-    COLUMN_MAPPING,
+from marketing_campaign_response.vocabulary import (  # noqa: E402
+    build_vocabulary,
+    save_vocabulary,
 )
 
 DATA_PATH = PROJECT_ROOT / "data" / "processed" / "marketing_training.csv"
 MODELS_DIR = PROJECT_ROOT / "models"
-MODELS_DIR.mkdir(exist_ok=True)
 
 
 def create_categorical_mappings():
@@ -33,12 +34,14 @@ def create_categorical_mappings():
     Generate deterministic mappings of categorical values from training data.
 
     Steps:
-    1. Load processed training CSV.
-    2. Rename columns according to COLUMN_MAPPING.
+    1. Stream the processed training CSV, categorical columns only.
+    2. Resolve raw column names through COLUMN_MAPPING.
     3. For each categorical column:
-       - Convert to string, strip whitespace, lowercase, fill missing with "unknown".
-       - Extract unique values and sort them.
-    4. Save the mappings as 'categorical_mappings.pkl' in the models directory.
+       - Count the values after stripping whitespace and lowercasing,
+         with missing values as "unknown".
+       - Keep every value seen, plus "unknown", sorted.
+    4. Save the mappings as 'categorical_mappings.pkl' in the models
+       directory, and their frequencies as 'categorical_vocabulary.json'.
 
     Raises
     ------
@@ -50,40 +53,16 @@ def create_categorical_mappings():
     if not DATA_PATH.exists():
         raise FileNotFoundError(f"Training data not found: {DATA_PATH}")
 
-    df = pd.read_csv(DATA_PATH)
-
-    # Apply SAME renaming logic as training/inference
-    df = df.rename(columns=COLUMN_MAPPING)
-
-    mappings = {}
-
-    for col in CATEGORICAL_COLS:
-        if col not in df.columns:
-            raise ValueError(
-                f"Categorical column '{col}' missing AFTER renaming. "
-                f"Available columns: {list(df.columns)}"
-            )
-
-        values = (
-            df[col]
-            .astype(str)
-            .str.strip()
-            .str.lower()
-            .fillna("unknown")
-            .unique()
-            .tolist()
-        )
-
-        if "unknown" not in values:
-            values.append("unknown")
-
-        # Stable, deterministic order
-        mappings[col] = sorted(values)
-
+    vocabulary = build_vocabulary([DATA_PATH], workers=1)
     mappings_file = MODELS_DIR / "categorical_mappings.pkl"
-    joblib.dump(mappings, mappings_file)
+    version = save_vocabulary(
+        vocabulary,
+        mappings_path=mappings_file,
+        vocabulary_path=MODELS_DIR / "categorical_vocabulary.json",
+        metadata={"sources": [str(DATA_PATH)], "min_count": 1, "top_k": None},
+    )
 
-    print(f"✅ Categorical mappings saved to {mappings_file}")
+    print(f"✅ Categorical mappings saved to {mappings_file} (version {version})")
 
 
 if __name__ == "__main__":
@@ -91,4 +70,3 @@ if __name__ == "__main__":
     Run the script as a standalone program to generate categorical mappings.
     """
     create_categorical_mappings()
-
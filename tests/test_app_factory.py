@@ -0,0 +1,91 @@
+import subprocess
+import sys
+import threading
+
+from fastapi.testclient import TestClient
+import pytest
+
+from marketing_campaign_response.app_factory import create_app
+from marketing_campaign_response.modeling.service import ModelNotReady, ModelService
+
+
+def _predict_app(service_kwargs=None):
+    app = create_app("Test", predictor_kwargs=service_kwargs)
+    service = app.state.model_service
+
+    @app.post("/predict")
+    async def predict():
+        return service.predictor.predict([{}])
+
+    return app, service
+
+
+def test_importing_an_app_does_not_load_the_model():
+    code = (
+        "import sys\n"
+        "import marketing_campaign_response.main\n"
+        "assert 'lightgbm' not in sys.modules, 'lightgbm imported'\n"
+        "assert 'sklearn' not in sys.modules, 'sklearn imported'\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_importing_the_factory_does_not_load_pandas():
+    code = (
+        "import sys\n"
+        "import marketing_campaign_response.app_factory\n"
+        "assert 'pandas' not in sys.modules, 'pandas imported'\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_liveness_answers_before_the_model_is_ready():
+    app, service = _predict_app()
+    gate = threading.Event()
+    load = service.load
+    service.load = lambda: (gate.wait(30), load())
+
+    with TestClient(app) as client:
+        assert client.get("/health/live").json() == {"status": "alive"}
+        response = client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] in ("starting", "loading")
+
+        response = client.post("/predict")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+        gate.set()
+        assert service.wait_ready(60)
+        response = client.get("/health/ready")
+        assert response.status_code == 200
+        health = response.json()
+        assert health["status"] == "ready" and health["model_version"]
+        assert health["ready_seconds"] >= health["load_seconds"] + health["warmup_seconds"]
+        assert client.post("/predict").status_code == 200
+
+
+def test_failed_load_keeps_the_app_alive_and_unready():
+    app, service = _predict_app({"model_path": "missing/model.pkl"})
+
+    with TestClient(app) as client:
+        service._thread.join(30)
+        assert client.get("/health/live").status_code == 200
+        response = client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "failed"
+        assert "missing/model.pkl" in response.json()["error"]
+        assert client.post("/predict").status_code == 503
+
+
+def test_load_before_start_only_warms_up():
+    service = ModelService()
+    with pytest.raises(ModelNotReady, match="starting"):
+        service.predictor
+
+    service.load()
+    assert not service.ready
+    predictor = service._current.predictor
+    service.start()
+    assert service.wait_ready(60)
+    assert service.predictor is predictor
@@ -0,0 +1,87 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import pytest
+
+from marketing_campaign_response.modeling.batching import MicroBatcher
+from marketing_campaign_response.modeling.predict import Predictor
+from marketing_campaign_response.synthetic import make_customers
+
+
+class RecordingPredictor:
+    """Returns each record's custAge so slices are easy to check."""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def predict(self, rows):
+        with self.lock:
+            self.calls.append(len(rows))
+        if any(row["custAge"] == "bad" for row in rows):
+            raise ValueError("bad record")
+        ages = [row["custAge"] for row in rows]
+        return {"predictions": ages, "probabilities": ages, "model": "m"}
+
+
+def test_concurrent_requests_get_their_own_slice():
+    predictor = RecordingPredictor()
+    batcher = MicroBatcher(predictor, max_batch_size=64, max_wait_ms=20)
+
+    def call(i):
+        return batcher.predict([{"custAge": i}, {"custAge": i + 1000}])
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(call, range(200)))
+    batcher.stop()
+
+    for i, result in enumerate(results):
+        assert result["predictions"] == [i, i + 1000]
+        assert result["model"] == "m"
+    assert max(predictor.calls) <= 64
+    assert len(predictor.calls) < 200  # requests were coalesced
+
+
+def test_bad_request_only_fails_its_caller():
+    predictor = RecordingPredictor()
+    batcher = MicroBatcher(predictor, max_batch_size=64, max_wait_ms=50)
+
+    good = batcher.submit([{"custAge": 1}])
+    bad = batcher.submit([{"custAge": "bad"}])
+    other = batcher.submit([{"custAge": 3}])
+
+    assert good.result(5)["predictions"] == [1]
+    assert other.result(5)["predictions"] == [3]
+    with pytest.raises(ValueError):
+        bad.result(5)
+    batcher.stop()
+
+
+def test_oversized_request_is_scored_alone():
+    predictor = RecordingPredictor()
+    batcher = MicroBatcher(predictor, max_batch_size=4, max_wait_ms=1)
+
+    result = batcher.predict([{"custAge": i} for i in range(10)])
+    assert result["predictions"] == list(range(10))
+    batcher.stop()
+
+
+def test_batched_results_match_direct_predictions():
+    predictor = Predictor()
+    batcher = MicroBatcher(predictor, max_batch_size=128, max_wait_ms=10)
+    records = make_customers(60, seed=4).to_dict("records")
+    # Heterogeneous requests: aliases and partial records
+    requests = [[records[i]] for i in range(50)]
+    requests.append([{"age": 30, "job": "retired"}])
+    requests.append([{"custAge": 30, "previous": 2}])
+
+    async def run():
+        return await asyncio.gather(*(batcher.predict_async(r) for r in requests))
+
+    batched = asyncio.run(run())
+    batcher.stop()
+
+    for request, result in zip(requests, batched):
+        assert result == predictor.predict(request)
+    assert batcher.stats["mean_batch_size"] > 1
@@ -0,0 +1,73 @@
+import io
+import json
+
+from fastapi.testclient import TestClient
+import pyarrow as pa
+import pytest
+
+from marketing_campaign_response.modeling.api import app
+from marketing_campaign_response.modeling.columnar import ARROW_STREAM_MEDIA_TYPE
+from marketing_campaign_response.modeling.predict import Predictor
+from marketing_campaign_response.synthetic import make_customers
+
+predictor = Predictor()
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        assert app.state.model_service.wait_ready(60)
+        yield client
+
+
+@pytest.fixture(scope="module")
+def customers():
+    return make_customers(2_000, seed=31)
+
+
+def test_columnar_json_matches_predict(client, customers):
+    body = json.dumps(customers.to_dict("list"))
+
+    response = client.post(
+        "/predict/columnar", content=body, headers={"Content-Type": "application/json"}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == predictor.predict(customers)
+
+
+def test_arrow_stream_round_trip_matches_predict(client, customers):
+    table = pa.Table.from_pandas(customers, preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    response = client.post(
+        "/predict/columnar",
+        content=sink.getvalue(),
+        headers={"Content-Type": ARROW_STREAM_MEDIA_TYPE},
+    )
+
+    assert response.headers["content-type"] == ARROW_STREAM_MEDIA_TYPE
+    result = pa.ipc.open_stream(response.content).read_all()
+    expected = predictor.predict(customers)
+    assert result.column("probability").to_pylist() == expected["probabilities"]
+    assert result.column("prediction").to_pylist() == expected["predictions"]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [b"[1, 2]", b'{"custAge": [1, 2], "profession": ["admin."]}', b'{"custAge": []}', b"{"],
+)
+def test_malformed_columnar_json_is_rejected(client, body):
+    response = client.post("/predict/columnar", content=body)
+
+    assert response.status_code == 422
+
+
+def test_malformed_arrow_is_rejected(client):
+    response = client.post(
+        "/predict/columnar", content=b"nope", headers={"Content-Type": ARROW_STREAM_MEDIA_TYPE}
+    )
+
+    assert response.status_code == 422
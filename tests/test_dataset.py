@@ -0,0 +1,107 @@
+import json
+
+import pandas as pd
+import pytest
+
+from marketing_campaign_response.dataset import (
+    DataSource,
+    LocalFileSource,
+    load_split,
+    prepare_dataset,
+)
+from marketing_campaign_response.features import TARGET_COL, prepare_features
+from marketing_campaign_response.synthetic import make_customers
+
+
+class FrameSource(DataSource):
+    """
+    In-memory stand-in for a remote source, counting loads.
+    """
+
+    def __init__(self, df, fingerprint=None):
+        self.df, self._fingerprint = df, fingerprint
+        self.name = "frame"
+        self.loads = 0
+
+    def fingerprint(self):
+        return self._fingerprint
+
+    def load(self):
+        self.loads += 1
+        return self.df.copy()
+
+
+def _raw(n_rows, seed):
+    # Raw column names, as the source dataset has them
+    return make_customers(n_rows, seed=seed, with_target=True).rename(
+        columns={"custAge": "age", "profession": "job", TARGET_COL: "y"}
+    )
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return {
+        "manifest_path": tmp_path / "processed" / "dataset.json",
+        "snapshot_dir": tmp_path / "raw" / "snapshots",
+        "training_csv": tmp_path / "processed" / "marketing_training.csv",
+    }
+
+
+def test_unchanged_local_file_is_skipped(tmp_path, paths):
+    csv = tmp_path / "bank.csv"
+    _raw(1_000, seed=0).to_csv(csv, index=False)
+
+    manifest, written = prepare_dataset(LocalFileSource(csv), **paths)
+    assert written
+    snapshot = paths["manifest_path"].parent / manifest["snapshot"]["path"]
+    assert snapshot.name == f"{manifest['snapshot']['sha256'][:16]}.parquet"
+    assert len(pd.read_csv(paths["training_csv"])) == manifest["split"]["train_rows"] == 900
+
+    mtime = paths["manifest_path"].stat().st_mtime_ns
+    again, written = prepare_dataset(LocalFileSource(csv), **paths)
+    assert not written and again == manifest
+    assert paths["manifest_path"].stat().st_mtime_ns == mtime
+
+
+def test_source_without_fingerprint_is_compared_by_content(paths):
+    source = FrameSource(_raw(500, seed=1))
+    first, written = prepare_dataset(source, **paths)
+    assert written
+
+    second, written = prepare_dataset(FrameSource(_raw(500, seed=1)), **paths)
+    assert not written and second["snapshot"] == first["snapshot"]
+
+    changed, written = prepare_dataset(FrameSource(_raw(500, seed=2)), **paths)
+    assert written and changed["snapshot"]["sha256"] != first["snapshot"]["sha256"]
+    assert len(list(paths["snapshot_dir"].glob("*.parquet"))) == 2
+
+    pinned = FrameSource(_raw(500, seed=2), fingerprint="v2")
+    prepare_dataset(pinned, **paths)
+    prepare_dataset(pinned, **paths)
+    assert pinned.loads == 1
+
+
+def test_split_and_explicit_dtypes(paths):
+    manifest, _ = prepare_dataset(
+        FrameSource(_raw(2_000, seed=3)), test_ratio=0.25, **{**paths, "training_csv": None}
+    )
+    assert not paths["training_csv"].exists()
+    assert manifest["snapshot"]["dtypes"]["age"] == "Int64"
+    assert manifest["snapshot"]["dtypes"]["job"] == "string"
+    assert manifest["snapshot"]["dtypes"]["euribor3m"] == "float64"
+    assert json.loads(paths["manifest_path"].read_text()) == manifest
+
+    train = load_split("train", paths["manifest_path"])
+    test = load_split("test", paths["manifest_path"])
+    assert (len(train), len(test)) == (1_500, 500)
+    assert str(train["age"].dtype) == "Int64" and str(test["y"].dtype) == "string"
+
+    X, y = prepare_features(train, training=True, target_col=TARGET_COL)
+    assert len(X) == len(y) == 1_500 and X["custAge"].notna().all()
+
+
+def test_unparseable_numeric_column(paths):
+    df = _raw(10, seed=4).astype({"campaign": object})
+    df.loc[3, "campaign"] = "many"
+    with pytest.raises(ValueError, match="campaign"):
+        prepare_dataset(FrameSource(df), **paths)
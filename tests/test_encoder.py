@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from marketing_campaign_response.features import (
+    CATEGORICAL_COLS,
+    CategoricalEncoder,
+    load_categorical_mappings,
+)
+from marketing_campaign_response.synthetic import make_customers
+
+
+def legacy_encode(values: pd.Series, allowed: list) -> pd.Categorical:
+    cleaned = values.astype(str).str.strip().str.lower()
+    cleaned = cleaned.apply(lambda x: x if x in allowed else "unknown")
+    return pd.Categorical(cleaned, categories=allowed)
+
+
+@pytest.fixture(scope="module")
+def mappings():
+    return load_categorical_mappings()
+
+
+@pytest.mark.parametrize("n_rows", [1, 64, 65, 5_000])
+def test_encoder_matches_legacy_path(mappings, n_rows):
+    df = make_customers(n_rows, seed=7, noise=0.3)
+    encoder = CategoricalEncoder(mappings)
+
+    for col in CATEGORICAL_COLS:
+        expected = legacy_encode(df[col], mappings[col])
+        result = encoder.encode(col, df[col])
+        assert result.equals(expected), col
+        assert list(result.categories) == list(expected.categories)
+
+
+@pytest.mark.parametrize("size", [3, 200])
+def test_encoder_handles_missing_and_non_string_values(size):
+    mappings = {"day_of_week": ["1", "2", "unknown"], "month": ["may", "jun"]}
+    encoder = CategoricalEncoder(mappings)
+    values = pd.Series(([1, None, " 2 "] * size)[:size], dtype=object)
+
+    for col in ["day_of_week", "month"]:
+        expected = legacy_encode(values, mappings[col])
+        assert encoder.encode(col, values).equals(expected)
+
+    # "unknown" is not an allowed month, so everything is missing
+    assert (encoder.codes("month", values) == -1).all()
+    assert encoder.codes("day_of_week", values)[:3].tolist() == [0, 2, 1]
+
+
+def test_encoder_rejects_duplicate_categories():
+    with pytest.raises(ValueError):
+        CategoricalEncoder({"month": ["may", "may"]})
+
+
+def test_transform_encodes_all_categorical_columns(mappings):
+    df = make_customers(10, seed=1)
+    out = CategoricalEncoder(mappings).transform(df)
+    for col in CATEGORICAL_COLS:
+        assert isinstance(out[col].dtype, pd.CategoricalDtype)
+        assert np.all(out[col].cat.codes.to_numpy() >= -1)
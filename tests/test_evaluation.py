@@ -0,0 +1,126 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import roc_auc_score
+
+from marketing_campaign_response.features import TARGET_COL
+from marketing_campaign_response.modeling import evaluation
+from marketing_campaign_response.modeling.evaluation import (
+    ScoreHistogram,
+    evaluate_chunks,
+    evaluation_report,
+    write_report,
+)
+from marketing_campaign_response.synthetic import make_customers
+
+
+@pytest.fixture(scope="module")
+def scored():
+    rng = np.random.default_rng(0)
+    n = 50_000
+    segments = pd.DataFrame(
+        {
+            "profession": rng.choice(["admin.", "retired", " STUDENT "], n),
+            "month": rng.choice(["may", "jun"], n),
+            "contact": rng.choice(["cellular", "telephone"], n),
+        }
+    )
+    scores = rng.beta(2, 8, n)
+    labels = (rng.random(n) < scores).astype(int)
+    return labels, scores, segments
+
+
+def _chunks(labels, scores, segments, size):
+    for start in range(0, len(labels), size):
+        stop = start + size
+        yield labels[start:stop], scores[start:stop], segments.iloc[start:stop]
+
+
+def _leaves(report, path=""):
+    if isinstance(report, dict):
+        for key, value in report.items():
+            yield from _leaves(value, f"{path}/{key}")
+    elif isinstance(report, list):
+        for i, value in enumerate(report):
+            yield from _leaves(value, f"{path}/{i}")
+    else:
+        yield path, report
+
+
+def test_chunked_pass_matches_single_pass(scored):
+    whole = dict(_leaves(evaluate_chunks(_chunks(*scored, size=len(scored[0])))))
+    chunked = dict(_leaves(evaluate_chunks(_chunks(*scored, size=3_333))))
+
+    assert chunked.keys() == whole.keys()
+    # Equal up to the order of floating-point sums
+    for path, value in whole.items():
+        assert chunked[path] == pytest.approx(value, rel=1e-9), path
+
+
+def test_metrics_match_sort_based_computation(scored):
+    labels, scores, segments = scored
+    report = evaluate_chunks(_chunks(labels, scores, segments, size=10_000))
+
+    assert report["summary"]["auc"] == pytest.approx(roc_auc_score(labels, scores), abs=1e-4)
+    assert report["summary"]["base_rate"] == pytest.approx(labels.mean())
+
+    ranked = labels[np.argsort(-scores, kind="stable")]
+    tenth = len(ranked) // 10
+    top_rate = ranked[:tenth].mean()
+    assert report["deciles"][0]["response_rate"] == pytest.approx(top_rate, abs=2e-3)
+    assert report["deciles"][0]["lift"] == pytest.approx(top_rate / labels.mean(), abs=1e-2)
+    assert report["gains"][-1]["responders"] == pytest.approx(1.0)
+
+    budget = next(b for b in report["budgets"] if b["budget"] == 0.05)
+    k = budget["contacts"]
+    assert budget["precision"] == pytest.approx(ranked[:k].mean(), abs=5e-3)
+    assert budget["recall"] == pytest.approx(ranked[:k].sum() / labels.sum(), abs=5e-3)
+
+    calibration = report["calibration"][1]
+    in_bin = (scores >= 0.1) & (scores < 0.2)
+    assert calibration["rows"] == in_bin.sum()
+    assert calibration["mean_score"] == pytest.approx(scores[in_bin].mean())
+    assert calibration["observed_rate"] == pytest.approx(labels[in_bin].mean())
+
+    # Segment values are normalized like the categorical features
+    students = next(s for s in report["segments"]["profession"] if s["segment"] == "student")
+    mask = (segments["profession"] == " STUDENT ").to_numpy()
+    assert students["rows"] == mask.sum()
+    assert students["auc"] == pytest.approx(roc_auc_score(labels[mask], scores[mask]), abs=1e-4)
+
+
+def test_single_class_and_input_checks():
+    hist = ScoreHistogram(segment_cols=[]).update([0, 0, 0], [0.1, 0.5, 0.9])
+    report = evaluation_report(hist)
+    assert report["summary"]["auc"] is None
+    assert report["budgets"][0]["recall"] is None
+
+    with pytest.raises(ValueError):
+        ScoreHistogram(segment_cols=[]).update([0, 1], [0.2, 1.5])
+    with pytest.raises(ValueError):
+        ScoreHistogram().update([0, 1], [0.2, 0.8])
+
+
+def test_cli_with_a_single_class(tmp_path, monkeypatch):
+    df = make_customers(200, seed=1).assign(**{TARGET_COL: "no", "score": 0.3})
+    df.to_csv(tmp_path / "scored.csv", index=False)
+    monkeypatch.setattr(
+        evaluation, "write_report", lambda report, name: write_report(report, name, tmp_path)
+    )
+
+    evaluation.main(
+        tmp_path / "scored.csv", score_col="score", model_path=None, chunk_size=64, name=None
+    )
+
+    assert json.loads((tmp_path / "scored.json").read_text())["summary"]["auc"] is None
+
+
+def test_write_report(tmp_path, scored):
+    report = evaluate_chunks(_chunks(*scored, size=25_000))
+    json_path, html_path = write_report(report, "validation", tmp_path)
+
+    assert json.loads(json_path.read_text())["summary"] == report["summary"]
+    page = html_path.read_text()
+    assert "Decile lift" in page and "AUC by contact" in page
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from marketing_campaign_response.modeling.executor import (
+    ExecutorSaturated,
+    InferenceExecutor,
+    register_executor,
+)
+
+
+def test_executor_rejects_work_beyond_workers_plus_queue():
+    executor = InferenceExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    running = executor.submit(release.wait)
+    queued = executor.submit(lambda: "done")
+    with pytest.raises(ExecutorSaturated):
+        executor.submit(lambda: None)
+
+    stats = executor.stats
+    assert stats["queue_depth"] == 1 and stats["rejected"] == 1
+
+    release.set()
+    assert running.result(5) and queued.result(5) == "done"
+    executor.shutdown()
+    stats = executor.stats
+    assert stats["completed"] == 2 and stats["queue_depth"] == 0
+    assert stats["wait_seconds_max"] > 0
+
+
+def test_saturated_endpoint_returns_503_and_health_stays_responsive():
+    executor = InferenceExecutor(max_workers=1, max_queue=0, retry_after=3)
+    app = FastAPI()
+    register_executor(app, executor)
+    release = threading.Event()
+
+    @app.post("/work")
+    async def work():
+        return await executor.run(release.wait, 5)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    with TestClient(app) as client:
+        # Occupy the only worker
+        blocker = executor.submit(release.wait, 5)
+
+        response = client.post("/work")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "3"
+        assert client.get("/health").status_code == 200
+        assert client.get("/stats/executor").json()["rejected"] == 1
+
+        release.set()
+        blocker.result(5)
+        assert client.post("/work").status_code == 200
+    executor.shutdown()
+
+
+def test_run_returns_result_in_event_loop():
+    executor = InferenceExecutor(max_workers=2)
+    assert asyncio.run(executor.run(sum, [1, 2, 3])) == 6
+    executor.shutdown()
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from marketing_campaign_response.modeling.feature_cache import (
+    TRAIN_BINARY,
+    FeatureCache,
+    feature_version,
+)
+from marketing_campaign_response.modeling.train import (
+    DATASET_PARAMS,
+    SPLIT,
+    fit_model,
+    load_training_data,
+)
+from marketing_campaign_response.synthetic import make_customers
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "training.csv"
+    make_customers(3_000, seed=4, with_target=True).to_csv(path, index=False)
+    return path
+
+
+def _fit(data):
+    return fit_model(data, num_boost_round=10, early_stopping_rounds=None, log_period=0)
+
+
+def test_warm_run_matches_cold_run(tmp_path, source):
+    cache = FeatureCache(tmp_path / "cache")
+
+    cold, cold_hit = load_training_data(source, cache)
+    warm, warm_hit = load_training_data(source, cache)
+
+    assert (cold_hit, warm_hit) == (False, True)
+    assert warm.X_train is None
+    assert warm.X_val.dtypes.equals(cold.X_val.dtypes)
+    cold_model, cold_metrics = _fit(cold)
+    warm_model, warm_metrics = _fit(warm)
+    assert warm_model.pandas_categorical == cold_model.pandas_categorical
+    assert warm_model.dump_model()["tree_info"] == cold_model.dump_model()["tree_info"]
+    assert warm_metrics == cold_metrics
+    np.testing.assert_array_equal(warm_model.predict(cold.X_val), cold_model.predict(cold.X_val))
+
+
+def test_changed_source_invalidates_and_prunes(tmp_path, source):
+    cache = FeatureCache(tmp_path / "cache")
+    load_training_data(source, cache)
+    first = {p.name for p in cache.root.iterdir()}
+
+    make_customers(3_000, seed=5, with_target=True).to_csv(source, index=False)
+    _, hit = load_training_data(source, cache)
+
+    assert not hit
+    entries = {p.name for p in cache.root.iterdir()}
+    assert len(entries) == 1 and entries != first
+
+
+def test_unreadable_entry_is_rebuilt(tmp_path, source):
+    cache = FeatureCache(tmp_path / "cache")
+    load_training_data(source, cache)
+    (next(cache.root.iterdir()) / TRAIN_BINARY).write_bytes(b"garbage")
+
+    data, hit = load_training_data(source, cache)
+
+    assert not hit
+    assert load_training_data(source, cache)[1]
+
+
+def test_feature_version_tracks_settings():
+    version = feature_version(DATASET_PARAMS, SPLIT)
+
+    assert version == feature_version(dict(DATASET_PARAMS), dict(SPLIT))
+    assert version != feature_version({**DATASET_PARAMS, "max_bin": 63}, SPLIT)
+    assert version != feature_version(DATASET_PARAMS, {**SPLIT, "random_state": 0})
@@ -1,10 +1,18 @@
 import pandas as pd
-from marketing_campaing_response.features import prepare_features, CATEGORICAL_COLS, NUMERICAL_COLS
+import pytest
 
-# Sample mock data (like your dataset)
-data = {
+from marketing_campaign_response.features import (
+    CATEGORICAL_COLS,
+    FEATURE_COLS,
+    NUMERICAL_COLS,
+    TARGET_COL,
+    prepare_features,
+)
+
+# Two customers as they appear in the training CSV
+DATA = {
     "custAge": [25, 40],
-    "profession": ["admin", "technician"],
+    "profession": ["admin.", "technician"],
     "marital": ["single", "married"],
     "schooling": ["high.school", "university.degree"],
     "default": ["no", "no"],
@@ -15,7 +23,7 @@ data = {
     "campaign": [1, 3],
     "pdays": [999, 5],
     "previous": [0, 2],
-    "poutcome": ["unknown", "failure"],
+    "poutcome": ["nonexistent", "failure"],
     "emp.var.rate": [-1.8, 1.1],
     "cons.price.idx": [92.893, 93.994],
     "cons.conf.idx": [-46.2, -42.0],
@@ -23,22 +31,53 @@ data = {
     "nr.employed": [5099.1, 5191.0],
     "pmonths": [999, 2],
     "pastEmail": [0, 1],
-    "responded": [0, 1],  # target column
+    "responded": ["no", "yes"],
 }
 
-df = pd.DataFrame(data)
 
-# -------------------------------
-# Test training mode
-# -------------------------------
-X_train, y_train = prepare_features(df, training=True)
-print("TRAINING FEATURES:\n", X_train)
-print("TRAINING TARGET:\n", y_train)
+@pytest.fixture
+def df():
+    return pd.DataFrame(DATA)
+
+
+def test_training_mode_splits_target(df):
+    X, y = prepare_features(df, training=True)
+
+    assert list(X.columns) == FEATURE_COLS
+    assert y.tolist() == [0, 1]
+
+
+def test_inference_mode_has_no_target(df):
+    X, y = prepare_features(df.drop(columns=[TARGET_COL]), training=False)
+
+    assert y is None
+    assert list(X.columns) == FEATURE_COLS
+
+
+def test_never_contacted_becomes_minus_one(df):
+    X, _ = prepare_features(df, training=True)
+
+    assert X["pdays"].tolist() == [-1, 5]
+    assert X["pmonths"].tolist() == [-1, 2]
+
+
+def test_categoricals_are_encoded_and_missing_columns_filled(df):
+    X, _ = prepare_features(df.drop(columns=["housing", "campaign"]), training=False)
+
+    for col in CATEGORICAL_COLS:
+        assert isinstance(X[col].dtype, pd.CategoricalDtype), col
+    assert X["housing"].tolist() == ["unknown", "unknown"]
+    assert X["campaign"].tolist() == [0, 0]
+    assert X[NUMERICAL_COLS].notna().all().all()
+
+
+def test_input_frame_is_not_modified(df):
+    original = df.copy()
+    prepare_features(df, training=True)
+
+    pd.testing.assert_frame_equal(df, original)
 
-# -------------------------------
-# Test inference mode
-# -------------------------------
-X_infer, y_infer = prepare_features(df.drop(columns=["responded"]), training=False)
-print("INFERENCE FEATURES:\n", X_infer)
-print("INFERENCE TARGET (should be None):", y_infer)
 
+def test_empty_frame_is_rejected():
+    with pytest.raises(ValueError, match="empty"):
+        prepare_features(pd.DataFrame(), training=False)
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from marketing_campaign_response.config import MODEL_PATH
+from marketing_campaign_response.features import TARGET_COL, prepare_features
+from marketing_campaign_response.modeling import train
+from marketing_campaign_response.modeling.feature_cache import FeatureCache
+from marketing_campaign_response.modeling.registry import ModelRegistry
+from marketing_campaign_response.modeling.incremental import (
+    load_bin_reference,
+    rolling_split,
+    update_model,
+)
+from marketing_campaign_response.modeling.train import fit_model, load_training_data, save_model
+from marketing_campaign_response.synthetic import make_customers
+
+
+@pytest.fixture(scope="module")
+def base(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp("incremental")
+    source = tmp_path / "training.csv"
+    make_customers(3_000, seed=6, with_target=True).to_csv(source, index=False)
+    # Binary-loaded training set, as on a feature cache hit
+    load_training_data(source, FeatureCache(tmp_path / "cache"))
+    data, hit = load_training_data(source, FeatureCache(tmp_path / "cache"))
+    assert hit
+    model, _ = fit_model(data, num_boost_round=20, early_stopping_rounds=None, log_period=0)
+
+    bins = tmp_path / "model.bins"
+    data.train_set.construct().subset([0]).construct().save_binary(str(bins))
+    return model, bins
+
+
+def test_rolling_split_holds_out_newest_rows():
+    X = pd.DataFrame({"a": range(10)})
+    y = pd.Series(range(10))
+
+    X_fit, X_val, _, y_val = rolling_split(X, y, 0.3)
+    assert list(X_fit["a"]) == list(range(7)) and list(y_val) == [7, 8, 9]
+    assert len(rolling_split(X, y, 4)[1]) == 4
+    with pytest.raises(ValueError):
+        rolling_split(X, y, 10)
+
+
+def test_update_adds_bounded_rounds(base):
+    model, bins = base
+    new = make_customers(1_500, seed=7, with_target=True)
+
+    updated, metrics = update_model(
+        model, new, reference=load_bin_reference(bins), max_rounds=15, early_stopping_rounds=None
+    )
+
+    assert model.current_iteration() == 20
+    assert updated.current_iteration() == 35 and metrics["rounds_added"] == 15
+    assert updated.pandas_categorical == model.pandas_categorical
+    # The original trees are kept as they are
+    assert updated.dump_model()["tree_info"][:20] == model.dump_model()["tree_info"]
+    assert 0.5 < metrics["auc"] <= 1 and 0.5 < metrics["base_auc"] <= 1
+
+    X, _ = prepare_features(new.iloc[:50], training=True, target_col=TARGET_COL)
+    assert not np.allclose(updated.predict(X), model.predict(X))
+
+
+def test_model_continued_elsewhere_leaves_the_default_model_alone(base, tmp_path, monkeypatch):
+    model, bins = base
+    registry = ModelRegistry(tmp_path / "registry")
+    monkeypatch.setattr(train, "ModelRegistry", lambda: registry)
+    production = MODEL_PATH.read_bytes()
+    updated, metrics = update_model(
+        model,
+        make_customers(1_000, seed=8, with_target=True),
+        reference=load_bin_reference(bins),
+        max_rounds=5,
+        early_stopping_rounds=None,
+    )
+
+    bundle = save_model(updated, metrics, model_path=tmp_path / "challenger.pkl")
+
+    assert MODEL_PATH.read_bytes() == production
+    assert (tmp_path / "challenger.txt").exists()
+    assert (tmp_path / "challenger_forest").is_dir()
+    assert registry.versions() == [bundle.version]
+    assert bundle.model_path.read_bytes() == (tmp_path / "challenger.pkl").read_bytes()
+
+
+def test_missing_bin_reference(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_bin_reference(tmp_path / "missing.bins")
@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+import pytest
+
+from marketing_campaign_response.loadtest import (
+    generate_corpus,
+    load_corpus,
+    parse_corpus,
+    run_load,
+    write_corpus,
+)
+from marketing_campaign_response.modeling.api import app
+from marketing_campaign_response.schema import validate_records
+
+
+def test_generated_corpus_mixes_single_and_batch_requests(tmp_path):
+    entries = generate_corpus(200, batch_fraction=0.25, min_batch=3, max_batch=7, seed=2)
+
+    assert entries == generate_corpus(200, batch_fraction=0.25, min_batch=3, max_batch=7, seed=2)
+    singles = [e for e in entries if e["path"] == "/predict"]
+    batches = [e for e in entries if e["path"] == "/predict/batch"]
+    assert len(singles) + len(batches) == 200
+    assert 20 < len(batches) < 80
+    assert all(3 <= len(e["json"]) <= 7 for e in batches)
+    validate_records([e["json"] for e in singles])  # schema-valid API records
+
+    write_corpus(entries, tmp_path / "corpus.jsonl")
+    corpus = load_corpus(tmp_path / "corpus.jsonl")
+    assert [r.rows for r in corpus] == [len(e["json"]) if e in batches else 1 for e in entries]
+
+
+def test_parse_corpus_counts_rows():
+    lines = [
+        json.dumps({"path": "/predict", "json": {"custAge": 40}}),
+        "",
+        json.dumps({"path": "/predict", "json": {"records": [{}, {}, {}]}}),
+        json.dumps({"method": "get", "path": "/health"}),
+        json.dumps({"path": "/predict/columnar", "json": {"custAge": [1, 2]}, "rows": 2}),
+    ]
+    corpus = parse_corpus(lines)
+
+    assert [(r.method, r.rows) for r in corpus] == [("POST", 1), ("POST", 3), ("GET", 1), ("POST", 2)]
+    assert corpus[2].body == b""
+    with pytest.raises(ValueError, match="line 1"):
+        parse_corpus([json.dumps({"json": {}})])
+
+
+@pytest.mark.parametrize("rate", [None, 200.0])
+def test_in_process_replay_reports_latency_and_errors(rate):
+    entries = generate_corpus(20, batch_fraction=0.5, max_batch=5, seed=1)
+    entries.append({"path": "/predict", "json": {"custAge": "old"}})  # 422
+    corpus = parse_corpus(json.dumps(e) for e in entries)
+
+    summary = asyncio.run(
+        run_load(corpus, target_app=app, concurrency=4, rate=rate, max_requests=42, warmup=2)
+    )
+
+    overall = summary["overall"]
+    assert overall["requests"] == 42
+    assert overall["errors"] == 2 and overall["status"]["422"] == 2
+    assert overall["error_rate"] == pytest.approx(2 / 42)
+    assert overall["rows"] == 2 * sum(r.rows for r in corpus)
+    assert 0 < overall["p50_ms"] <= overall["p95_ms"] <= overall["p99_ms"] <= overall["max_ms"]
+    assert set(summary["paths"]) == {"/predict", "/predict/batch"}
+    assert summary["config"]["mode"] == ("closed" if rate is None else "open")
+
+
+def test_run_load_needs_exactly_one_target():
+    with pytest.raises(ValueError):
+        asyncio.run(run_load([], max_requests=1))
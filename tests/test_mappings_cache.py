@@ -0,0 +1,71 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import pytest
+
+from marketing_campaign_response.features import CategoricalMappingsCache
+
+
+def write_mappings(path, mappings, mtime_ns=None):
+    joblib.dump(mappings, path)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_cache_loads_once_and_reloads_on_content_change(tmp_path):
+    path = tmp_path / "categorical_mappings.pkl"
+    write_mappings(path, {"month": ["may", "unknown"]}, mtime_ns=1_000_000_000)
+    cache = CategoricalMappingsCache(path, check_interval=0)
+
+    first = cache.get()
+    assert cache.get() is first
+    assert cache.reloads == 1
+    assert cache.version == first.version
+
+    write_mappings(path, {"month": ["jun", "may", "unknown"]}, mtime_ns=2_000_000_000)
+    second = cache.get()
+    assert second is not first
+    assert second.mappings["month"] == ["jun", "may", "unknown"]
+    assert second.encoder.codes("month", ["JUN"]).tolist() == [0]
+    assert second.version != first.version
+    assert cache.reloads == 2
+
+
+def test_cache_ignores_touch_without_content_change(tmp_path):
+    path = tmp_path / "categorical_mappings.pkl"
+    write_mappings(path, {"month": ["may"]}, mtime_ns=1_000_000_000)
+    cache = CategoricalMappingsCache(path, check_interval=0)
+    first = cache.get()
+
+    os.utime(path, ns=(3_000_000_000, 3_000_000_000))
+    assert cache.get() is first
+    assert cache.reloads == 1
+
+
+def test_cache_checks_file_at_most_once_per_interval(tmp_path):
+    path = tmp_path / "categorical_mappings.pkl"
+    write_mappings(path, {"month": ["may"]}, mtime_ns=1_000_000_000)
+    cache = CategoricalMappingsCache(path, check_interval=3600)
+    first = cache.get()
+
+    write_mappings(path, {"month": ["jun"]}, mtime_ns=2_000_000_000)
+    assert cache.get() is first
+
+
+def test_cache_is_thread_safe(tmp_path):
+    path = tmp_path / "categorical_mappings.pkl"
+    write_mappings(path, {"month": ["may"]})
+    cache = CategoricalMappingsCache(path, check_interval=0)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        versions = set(pool.map(lambda _: cache.get().version, range(200)))
+
+    assert len(versions) == 1
+    assert cache.reloads == 1
+
+
+def test_cache_missing_file_raises(tmp_path):
+    cache = CategoricalMappingsCache(tmp_path / "missing.pkl")
+    with pytest.raises(FileNotFoundError):
+        cache.get()
@@ -0,0 +1,103 @@
+import math
+
+from fastapi.testclient import TestClient
+import pytest
+
+from marketing_campaign_response.metrics import METRICS, Histogram, Metrics
+from marketing_campaign_response.modeling.api import app
+from marketing_campaign_response.synthetic import make_customers
+
+
+@pytest.fixture
+def metrics():
+    METRICS.reset()
+    yield METRICS
+    METRICS.enabled = True
+    METRICS.reset()
+
+
+def _series(text):
+    values = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            values[name] = float(value)
+    return values
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram([1.0, 10.0, 100.0])
+    for value in (0.5, 1.0, 5.0, 50.0, 500.0):
+        histogram.observe(value)
+
+    cumulative, total, count = histogram.snapshot()
+    assert cumulative == [2, 3, 4, 5]
+    assert total == 556.5 and count == 5
+    assert histogram.quantile(0.5) == 10.0
+    assert histogram.quantile(1.0) == math.inf
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics(enabled=False)
+    mark = metrics.stopwatch()
+    mark("predict")
+    metrics.observe_rows("predict", 10)
+
+    assert metrics.stopwatch() is mark  # the shared no-op
+    assert _series(metrics.render()) == {}
+
+
+def test_render_is_prometheus_text():
+    metrics = Metrics()
+    metrics.observe_seconds("predict", 0.003)
+    metrics.observe_rows("predict", 20)
+
+    text = metrics.render()
+    assert "# TYPE mcr_stage_seconds histogram" in text
+    series = _series(text)
+    assert series['mcr_stage_seconds_bucket{stage="predict",le="0.0025"}'] == 0
+    assert series['mcr_stage_seconds_bucket{stage="predict",le="0.005"}'] == 1
+    assert series['mcr_stage_seconds_bucket{stage="predict",le="+Inf"}'] == 1
+    assert series['mcr_stage_seconds_sum{stage="predict"}'] == 0.003
+    assert series['mcr_batch_rows_bucket{path="predict",le="16.0"}'] == 0
+    assert series['mcr_batch_rows_bucket{path="predict",le="64.0"}'] == 1
+    assert series['mcr_batch_rows_count{path="predict"}'] == 1
+
+
+def test_metrics_endpoint_reports_every_stage(metrics):
+    customers = make_customers(200, seed=5).rename(columns=lambda c: c.replace(".", "_"))
+
+    with TestClient(app) as client:
+        assert app.state.model_service.wait_ready(60)
+        metrics.reset()
+        assert client.post("/predict/batch", json=customers.to_dict("records")).status_code == 200
+        assert client.post("/predict", json={"custAge": 40}).status_code == 200
+        response = client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    counts = {
+        name: value for name, value in _series(response.text).items() if "_count{" in name
+    }
+    for stage in (
+        "parse",
+        "validate",
+        "features.rename",
+        "features.encode",
+        "features.numeric",
+        "features.records",
+        "predict",
+        "format",
+        "serialize",
+    ):
+        assert counts[f'mcr_stage_seconds_count{{stage="{stage}"}}'] >= 1, stage
+    assert counts['mcr_batch_rows_count{path="predict"}'] == 2
+    assert counts['mcr_batch_rows_count{path="microbatch"}'] == 1
+    assert metrics.rows("predict").snapshot()[1] == 201
+
+
+def test_disabled_endpoint_metrics_stay_empty(metrics):
+    metrics.enabled = False
+    with TestClient(app) as client:
+        assert app.state.model_service.wait_ready(60)
+        assert client.post("/predict", json={"custAge": 40}).status_code == 200
+        assert _series(client.get("/metrics").text) == {}
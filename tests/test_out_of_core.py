@@ -0,0 +1,83 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from marketing_campaign_response.features import TARGET_COL, prepare_features
+from marketing_campaign_response.modeling.out_of_core import (
+    StratifiedStreamSplit,
+    load_streaming_training_data,
+)
+from marketing_campaign_response.modeling.tree_engine import frame_to_matrix
+from marketing_campaign_response.modeling.train import DATASET_PARAMS, fit_model
+from marketing_campaign_response.synthetic import make_customers
+
+# Python/NumPy heap allowed while preparing the data and training
+MEMORY_CAP = 8 * 2**20
+CHUNK_ROWS = 5_000
+
+
+@pytest.fixture(scope="module")
+def source(tmp_path_factory):
+    """
+    Training CSV whose DataFrame would be several times ``MEMORY_CAP``.
+    """
+    path = tmp_path_factory.mktemp("out_of_core") / "history.csv"
+    frame_bytes = 0
+    for i in range(24):
+        chunk = make_customers(CHUNK_ROWS, seed=i, with_target=True)
+        frame_bytes += chunk.memory_usage(deep=True).sum()
+        chunk.to_csv(path, mode="a", header=i == 0, index=False)
+    assert frame_bytes > 3 * MEMORY_CAP
+    return path
+
+
+def test_split_is_stratified_per_chunk():
+    rng = np.random.default_rng(0)
+    split = StratifiedStreamSplit(test_size=0.2, seed=1)
+    labels, masks = [], []
+    for size in (1_000, 37, 5_000, 1):
+        y = (rng.random(size) < 0.1).astype(int)
+        labels.append(y)
+        masks.append(split(y))
+    y, mask = np.concatenate(labels), np.concatenate(masks)
+
+    for label in (0, 1):
+        assert abs(mask[y == label].sum() - 0.2 * (y == label).sum()) <= 0.5
+    replay = StratifiedStreamSplit(test_size=0.2, seed=1)
+    assert all(np.array_equal(replay(y), m) for y, m in zip(labels, masks))
+
+
+def test_spooled_matrix_matches_lightgbm_encoding(source, tmp_path):
+    data = load_streaming_training_data(source, tmp_path, chunk_size=20_000)
+    model, _ = fit_model(data, num_boost_round=10, early_stopping_rounds=None, log_period=0)
+
+    X, _ = prepare_features(make_customers(500, seed=99), training=False)
+    np.testing.assert_allclose(model.predict(X), model.predict(frame_to_matrix(X)))
+
+
+def test_memory_bounded_by_chunk_size(source, tmp_path):
+    tracemalloc.start()
+    try:
+        data = load_streaming_training_data(
+            source,
+            tmp_path,
+            chunk_size=2_000,
+            dataset_params={**DATASET_PARAMS, "bin_construct_sample_cnt": 10_000},
+        )
+        model, metrics = fit_model(data, num_boost_round=20, early_stopping_rounds=None, log_period=0)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert peak < MEMORY_CAP
+    n_rows = 24 * CHUNK_ROWS
+    assert data.train_set.num_data() + len(data.y_val) == n_rows
+    assert len(data.y_val) == pytest.approx(0.2 * n_rows, abs=2)
+    assert data.y_val.mean() == pytest.approx(data.train_set.get_label().mean(), abs=1e-3)
+    assert metrics["auc"] > 0.65
+
+    frame = make_customers(200, seed=98, with_target=True)
+    X, _ = prepare_features(frame, training=True, target_col=TARGET_COL)
+    assert model.pandas_categorical == [list(X[col].cat.categories) for col in X.select_dtypes("category")]
+    assert np.all((model.predict(X) > 0) & (model.predict(X) < 1))
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from marketing_campaign_response.features import COLUMN_MAPPING
+from marketing_campaign_response.modeling.predict import InputBufferPool, Predictor
+from marketing_campaign_response.synthetic import make_customers
+
+API_NAMES = {v: k for k, v in COLUMN_MAPPING.items() if "." in v}
+
+
+@pytest.fixture(scope="module")
+def predictor():
+    return Predictor()
+
+
+def dataframe_path(predictor, records):
+    # Force the pandas path regardless of batch size
+    return predictor.predict(pd.DataFrame(records))
+
+
+@pytest.mark.parametrize("n_rows", [1, 7, 50, 300])
+def test_predict_records_matches_dataframe_path(predictor, n_rows):
+    records = make_customers(n_rows, seed=n_rows, noise=0.2).rename(columns=API_NAMES)
+    records = records.to_dict("records")
+
+    fast = predictor.predict_records(records)
+    slow = dataframe_path(predictor, records)
+
+    assert fast["predictions"] == slow["predictions"]
+    assert np.array_equal(fast["probabilities"], slow["probabilities"])
+
+
+def test_predict_records_handles_partial_and_aliased_records(predictor):
+    records = make_customers(20, seed=3).to_dict("records")
+    for i, record in enumerate(records):
+        if i % 3 == 0:
+            record["age"] = record.pop("custAge")  # alias
+        if i % 4 == 0:
+            record["euribor3m"] = None
+        if i % 5 == 0:
+            del record["month"]
+            del record["previous"]
+
+    fast = predictor.predict_records(records)
+    slow = dataframe_path(predictor, records)
+    assert np.array_equal(fast["probabilities"], slow["probabilities"])
+
+
+def test_predict_records_defaults_absent_columns(predictor):
+    records = [{"custAge": 40, "profession": "retired"}]
+
+    fast = predictor.predict_records(records)
+    slow = dataframe_path(predictor, records)
+    assert np.array_equal(fast["probabilities"], slow["probabilities"])
+
+
+def test_predict_routes_small_lists_to_fast_path(predictor, monkeypatch):
+    calls = []
+    monkeypatch.setattr(predictor, "predict_records", lambda rows: calls.append(rows))
+
+    predictor.predict([{"custAge": 40}])
+    assert len(calls) == 1
+
+
+def test_buffer_pool_reuses_buffers():
+    pool = InputBufferPool(n_features=3, max_rows=16)
+    buffer = pool.acquire(5)
+    assert buffer.shape == (8, 3)
+
+    pool.release(buffer)
+    assert pool.acquire(7) is buffer
+    assert pool.acquire(32).shape == (32, 3)
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from marketing_campaign_response.modeling.cache import PredictionCache
+from marketing_campaign_response.modeling.predict import Predictor
+from marketing_campaign_response.synthetic import make_customers
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingScorer:
+    def __init__(self):
+        self.rows_scored = 0
+
+    def __call__(self, X):
+        self.rows_scored += len(X)
+        return X.sum(axis=1)
+
+
+def test_cache_scores_only_misses_and_preserves_order():
+    cache = PredictionCache(maxsize=100)
+    scorer = CountingScorer()
+    X = np.array([[1.0, 2.0], [3.0, 4.0], [1.0, 2.0], [np.nan, -0.0]])
+
+    first = cache.score(X, scorer, "v1")
+    assert np.allclose(first[:3], [3.0, 7.0, 3.0]) and np.isnan(first[3])
+    assert scorer.rows_scored == 3  # duplicate row scored once
+    assert cache.stats["deduplicated"] == 1
+
+    X2 = np.array([[3.0, 4.0], [5.0, 6.0], [np.nan, 0.0]])
+    second = cache.score(X2, scorer, "v1")
+    assert second[:2].tolist() == [7.0, 11.0]
+    assert scorer.rows_scored == 4  # only [5, 6] was new; -0.0 == 0.0
+    assert cache.hits == 2 and cache.misses == 4
+
+
+def test_cache_keys_include_model_version():
+    cache = PredictionCache()
+    scorer = CountingScorer()
+    X = np.ones((2, 3))
+
+    cache.score(X, scorer, "v1")
+    cache.score(X, scorer, "v2")
+    assert scorer.rows_scored == 2
+
+
+def test_cache_evicts_least_recently_used_rows():
+    cache = PredictionCache(maxsize=2)
+    scorer = CountingScorer()
+
+    cache.score(np.array([[1.0]]), scorer, "v")
+    cache.score(np.array([[2.0]]), scorer, "v")
+    cache.score(np.array([[1.0]]), scorer, "v")  # refresh 1
+    cache.score(np.array([[3.0]]), scorer, "v")  # evicts 2
+
+    assert cache.evictions == 1 and len(cache) == 2
+    cache.score(np.array([[1.0]]), scorer, "v")
+    assert scorer.rows_scored == 3
+    cache.score(np.array([[2.0]]), scorer, "v")
+    assert scorer.rows_scored == 4
+
+
+def test_cache_expires_rows_after_ttl():
+    clock = FakeClock()
+    cache = PredictionCache(ttl=10, clock=clock)
+    scorer = CountingScorer()
+
+    cache.score(np.array([[1.0]]), scorer, "v")
+    clock.now = 5
+    cache.score(np.array([[1.0]]), scorer, "v")
+    assert scorer.rows_scored == 1
+
+    clock.now = 11
+    cache.score(np.array([[1.0]]), scorer, "v")
+    assert scorer.rows_scored == 2
+    assert cache.expirations == 1
+
+
+@pytest.mark.parametrize("n_rows", [5, 500])
+def test_cached_predictor_matches_uncached(n_rows):
+    plain = Predictor()
+    cached = Predictor(cache=PredictionCache())
+    df = make_customers(n_rows, seed=2)
+    df = df.iloc[np.arange(n_rows) % max(n_rows // 3, 1)].reset_index(drop=True)
+
+    for rows in (df, df.to_dict("records")):
+        assert cached.predict(rows) == plain.predict(rows)
+    assert cached.cache.hits > 0
@@ -0,0 +1,165 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+from fastapi.testclient import TestClient
+import joblib
+import lightgbm as lgb
+import pytest
+
+from marketing_campaign_response.app_factory import create_app
+from marketing_campaign_response.config import MODEL_PATH
+from marketing_campaign_response.features import CATEGORICAL_MAPPINGS_FILE, prepare_features
+from marketing_campaign_response.modeling.predict import Predictor
+from marketing_campaign_response.modeling.registry import ModelRegistry, RegistryError
+from marketing_campaign_response.modeling.service import ModelService
+from marketing_campaign_response.synthetic import make_customers
+
+RECORD = {"custAge": 52, "poutcome": "success", "emp_var_rate": -1.8, "campaign": 1}
+
+
+@pytest.fixture(scope="module")
+def small_model(tmp_path_factory):
+    # A second, different model to swap with the shipped one
+    X, y = prepare_features(make_customers(3_000, seed=41, with_target=True))
+    booster = lgb.train(
+        {"objective": "binary", "num_leaves": 7, "verbose": -1, "seed": 1},
+        lgb.Dataset(X, label=y),
+        num_boost_round=5,
+    )
+    path = tmp_path_factory.mktemp("model") / "small.pkl"
+    joblib.dump(booster, path)
+    return path
+
+
+@pytest.fixture
+def registry(tmp_path, small_model):
+    registry = ModelRegistry(tmp_path / "registry")
+    registry.publish(MODEL_PATH, CATEGORICAL_MAPPINGS_FILE, activate=True)
+    registry.publish(small_model, CATEGORICAL_MAPPINGS_FILE, metadata={"rounds": 5})
+    return registry
+
+
+def test_publish_activate_and_rollback(registry, small_model):
+    first, second = registry.versions()
+    assert registry.active_version() == first
+
+    bundle = registry.bundle(second)
+    assert bundle.manifest["metadata"] == {"rounds": 5}
+    assert bundle.model_path.read_bytes() == small_model.read_bytes()
+    assert Predictor(model_path=bundle.model_path).model_version == bundle.manifest["model_version"]
+
+    # Publishing the same files again returns the existing bundle
+    assert registry.publish(small_model, CATEGORICAL_MAPPINGS_FILE).version == second
+    assert len(registry.versions()) == 2
+
+    registry.activate(second)
+    assert registry.state() == {"active": second, "history": [first]}
+    assert registry.rollback() == first
+    assert registry.state() == {"active": first, "history": []}
+    with pytest.raises(RegistryError):
+        registry.rollback()
+    with pytest.raises(RegistryError):
+        registry.activate("missing")
+
+
+def test_reload_under_concurrent_load_never_fails(registry, monkeypatch):
+    monkeypatch.setenv("MODEL_ADMIN_TOKEN", "s3cret")
+    admin = {"X-Admin-Token": "s3cret"}
+    first, second = registry.versions()
+    expected = {
+        version: Predictor(
+            model_path=registry.bundle(version).model_path
+        ).predict([RECORD])["probabilities"][0]
+        for version in (first, second)
+    }
+    assert expected[first] != expected[second]
+
+    app = create_app(
+        "Test", micro_batching=True, registry_dir=registry.root, watch_interval=None
+    )
+    service = app.state.model_service
+
+    @app.post("/predict")
+    async def predict():
+        return await service.predict_async([RECORD])
+
+    @app.post("/predict/batch")
+    async def predict_batch():
+        return service.predict([RECORD] * 50)
+
+    stop = threading.Event()
+
+    def hammer(path):
+        responses = []
+        while not stop.is_set():
+            responses.append(client.post(path))
+        return responses
+
+    with TestClient(app) as client:
+        assert service.wait_ready(60)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(hammer, p) for p in ["/predict", "/predict/batch"] * 4]
+            for _ in range(3):
+                time.sleep(0.2)
+                swapped = client.post(
+                    "/admin/model/reload", params={"version": second}, headers=admin
+                )
+                assert swapped.json() == {"previous": first, "version": second, "reloaded": True}
+                time.sleep(0.2)
+                rolled_back = client.post("/admin/model/rollback", headers=admin)
+                assert rolled_back.json()["version"] == first
+            time.sleep(0.2)
+            stop.set()
+            responses = [r for f in futures for r in f.result()]
+
+        assert client.get("/admin/model", headers=admin).json()["serving"] == first
+
+    assert len(responses) > 100
+    assert all(r.status_code == 200 for r in responses)
+    seen = set()
+    for response in responses:
+        body = response.json()
+        seen.add(body["model_version"])
+        # Every request was scored entirely by the version it reports
+        assert set(body["probabilities"]) == {expected[body["model_version"]]}
+    assert seen == {first, second}
+    assert service.reloads == 6
+
+
+def test_workers_follow_registry_activation(registry):
+    first, second = registry.versions()
+    service = ModelService(registry_dir=registry.root, watch_interval=0.05)
+    service.start()
+    assert service.wait_ready(60)
+    assert service.current.version == first
+
+    registry.activate(second)
+    deadline = time.monotonic() + 30
+    while service.current.version != second and time.monotonic() < deadline:
+        time.sleep(0.05)
+    service.stop()
+
+    assert service.current.version == second
+    assert service.health()["model_version"] == second
+
+
+def test_admin_endpoints_need_a_configured_token(registry, monkeypatch):
+    monkeypatch.delenv("MODEL_ADMIN_TOKEN", raising=False)
+    app = create_app("Test", registry_dir=registry.root, watch_interval=None)
+    with TestClient(app) as client:
+        assert client.get("/admin/model").status_code == 403
+        assert client.post("/admin/model/rollback").status_code == 403
+        empty = client.post("/admin/model/rollback", headers={"X-Admin-Token": ""})
+        assert empty.status_code == 403
+    assert registry.active_version() == registry.versions()[0]
+
+    monkeypatch.setenv("MODEL_ADMIN_TOKEN", "s3cret")
+    with TestClient(app) as client:
+        assert client.post("/admin/model/rollback").status_code == 403
+        response = client.post("/admin/model/rollback", headers={"X-Admin-Token": "s3cret"})
+        assert response.status_code == 409  # nothing to roll back to
+        unknown = client.post(
+            "/admin/model/reload", params={"version": "missing"}, headers={"X-Admin-Token": "s3cret"}
+        )
+        assert unknown.status_code == 409
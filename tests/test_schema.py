@@ -0,0 +1,128 @@
+from fastapi.testclient import TestClient
+import pandas as pd
+import pytest
+
+from marketing_campaign_response.modeling.api import app
+from marketing_campaign_response.modeling.predict import Predictor
+from marketing_campaign_response.schema import (
+    CUSTOMER_SCHEMA,
+    SMALL_BATCH,
+    SchemaValidationError,
+    validate_frame,
+    validate_records,
+)
+from marketing_campaign_response.synthetic import make_customers
+
+predictor = Predictor()
+
+
+def _api_records(n, seed):
+    df = make_customers(n, seed=seed).rename(columns=lambda c: c.replace(".", "_"))
+    return df.to_dict("records")
+
+
+def _corrupt(records):
+    records[1]["custAge"] = "abc"
+    records[2]["pdays"] = 12.5
+    records[2]["emp_var_rate"] = 42.0
+    records[3]["profession"] = ["admin."]
+    records[4]["campaign"] = " 3 "
+    records[5]["euribor3m"] = None
+    return records
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        assert app.state.model_service.wait_ready(60)
+        yield client
+
+
+def test_schema_covers_every_feature():
+    assert all(spec.kind in ("int", "float", "category") for spec in CUSTOMER_SCHEMA.values())
+
+
+def test_per_value_and_vectorized_paths_report_the_same_errors():
+    records = _corrupt(_api_records(SMALL_BATCH, seed=1))
+
+    with pytest.raises(SchemaValidationError) as small:
+        validate_records(records)
+    with pytest.raises(SchemaValidationError) as vectorized:
+        validate_frame(pd.DataFrame(records))
+
+    assert small.value.report() == vectorized.value.report()
+    assert [(e["row"], e["column"], e["error"]) for e in small.value.errors] == [
+        (1, "custAge", "not a number"),
+        (2, "pdays", "not an integer"),
+        (2, "emp_var_rate", "out of range [-10, 10]"),
+        (3, "profession", "not a string"),
+    ]
+
+
+@pytest.mark.parametrize("n_rows", [10, 500])
+def test_validated_input_predicts_like_raw_input(n_rows):
+    records = _api_records(n_rows, seed=2)
+    records[0]["campaign"] = "4"
+    raw = [dict(r, campaign=4) if i == 0 else r for i, r in enumerate(records)]
+
+    assert predictor.predict(validate_records(records)) == predictor.predict(raw)
+
+
+def test_readme_example_payload_validates():
+    # "Never contacted" is sent as -1, as in the README and the frontend forms
+    payload = {
+        "custAge": 35, "profession": "admin", "marital": "single",
+        "schooling": "high.school", "default": "no", "housing": "yes",
+        "contact": "cellular", "month": "may", "day_of_week": "mon",
+        "campaign": 1, "pdays": -1, "previous": 0, "poutcome": "unknown",
+        "emp_var_rate": 1.1, "cons_price_idx": 93.994, "cons_conf_idx": -36.4,
+        "euribor3m": 4.857, "nr_employed": 5191, "pmonths": -1, "pastEmail": 0,
+    }
+
+    assert validate_records([payload])[0]["pdays"] == -1
+    assert validate_frame(pd.DataFrame([payload, {"pdays": 999}]))["pmonths"].iloc[0] == -1
+    with pytest.raises(SchemaValidationError, match="pdays"):
+        validate_records([{"pdays": -2}])
+
+
+def test_error_list_is_capped_but_counts_everything():
+    records = _api_records(500, seed=3)
+    for record in records:
+        record["custAge"] = -1
+
+    with pytest.raises(SchemaValidationError) as exc:
+        validate_records(records, max_errors=20)
+
+    assert len(exc.value.errors) == 20 and exc.value.error_count == 500
+    assert exc.value.columns == {"custAge": 500}
+
+
+def test_single_and_batch_endpoints_share_the_error_shape(client):
+    bad = {"custAge": "abc", "profession": "admin."}
+
+    single = client.post("/predict", json=bad)
+    batch = client.post("/predict/batch", json=[{"custAge": 30}, bad])
+
+    assert single.status_code == batch.status_code == 422
+    assert single.json()["errors"] == [
+        {"row": 0, "column": "custAge", "value": "abc", "error": "not a number"}
+    ]
+    assert batch.json()["errors"] == [
+        {"row": 1, "column": "custAge", "value": "abc", "error": "not a number"}
+    ]
+    assert single.json().keys() == batch.json().keys()
+    # ``detail`` keeps FastAPI's validation error list for existing clients
+    assert single.json()["detail"] == [
+        {"type": "value_error", "loc": ["body", "custAge"], "msg": "not a number", "input": "abc"}
+    ]
+    assert batch.json()["detail"][0]["loc"] == ["body", 1, "custAge"]
+
+
+def test_all_fields_are_optional(client):
+    response = client.post("/predict", json={"custAge": 40})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        **predictor.predict([{"custAge": 40}]),
+        "model_version": app.state.model_service.current.version,
+    }
@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from marketing_campaign_response.modeling.predict import Predictor
+from marketing_campaign_response.modeling.score import resolve_parallelism, score_file
+from marketing_campaign_response.synthetic import make_customers
+
+
+@pytest.fixture(scope="module")
+def customers():
+    df = make_customers(2_500, seed=21)
+    df.insert(0, "customer_id", [f"c{i}" for i in range(len(df))])
+    return df
+
+
+@pytest.mark.parametrize("fmt, workers", [("csv", 1), ("parquet", 2)])
+def test_score_file_writes_ordered_parts_matching_predict(customers, tmp_path, fmt, workers):
+    input_path = tmp_path / f"customers.{fmt}"
+    if fmt == "csv":
+        customers.to_csv(input_path, index=False)
+    else:
+        customers.to_parquet(input_path, index=False)
+    output_dir = tmp_path / "scores"
+    output_dir.mkdir()
+    (output_dir / "part-99999.parquet").write_bytes(b"stale")
+
+    stats = score_file(
+        input_path, output_dir, chunk_size=700, workers=workers, id_column="customer_id"
+    )
+
+    assert stats["rows"] == 2_500 and stats["parts"] == 4 and stats["rows_per_second"] > 0
+    out = pd.read_parquet(output_dir)
+    expected = Predictor().predict(customers)
+    assert out["row"].tolist() == list(range(2_500))
+    assert out["customer_id"].tolist() == customers["customer_id"].tolist()
+    assert out["probability"].tolist() == expected["probabilities"]
+    assert out["prediction"].tolist() == expected["predictions"]
+
+
+def test_threads_are_split_between_workers(monkeypatch):
+    monkeypatch.setattr("os.cpu_count", lambda: 8)
+
+    assert resolve_parallelism() == (8, 1)
+    assert resolve_parallelism(workers=2) == (2, 4)
+    assert resolve_parallelism(workers=3, threads_per_worker=2) == (3, 2)
@@ -0,0 +1,127 @@
+import json
+
+from fastapi.testclient import TestClient
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from marketing_campaign_response.modeling import serialization
+from marketing_campaign_response.modeling.api import app
+from marketing_campaign_response.modeling.predict import Predictor
+from marketing_campaign_response.modeling.serialization import (
+    ARROW_STREAM_MEDIA_TYPE,
+    FLOAT32_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    encode_json,
+    negotiate,
+    score_arrays,
+)
+from marketing_campaign_response.synthetic import make_customers
+
+predictor = Predictor()
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        assert app.state.model_service.wait_ready(60)
+        yield client
+
+
+@pytest.fixture(scope="module")
+def records():
+    customers = make_customers(500, seed=11).rename(columns=lambda c: c.replace(".", "_"))
+    return customers.to_dict("records")
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, JSON_MEDIA_TYPE),
+        ("*/*", JSON_MEDIA_TYPE),
+        ("text/html", JSON_MEDIA_TYPE),
+        ("application/octet-stream", FLOAT32_MEDIA_TYPE),
+        ("Application/Vnd.Apache.Arrow.Stream", ARROW_STREAM_MEDIA_TYPE),
+        ("application/json, application/octet-stream", JSON_MEDIA_TYPE),
+        ("application/json;q=0.5, application/octet-stream", FLOAT32_MEDIA_TYPE),
+        ("application/vnd.apache.arrow.stream;q=0.9, application/json;q=0.8", ARROW_STREAM_MEDIA_TYPE),
+    ],
+)
+def test_negotiate(accept, expected):
+    assert negotiate(accept) == expected
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_encode_json_matches_list_encoding(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(serialization, "orjson", None)
+    probs = np.random.default_rng(0).random(1_000)
+    content = {**score_arrays(probs), "model_version": "abc"}
+
+    decoded = json.loads(encode_json(content, precision=None))
+    assert decoded == {
+        "predictions": (probs >= 0.5).astype(int).tolist(),
+        "probabilities": probs.tolist(),
+        "model_version": "abc",
+    }
+
+    rounded = json.loads(encode_json(content, precision=4))
+    assert rounded["probabilities"] == np.round(probs, 4).tolist()
+    assert json.loads(encode_json({"probabilities": [0.123456]}, precision=2)) == {
+        "probabilities": [0.12]
+    }
+    # Strided views and NumPy scalars are handled too
+    assert json.loads(encode_json({"p": probs[::2], "n": np.int64(3)}, None)) == {
+        "p": probs[::2].tolist(),
+        "n": 3,
+    }
+
+
+def test_batch_json_response_unchanged(client, records):
+    response = client.post("/predict/batch", json=records)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == JSON_MEDIA_TYPE
+    assert response.headers["x-rows"] == "500"
+    body = response.json()
+    assert body.pop("model_version") == response.headers["x-model-version"]
+    assert body == predictor.predict(records)
+
+
+def test_batch_float32_response(client, records):
+    response = client.post(
+        "/predict/batch", json=records, headers={"Accept": FLOAT32_MEDIA_TYPE}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == FLOAT32_MEDIA_TYPE
+    assert response.headers["x-model-version"]
+    probs = np.frombuffer(response.content, dtype="<f4")
+    expected = np.asarray(predictor.predict(records)["probabilities"])
+    np.testing.assert_allclose(probs, expected, rtol=1e-6)
+
+
+@pytest.mark.parametrize("path", ["/predict/batch", "/predict"])
+def test_arrow_response(client, records, path):
+    body = records if path == "/predict/batch" else records[0]
+    response = client.post(path, json=body, headers={"Accept": ARROW_STREAM_MEDIA_TYPE})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == ARROW_STREAM_MEDIA_TYPE
+    table = pa.ipc.open_stream(response.content).read_all()
+    expected = predictor.predict(records if path == "/predict/batch" else [records[0]])
+    assert table.column("probability").to_pylist() == expected["probabilities"]
+    assert table.column("prediction").to_pylist() == expected["predictions"]
+
+
+def test_columnar_request_honours_accept(client, records):
+    columns = {key: [r[key] for r in records] for key in records[0]}
+    response = client.post(
+        "/predict/columnar",
+        content=json.dumps(columns),
+        headers={"Content-Type": JSON_MEDIA_TYPE, "Accept": FLOAT32_MEDIA_TYPE},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == FLOAT32_MEDIA_TYPE
+    assert len(response.content) == 4 * len(records)
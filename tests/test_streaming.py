@@ -0,0 +1,159 @@
+import asyncio
+import io
+import json
+import threading
+
+from fastapi.testclient import TestClient
+import pytest
+
+from marketing_campaign_response.modeling.api import app
+from marketing_campaign_response.modeling.executor import ExecutorSaturated, InferenceExecutor
+from marketing_campaign_response.modeling.predict import Predictor
+from marketing_campaign_response.modeling.streaming import LineSplitter, stream_predictions
+from marketing_campaign_response.serve import memory_usage
+from marketing_campaign_response.synthetic import make_customers
+
+predictor = Predictor()
+
+
+def _csv_bytes(df) -> bytes:
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False)
+    return buffer.getvalue().encode()
+
+
+def _parse(body: bytes):
+    return [json.loads(line) for line in body.splitlines()]
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        assert app.state.model_service.wait_ready(60)
+        yield client
+
+
+def test_line_splitter_handles_split_lines_and_quoted_newlines():
+    splitter = LineSplitter(quoted=True)
+
+    assert splitter.feed(b'a,b\r\n1,"x') == [b"a,b"]
+    assert splitter.feed(b'\ny"\n2,') == [b'1,"x\ny"']
+    assert splitter.feed(b"z") == []
+    assert splitter.close() == [b"2,z"]
+
+
+def test_ndjson_stream_matches_predict(client):
+    df = make_customers(250, seed=2)
+    records = df.to_dict("records")
+    body = b"".join(json.dumps(r).encode() + b"\n" for r in records)
+
+    response = client.post(
+        "/predict/stream?chunk_size=64",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = _parse(response.content)
+    expected = predictor.predict(df)
+    assert [line["row"] for line in lines] == list(range(250))
+    assert [line["probability"] for line in lines] == expected["probabilities"]
+    assert [line["prediction"] for line in lines] == expected["predictions"]
+
+
+def test_csv_stream_matches_predict(client):
+    df = make_customers(300, seed=3)
+
+    response = client.post(
+        "/predict/stream?chunk_size=128",
+        content=_csv_bytes(df),
+        headers={"Content-Type": "text/csv"},
+    )
+
+    lines = _parse(response.content)
+    assert [line["probability"] for line in lines] == predictor.predict(df)["probabilities"]
+
+
+def test_bad_chunk_is_reported_and_stream_continues(client):
+    records = make_customers(6, seed=4).to_dict("records")
+    body = [json.dumps(r) for r in records]
+    body[1] = "{not json"
+
+    response = client.post("/predict/stream?chunk_size=3", content="\n".join(body))
+
+    lines = _parse(response.content)
+    assert lines[0]["error"] and (lines[0]["start_row"], lines[0]["end_row"]) == (0, 3)
+    assert [line["row"] for line in lines[1:]] == [3, 4, 5]
+
+
+def test_saturated_executor_is_waited_for_then_reported_in_band():
+    records = make_customers(9, seed=6).to_dict("records")
+    expected = predictor.predict(records)["probabilities"]
+
+    async def body():
+        for record in records:
+            yield json.dumps(record).encode() + b"\n"
+
+    async def consume(run, timeout):
+        lines = []
+        stream = stream_predictions(
+            body(), predictor, chunk_size=3, run=run, saturated_timeout=timeout
+        )
+        async for output in stream:
+            lines.extend(_parse(output))
+        return lines
+
+    # One worker, held busy until the stream has been turned away once
+    executor = InferenceExecutor(max_workers=1, max_queue=0)
+    release = threading.Event()
+    executor.submit(release.wait)
+
+    async def run(fn, *args):
+        try:
+            return await executor.run(fn, *args)
+        except ExecutorSaturated:
+            release.set()
+            raise
+
+    lines = asyncio.run(consume(run, timeout=30))
+    assert [line["probability"] for line in lines] == expected
+    assert executor.stats["rejected"] >= 1
+
+    # The only worker never frees up: every chunk is an error line
+    release = threading.Event()
+    executor.submit(release.wait)
+    try:
+        lines = asyncio.run(consume(executor.run, timeout=0.2))
+    finally:
+        release.set()
+        executor.shutdown()
+    assert [(line["start_row"], line["end_row"]) for line in lines] == [(0, 3), (3, 6), (6, 9)]
+    assert all("capacity" in line["error"] for line in lines)
+
+
+def test_stream_memory_stays_flat_for_one_million_rows():
+    if not memory_usage():
+        pytest.skip("needs /proc/self/smaps_rollup")
+
+    header, block = _csv_bytes(make_customers(1_000, seed=5)).split(b"\n", 1)
+    n_blocks = 1_000  # 1M rows, ~115 MB of CSV
+
+    async def body():
+        yield header + b"\n"
+        for _ in range(n_blocks):
+            yield block
+
+    async def consume():
+        rows, rss = 0, []
+        async for output in stream_predictions(body(), predictor, "csv", chunk_size=5_000):
+            rows += output.count(b"\n")
+            rss.append(memory_usage()["rss_kb"])
+        return rows, rss
+
+    rows, rss = asyncio.run(consume())
+
+    assert rows == n_blocks * 1_000
+    # After warm-up, RSS must not grow with the amount of data streamed
+    baseline = max(rss[:10])
+    assert max(rss) - baseline < 64 * 1024
+    assert len(header + block) * n_blocks > 100 * 1024 * 1024
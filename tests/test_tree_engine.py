@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from marketing_campaign_response.features import prepare_features
+from marketing_campaign_response.modeling.predict import Predictor
+from marketing_campaign_response.modeling.tree_engine import (
+    FlatForest,
+    flatten_booster,
+    frame_to_matrix,
+)
+from marketing_campaign_response.synthetic import make_customers
+
+
+@pytest.fixture(scope="module")
+def predictor():
+    return Predictor()
+
+
+@pytest.fixture(scope="module")
+def matrix(predictor):
+    X, _ = prepare_features(make_customers(5_000, seed=11, noise=0.3), training=False)
+    return frame_to_matrix(X, predictor.model.pandas_categorical)
+
+
+def test_frame_to_matrix_matches_lightgbm_conversion(predictor, matrix):
+    X, _ = prepare_features(make_customers(5_000, seed=11, noise=0.3), training=False)
+    assert np.array_equal(predictor.model.predict(X), predictor.model.predict(matrix))
+
+
+def test_flat_forest_is_bit_identical_to_lightgbm(predictor, matrix):
+    forest = flatten_booster(predictor.model)
+
+    assert np.array_equal(
+        forest.predict_raw(matrix), predictor.model.predict(matrix, raw_score=True)
+    )
+    assert np.array_equal(forest.predict(matrix), predictor.model.predict(matrix))
+
+
+@pytest.mark.parametrize("n_rows", [1, 3, 4, 5, 64])
+def test_scalar_and_vectorized_walks_agree(predictor, matrix, n_rows):
+    forest = flatten_booster(predictor.model)
+    batch = matrix[:n_rows]
+
+    assert np.array_equal(forest._predict_raw_scalar(batch), forest._predict_raw_vectorized(batch))
+
+
+def test_flat_forest_handles_missing_zero_and_out_of_range_values(predictor, matrix):
+    forest = flatten_booster(predictor.model)
+    rng = np.random.default_rng(0)
+    edited = matrix.copy()
+    edited[rng.random(edited.shape) < 0.2] = np.nan
+    edited[rng.random(edited.shape) < 0.1] = 0.0
+    edited[rng.random(edited.shape) < 0.05] = -3.0
+    edited[rng.random(edited.shape) < 0.05] = -0.5
+    edited[rng.random(edited.shape) < 0.02] = 1e12
+
+    assert np.array_equal(forest.predict(edited), predictor.model.predict(edited))
+    for row in edited[:200]:
+        row = row[None, :]
+        assert np.array_equal(forest.predict(row), predictor.model.predict(row))
+
+
+@pytest.mark.parametrize("backend", ["numpy", "auto"])
+def test_alternative_backends_match_lightgbm_backend(predictor, backend):
+    other = Predictor(backend=backend)
+    df = make_customers(300, seed=5)
+
+    for rows in (df, df.head(3), df.head(10).to_dict("records"), df.head(1).to_dict("records")):
+        assert other.predict(rows) == predictor.predict(rows)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        Predictor(backend="onnx")
+
+
+def test_saved_forest_memory_maps_and_scores_identically(predictor, matrix, tmp_path):
+    forest = flatten_booster(predictor.model)
+    forest.save(tmp_path, model_version="abc")
+    loaded = FlatForest.load(tmp_path)
+
+    assert isinstance(loaded.threshold, np.memmap)
+    assert FlatForest.read_metadata(tmp_path)["model_version"] == "abc"
+    assert np.array_equal(loaded.predict(matrix), forest.predict(matrix))
+
+
+def test_predictor_loads_native_text_model(predictor, tmp_path):
+    path = tmp_path / "model.txt"
+    predictor.model.save_model(str(path))
+    df = make_customers(500, seed=5)
+
+    assert Predictor(model_path=path).predict(df) == predictor.predict(df)
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from marketing_campaign_response.modeling.train import PARAMS, prepare_training_data, tuned_params
+from marketing_campaign_response.modeling.tune import (
+    SEARCH_SPACE,
+    sample_params,
+    save_results,
+    search,
+)
+from marketing_campaign_response.synthetic import make_customers
+
+SETTINGS = dict(
+    num_boost_round=120,
+    early_stopping_rounds=20,
+    prune_every=10,
+    prune_warmup=10,
+    min_trials=2,
+    threads_per_worker=1,
+)
+
+
+@pytest.fixture(scope="module")
+def data():
+    return prepare_training_data(make_customers(6_000, seed=8, with_target=True))
+
+
+def _summary(results):
+    return [(r.trial, r.params, r.auc, r.best_iteration, r.rounds, r.pruned) for r in results]
+
+
+def test_sampled_params_are_seeded_and_in_range():
+    trials = sample_params(20, seed=1)
+
+    assert trials == sample_params(20, seed=1)
+    assert trials != sample_params(20, seed=2)
+    for params in trials:
+        for name, (low, high, kind) in SEARCH_SPACE.items():
+            assert low <= params[name] <= high
+            assert isinstance(params[name], int if kind.endswith("int") else float)
+
+
+def test_search_is_deterministic_and_prunes(data):
+    results = search(data, n_trials=8, workers=1, seed=3, **SETTINGS)
+
+    assert _summary(results) == _summary(search(data, n_trials=8, workers=1, seed=3, **SETTINGS))
+    assert sorted(r.trial for r in results) == list(range(8))
+    assert any(r.pruned for r in results) and not results[0].pruned
+    finished = [r.auc for r in results if not r.pruned]
+    assert finished == sorted(finished, reverse=True)
+
+
+def test_parallel_search_is_deterministic(data):
+    first = search(data, n_trials=4, workers=2, seed=5, **SETTINGS)
+    second = search(data, n_trials=4, workers=2, seed=5, **SETTINGS)
+
+    assert _summary(first) == _summary(second)
+
+
+def test_best_params_reach_training(tmp_path, data):
+    results = search(data, n_trials=3, workers=1, seed=0, **SETTINGS)
+    best_path = tmp_path / "best_params.json"
+
+    saved = save_results(
+        results, leaderboard_path=tmp_path / "leaderboard.csv", best_params_path=best_path
+    )
+
+    leaderboard = (tmp_path / "leaderboard.csv").read_text().splitlines()
+    assert len(leaderboard) == 4 and leaderboard[0].startswith("rank,trial,auc")
+    assert json.loads(best_path.read_text())["params"] == results[0].params == saved["params"]
+    params = tuned_params(best_path)
+    assert params == {**PARAMS, **results[0].params}
+    assert tuned_params(tmp_path / "missing.json") == PARAMS
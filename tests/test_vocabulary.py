@@ -0,0 +1,114 @@
+import json
+
+import pandas as pd
+import pytest
+
+from marketing_campaign_response.features import (
+    CATEGORICAL_COLS,
+    CategoricalEncoder,
+    CategoricalMappingsCache,
+)
+from marketing_campaign_response.synthetic import make_customers
+from marketing_campaign_response.vocabulary import (
+    build_vocabulary,
+    count_files,
+    prune,
+    save_vocabulary,
+)
+
+
+@pytest.fixture(scope="module")
+def files(tmp_path_factory):
+    root = tmp_path_factory.mktemp("vocabulary")
+    frames = [make_customers(3_000, seed=i) for i in range(3)]
+    # Raw column name, as in the source dataset, and a missing value
+    frames[0] = frames[0].rename(columns={"profession": "job"})
+    frames[0].loc[0, "marital"] = None
+    paths = [root / "a.csv", root / "b.parquet", root / "c.csv"]
+    frames[0].to_csv(paths[0], index=False)
+    frames[1].to_parquet(paths[1], index=False)
+    frames[2].to_csv(paths[2], index=False)
+    combined = pd.concat([frames[0].rename(columns={"job": "profession"}), *frames[1:]])
+    return paths, combined
+
+
+def _expected_counts(combined, col):
+    cleaned = combined[col].astype("string").str.strip().str.lower().fillna("unknown")
+    return cleaned.value_counts().to_dict()
+
+
+def test_parallel_counts_match_pandas(files):
+    paths, combined = files
+
+    parallel = count_files(paths, workers=2, chunk_size=700)
+    serial = count_files(paths, workers=1, chunk_size=10_000)
+
+    assert parallel == serial
+    for col in CATEGORICAL_COLS:
+        assert dict(parallel[col]) == _expected_counts(combined, col)
+    assert parallel["marital"]["unknown"] >= 1
+
+
+def test_pruning_folds_rare_values_into_unknown(files):
+    paths, combined = files
+    counts = count_files(paths, workers=1)
+    rarest = min(counts["profession"].values())
+
+    vocabulary = prune(counts, min_count=rarest + 1)
+    kept = set(vocabulary.categories["profession"]) - {"unknown"}
+    rare = {v for v, n in counts["profession"].items() if n == rarest}
+    assert rare and rare <= set(vocabulary.pruned["profession"])
+    assert all(counts["profession"][v] > rarest for v in kept)
+
+    top = prune(counts, top_k=2)
+    for col in CATEGORICAL_COLS:
+        assert len(top.categories[col]) <= 3 and "unknown" in top.categories[col]
+        assert set(top.pruned[col]).isdisjoint(top.categories[col])
+        assert sum(top.frequencies[col].values()) == len(combined)
+    assert top.rows == len(combined)
+
+
+def test_saved_artifact_is_versioned_and_loadable(tmp_path, files):
+    paths, _ = files
+    vocabulary = build_vocabulary(paths, workers=1, top_k=5)
+    mappings_path = tmp_path / "categorical_mappings.pkl"
+    vocabulary_path = tmp_path / "categorical_vocabulary.json"
+
+    version = save_vocabulary(
+        vocabulary, mappings_path=mappings_path, vocabulary_path=vocabulary_path
+    )
+
+    snapshot = CategoricalMappingsCache(mappings_path).get()
+    assert snapshot.version == version
+    assert snapshot.mappings == vocabulary.categories
+    document = json.loads(vocabulary_path.read_text())
+    assert document["version"] == version
+    assert document["columns"]["contact"]["frequencies"] == vocabulary.frequencies["contact"]
+
+    encoder = CategoricalEncoder(snapshot.mappings)
+    codes = encoder.codes("profession", pd.Series(vocabulary.pruned["profession"] * 40))
+    assert set(codes) <= {snapshot.mappings["profession"].index("unknown")}
+
+
+def test_failed_save_leaves_no_temporary_file(tmp_path, files, monkeypatch):
+    paths, _ = files
+    vocabulary = build_vocabulary(paths, workers=1)
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("marketing_campaign_response.vocabulary.os.replace", fail)
+    with pytest.raises(OSError):
+        save_vocabulary(
+            vocabulary,
+            mappings_path=tmp_path / "categorical_mappings.pkl",
+            vocabulary_path=tmp_path / "categorical_vocabulary.json",
+        )
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_missing_categorical_column(tmp_path):
+    path = tmp_path / "partial.csv"
+    make_customers(10).drop(columns=["contact"]).to_csv(path, index=False)
+    with pytest.raises(ValueError, match="contact"):
+        build_vocabulary([path], workers=1)